@@ -0,0 +1,83 @@
+from django import forms
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.http import JsonResponse
+from django.urls import reverse
+from django.utils.html import format_html
+from django.views import View
+
+
+AUTOCOMPLETE_PAGE_SIZE = 20
+
+
+class AutocompleteSelect(forms.Select):
+    # Renders only the selected option next to a search box; the other options
+    # are fetched from `url_name` while typing, so the page weight does not
+    # depend on the size of the table.
+    def __init__(self, url_name, attrs=None):
+        super().__init__(attrs)
+        self.url_name = url_name
+
+    def _selected_objects(self, values):
+        field = self.choices.field
+        # Bound formsets already loaded their products (PreloadedModelChoiceField).
+        preloaded = getattr(field, 'preloaded', None)
+        if preloaded is not None:
+            try:
+                return [preloaded[int(value)] for value in values]
+            except (KeyError, TypeError, ValueError):
+                pass
+        try:
+            return list(self.choices.queryset.filter(pk__in=values))
+        except (TypeError, ValueError, ValidationError):
+            return list()
+
+    def optgroups(self, name, value, attrs=None):
+        iterator = self.choices
+        selected = [item for item in value if item not in ('', None)]
+        choices = [iterator.choice(obj) for obj in self._selected_objects(selected)] if selected else list()
+        if iterator.field.empty_label is not None:
+            choices.insert(0, ('', iterator.field.empty_label))
+
+        self.choices = choices
+        try:
+            return super().optgroups(name, value, attrs)
+        finally:
+            self.choices = iterator
+
+    def render(self, name, value, attrs=None, renderer=None):
+        return format_html(
+            '<input type="search" class="form-control form-control-sm mb-1 autocomplete-search" '
+            'placeholder="Buscar..." autocomplete="off" data-autocomplete-url="{}">{}',
+            reverse(self.url_name),
+            super().render(name, value, attrs, renderer),
+        )
+
+
+class AutocompleteView(LoginRequiredMixin, View):
+    # ?q=<prefix>: first page of the company's objects whose search fields
+    # start with the term. `more` tells the widget to ask for a longer prefix.
+    model = None
+    search_fields = ()
+    ordering = ()
+    page_size = AUTOCOMPLETE_PAGE_SIZE
+    query_budget = 5
+
+    def get_queryset(self):
+        return self.model.objects.filter(company_id=self.request.user.profile.company_id)
+
+    def get(self, request):
+        term = request.GET.get('q', '').strip()
+        queryset = self.get_queryset()
+        if term:
+            condition = Q()
+            for field in self.search_fields:
+                condition |= Q(**{f'{field}__istartswith': term})
+            queryset = queryset.filter(condition)
+
+        objects = list(queryset.only('pk', *self.search_fields).order_by(*self.ordering)[:self.page_size + 1])
+        return JsonResponse({
+            'results': [{'id': obj.pk, 'text': str(obj)} for obj in objects[:self.page_size]],
+            'more': len(objects) > self.page_size,
+        })
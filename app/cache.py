@@ -0,0 +1,81 @@
+import hashlib
+import time
+from datetime import datetime, timezone as dt_timezone
+from functools import partial, wraps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+
+_MISSING = object()
+
+
+def _company_id(company):
+    return getattr(company, 'pk', company)
+
+
+def _version_key(company_id):
+    return f'dashboard:version:{company_id}'
+
+
+def _modified_key(company_id):
+    return f'dashboard:modified:{company_id}'
+
+
+def get_company_version(company):
+    key = _version_key(_company_id(company))
+    version = cache.get(key)
+    if version is None:
+        # Seeding with the current time keeps a version that was evicted from
+        # the cache from ever matching entries written under an older one.
+        cache.add(key, int(time.time() * 1000), None)
+        version = cache.get(key)
+    return version
+
+
+def get_company_last_modified(company):
+    key = _modified_key(_company_id(company))
+    timestamp = cache.get(key)
+    if timestamp is None:
+        cache.add(key, time.time(), None)
+        timestamp = cache.get(key)
+    return datetime.fromtimestamp(timestamp, tz=dt_timezone.utc)
+
+
+def bump_company_version(company):
+    company_id = _company_id(company)
+    cache.set(_modified_key(company_id), time.time(), None)
+    key = _version_key(company_id)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = int(time.time() * 1000)
+        cache.set(key, version, None)
+        return version
+
+
+def invalidate_company_cache(company):
+    # After commit, so no request can cache pre-commit values under the new version.
+    transaction.on_commit(partial(bump_company_version, _company_id(company)))
+
+
+def make_metric_key(name, company, *args, **kwargs):
+    company_id = _company_id(company)
+    arguments = repr((args, sorted(kwargs.items()), timezone.localdate()))
+    digest = hashlib.md5(arguments.encode('utf-8')).hexdigest()
+    return f'dashboard:{company_id}:{get_company_version(company_id)}:{name}:{digest}'
+
+
+def cached_metric(func):
+    @wraps(func)
+    def wrapper(company, *args, **kwargs):
+        key = make_metric_key(func.__name__, company, *args, **kwargs)
+        result = cache.get(key, _MISSING)
+        if result is _MISSING:
+            result = func(company, *args, **kwargs)
+            cache.set(key, result, settings.DASHBOARD_CACHE_TIMEOUT)
+        return result
+
+    wrapper.uncached = func
+    return wrapper
@@ -1,166 +1,316 @@
-from django.db.models import Sum, F, Q
+from django.db.models import Count, DecimalField, OuterRef, Subquery, Sum, F, Q
+from django.db.models.functions import TruncMonth, TruncWeek
 from django.utils import timezone
 from django.utils.formats import number_format
 from brands.models import Brand
 from categories.models import Category
-from products.models import Product
+from products.models import InventorySnapshot, Product
 from outflows.models import Outflow
-from sales.models import Sale
-from django.utils.timezone import now, timedelta
+from sales.models import DailySalesSummary, Sale, SaleItem
+from django.utils.timezone import timedelta
 from collections import defaultdict
+from datetime import datetime, time
 from decimal import Decimal
+from .cache import cached_metric
 
 
+SALES_SERIES_WINDOWS = (7, 30, 90, 365)
+
+SALES_SERIES_INTERVALS = ('day', 'week', 'month')
+
+LEADERBOARD_GROUPS = {
+    'seller': ('seller__first_name', 'seller__last_name', 'seller__username'),
+    'client': ('client__name',),
+}
+
+LEADERBOARD_PERIODS = ('today', 'week', 'month', 'last_30_days', 'custom')
+
+
+@cached_metric
 def get_product_metrics(company):
-    products = Product.objects.filter(company=company, quantity__gt=0)
-    total_cost_price = sum(product.cost_price * product.quantity for product in products)
-    total_selling_price = sum(product.selling_price * product.quantity for product in products)
-    total_quantity = sum(product.quantity for product in products)
-    total_profit = total_selling_price - total_cost_price
+    totals = Product.objects.filter(company=company).inventory_totals()
+    total_profit = totals['total_selling_price'] - totals['total_cost_price']
 
     return dict(
-        total_cost_price=number_format(total_cost_price, decimal_pos=2, force_grouping=True),
-        total_selling_price=number_format(total_selling_price, decimal_pos=2, force_grouping=True),
-        total_quantity=total_quantity,
+        total_cost_price=number_format(totals['total_cost_price'], decimal_pos=2, force_grouping=True),
+        total_selling_price=number_format(totals['total_selling_price'], decimal_pos=2, force_grouping=True),
+        total_quantity=totals['total_quantity'],
         total_profit=number_format(total_profit, decimal_pos=2, force_grouping=True),
     )
 
+
+@cached_metric
+def get_inventory_value_series(company, days=30):
+    if days not in SALES_SERIES_WINDOWS:
+        raise ValueError(f'Janela inválida: {days}. Use uma de {SALES_SERIES_WINDOWS}.')
+
+    today = timezone.localdate()
+    start_date = today - timedelta(days=days - 1)
+    snapshots = {
+        snapshot['date']: snapshot
+        for snapshot in InventorySnapshot.objects.filter(
+            company=company,
+            date__gte=start_date,
+            date__lte=today,
+        ).values('date', 'total_cost_price', 'total_selling_price', 'total_quantity')
+    }
+    dates = _sales_series_buckets(start_date, today, 'day')
+
+    return dict(
+        dates=[str(day) for day in dates],
+        cost_values=[float(snapshots[day]['total_cost_price']) if day in snapshots else None for day in dates],
+        selling_values=[float(snapshots[day]['total_selling_price']) if day in snapshots else None for day in dates],
+        quantities=[snapshots[day]['total_quantity'] if day in snapshots else None for day in dates],
+    )
+
+
+@cached_metric
 def get_sales_metrics(company):
     sales = Sale.objects.filter(
         Q(sale_type__in=['quote', 'order']) &
         Q(order_status='finalized') &
         Q(company=company)
-    ).prefetch_related('items')
-    
-    outflows = Outflow.objects.filter(company=company).exclude(
-        sale_reference__startswith='Venda '
-    ).select_related('product')
-    
-    total_sales_count = sales.count()
-    
-    # Using aggregation for better performance (fixing N+1)
-    from django.db.models import Sum, ExpressionWrapper, DecimalField
-    
+    )
+
+    outflows = Outflow.objects.filter(company=company, source='manual')
+
     sales_aggregation = sales.aggregate(
+        total_count=Count('id'),
         total_value=Sum('total'),
     )
-    
-    total_sales_value = sales_aggregation['total_value'] or Decimal('0')
-    total_products_sold = 0
-    total_sales_profit = Decimal('0')
-
-    # For profit calculation, we still need to iterate or use more complex annotations
-    # But prefetching items helps. 
-    for sale in sales:
-        sale_cost = sum(item.quantity * item.purchase_price for item in sale.items.all())
-        total_sales_profit += sale.total - sale_cost
-        total_products_sold += sum(item.quantity for item in sale.items.all())
-    
-    for outflow in outflows:
-        outflow_value = outflow.product.selling_price * outflow.quantity
-        outflow_cost = outflow.product.cost_price * outflow.quantity
-        
-        total_sales_value += outflow_value
-        total_sales_profit += outflow_value - outflow_cost
-        total_products_sold += outflow.quantity
-    
+
+    items_aggregation = SaleItem.objects.filter(sale__in=sales).aggregate(
+        total_cost=Sum(F('quantity') * F('purchase_price'), output_field=DecimalField()),
+        total_quantity=Sum('quantity'),
+    )
+
+    outflows_aggregation = outflows.aggregate(
+        total_count=Count('id'),
+        total_value=Sum(F('quantity') * F('product__selling_price'), output_field=DecimalField()),
+        total_cost=Sum(F('quantity') * F('product__cost_price'), output_field=DecimalField()),
+        total_quantity=Sum('quantity'),
+    )
+
+    sales_value = sales_aggregation['total_value'] or Decimal('0')
+    sales_cost = items_aggregation['total_cost'] or Decimal('0')
+    outflows_value = outflows_aggregation['total_value'] or Decimal('0')
+    outflows_cost = outflows_aggregation['total_cost'] or Decimal('0')
+
+    total_sales_value = sales_value + outflows_value
+    total_sales_profit = (sales_value - sales_cost) + (outflows_value - outflows_cost)
+    total_products_sold = (items_aggregation['total_quantity'] or 0) + (outflows_aggregation['total_quantity'] or 0)
+
     return {
-        'total_sales': total_sales_count,
-        'total_outflows': outflows.count(),
+        'total_sales': sales_aggregation['total_count'],
+        'total_outflows': outflows_aggregation['total_count'],
         'total_sales_value': number_format(total_sales_value, decimal_pos=2, force_grouping=True),
         'total_sales_profit': number_format(total_sales_profit, decimal_pos=2, force_grouping=True),
         'total_products_sold': total_products_sold,
     }
 
-def get_daily_sales_data(company):
-    today = timezone.now().date()
-    dates = [str(today - timezone.timedelta(days=i)) for i in range(6, -1, -1)]
-    values = list()
 
-    for date in dates:
-        sales_total = Outflow.objects.filter(
-            company=company,
-            created_at__date=date
-        ).aggregate(
-            total_sales=Sum(F('product__selling_price') * F('quantity'))
-        )['total_sales'] or 0
-        values.append(float(sales_total))
+def _sales_series_bucket(interval):
+    if interval == 'week':
+        return TruncWeek('date')
+    if interval == 'month':
+        return TruncMonth('date')
+    return F('date')
 
-    return dict(
-        dates=dates,
-        values=values,
-    )
 
-def get_daily_sales_quantity_data(company):
-    today = timezone.now().date()
-    dates = [str(today - timezone.timedelta(days=i)) for i in range(6, -1, -1)]
-    quantities = list()
+def _sales_series_buckets(start_date, end_date, interval):
+    if interval == 'week':
+        current = start_date - timedelta(days=start_date.weekday())
+    elif interval == 'month':
+        current = start_date.replace(day=1)
+    else:
+        current = start_date
 
-    for date in dates:
-        sales_quantity = Outflow.objects.filter(
-            company=company,
-            created_at__date=date
-        ).count()
-        quantities.append(sales_quantity)
+    buckets = list()
+    while current <= end_date:
+        buckets.append(current)
+        if interval == 'week':
+            current += timedelta(days=7)
+        elif interval == 'month':
+            current = (current + timedelta(days=32)).replace(day=1)
+        else:
+            current += timedelta(days=1)
+    return buckets
+
+
+@cached_metric
+def get_sales_time_series(company, days=7, interval='day'):
+    if days not in SALES_SERIES_WINDOWS:
+        raise ValueError(f'Janela inválida: {days}. Use uma de {SALES_SERIES_WINDOWS}.')
+    if interval not in SALES_SERIES_INTERVALS:
+        raise ValueError(f'Intervalo inválido: {interval}. Use um de {SALES_SERIES_INTERVALS}.')
+
+    today = timezone.localdate()
+    start_date = today - timedelta(days=days - 1)
+
+    rows = DailySalesSummary.objects.filter(
+        company=company,
+        date__gte=start_date,
+        date__lte=today,
+    ).annotate(
+        bucket=_sales_series_bucket(interval),
+    ).values('bucket').annotate(
+        total_value=Sum('revenue'),
+        total_count=Sum('outflow_count'),
+    ).order_by('bucket')
+
+    totals = {row['bucket']: row for row in rows}
+    buckets = _sales_series_buckets(start_date, today, interval)
 
     return dict(
-        dates=dates,
-        values=quantities,
+        dates=[str(bucket) for bucket in buckets],
+        values=[float(totals[bucket]['total_value'] or 0) if bucket in totals else 0.0 for bucket in buckets],
+        quantities=[totals[bucket]['total_count'] if bucket in totals else 0 for bucket in buckets],
     )
 
-def get_product_count_by_category_metric(company):
-    categories = Category.objects.filter(company=company)
-    return {category.name: Product.objects.filter(category=category, company=company).count() for category in categories}
 
-def get_graphic_product_brand_metric(company):
-    brands = Brand.objects.filter(company=company)
-    return {brand.name: Product.objects.filter(brand=brand, company=company).count() for brand in brands}
+def _product_distribution(model, company, top):
+    lookup = f'product__{model._meta.model_name}'
+    revenue = SaleItem.objects.filter(
+        **{lookup: OuterRef('pk')},
+        sale__sale_type__in=['quote', 'order'],
+        sale__order_status='finalized',
+    ).values(lookup).annotate(
+        total=Sum(F('quantity') * F('unit_price'), output_field=DecimalField()),
+    ).values('total')
 
-def get_sales_by_seller_metrics(company):
-    today = now().date()
-    start_of_month = today.replace(day=1)
-    sales = Sale.objects.filter(
-        sale_type__in=['quote', 'order'],
-        order_status='finalized',
-        sale_date__gte=start_of_month,
-        company=company
-    )
+    groups = model.objects.filter(company=company).annotate(
+        product_count=Count('products'),
+        stock_value=Sum(
+            F('products__quantity') * F('products__cost_price'),
+            filter=Q(products__quantity__gt=0),
+            output_field=DecimalField(),
+        ),
+        revenue=Subquery(revenue, output_field=DecimalField()),
+    ).order_by('-product_count', 'name').values_list('name', 'product_count', 'revenue', 'stock_value')
 
-    value_by_seller = defaultdict(float)
+    distribution = dict(labels=list(), counts=list(), revenue=list(), stock_value=list())
+    for index, (name, product_count, revenue_value, stock_value) in enumerate(groups):
+        if top is None or index < top:
+            distribution['labels'].append(name)
+            distribution['counts'].append(product_count)
+            distribution['revenue'].append(float(revenue_value or 0))
+            distribution['stock_value'].append(float(stock_value or 0))
+            continue
 
-    for sale in sales:
-        if sale.seller:
-            seller_name = sale.seller.get_full_name() or sale.seller.username
-            value_by_seller[seller_name] += float(sale.total)
+        if index == top:
+            distribution['labels'].append('Outros')
+            distribution['counts'].append(0)
+            distribution['revenue'].append(0.0)
+            distribution['stock_value'].append(0.0)
+        distribution['counts'][-1] += product_count
+        distribution['revenue'][-1] += float(revenue_value or 0)
+        distribution['stock_value'][-1] += float(stock_value or 0)
 
-    return {
-        'value_by_seller': value_by_seller
-    }
+    return distribution
 
-def get_top_clients_last_month(company):
-    today = now().date()
-    last_month = today - timedelta(days=30)
 
-    sales = Sale.objects.filter(
+@cached_metric
+def get_product_count_by_category_metric(company, top=5):
+    return _product_distribution(Category, company, top)
+
+
+@cached_metric
+def get_graphic_product_brand_metric(company, top=5):
+    return _product_distribution(Brand, company, top)
+
+
+def _leaderboard_period(period, start=None, end=None):
+    today = timezone.localdate()
+    if period == 'today':
+        return today, today
+    if period == 'week':
+        return today - timedelta(days=today.weekday()), today
+    if period == 'month':
+        return today.replace(day=1), today
+    if period == 'last_30_days':
+        return today - timedelta(days=30), today
+    if start is None or end is None:
+        raise ValueError('Período personalizado requer data inicial e final.')
+    if start > end:
+        raise ValueError('A data inicial deve ser anterior ou igual à data final.')
+    return start, end
+
+
+def _local_datetime(date):
+    return timezone.make_aware(datetime.combine(date, time.min))
+
+
+def _leaderboard_label(group_by, row):
+    if group_by == 'seller':
+        full_name = f"{row['seller__first_name']} {row['seller__last_name']}".strip()
+        return full_name or row['seller__username']
+    return row['client__name']
+
+
+@cached_metric
+def get_leaderboard(company, group_by='seller', period='month', start=None, end=None, top=None):
+    if group_by not in LEADERBOARD_GROUPS:
+        raise ValueError(f'Agrupamento inválido: {group_by}. Use um de {tuple(LEADERBOARD_GROUPS)}.')
+    if period not in LEADERBOARD_PERIODS:
+        raise ValueError(f'Período inválido: {period}. Use um de {LEADERBOARD_PERIODS}.')
+
+    start_date, end_date = _leaderboard_period(period, start, end)
+    previous_end_date = start_date - timedelta(days=1)
+    previous_start_date = previous_end_date - (end_date - start_date)
+
+    period_start = _local_datetime(start_date)
+    in_period = Q(sale_date__gte=period_start)
+    in_previous_period = Q(sale_date__lt=period_start)
+
+    rows = Sale.objects.filter(
+        company=company,
         sale_type__in=['quote', 'order'],
         order_status='finalized',
-        sale_date__gte=last_month,
-        company=company
+        sale_date__gte=_local_datetime(previous_start_date),
+        sale_date__lt=_local_datetime(end_date + timedelta(days=1)),
+        **{f'{group_by}__isnull': False},
+    ).values(group_by, *LEADERBOARD_GROUPS[group_by]).annotate(
+        current_total=Sum('total', filter=in_period),
+        current_count=Count('id', filter=in_period),
+        previous_total=Sum('total', filter=in_previous_period),
+    ).filter(current_count__gt=0).order_by('-current_total', group_by)
+
+    if top is not None:
+        rows = rows[:top]
+
+    leaderboard = dict(
+        labels=list(),
+        values=list(),
+        previous_values=list(),
+        start=str(start_date),
+        end=str(end_date),
+        previous_start=str(previous_start_date),
+        previous_end=str(previous_end_date),
     )
+    for row in rows:
+        leaderboard['labels'].append(_leaderboard_label(group_by, row))
+        leaderboard['values'].append(float(row['current_total'] or 0))
+        leaderboard['previous_values'].append(float(row['previous_total'] or 0))
+    return leaderboard
 
-    clients_total = defaultdict(Decimal)
 
-    for sale in sales:
-        if sale.client:
-            client_name = str(sale.client)
-            try:
-                total_value = sale.total if isinstance(sale.total, Decimal) else Decimal(sale.total)
-                clients_total[client_name] += total_value
-            except (ValueError, TypeError) as e:
-                continue
+@cached_metric
+def get_sales_by_seller_metrics(company):
+    leaderboard = get_leaderboard(company, group_by='seller', period='month')
 
-    sorted_clients = sorted(clients_total.items(), key=lambda x: x[1], reverse=True)[:3]
+    value_by_seller = defaultdict(float)
+    for seller_name, value in zip(leaderboard['labels'], leaderboard['values']):
+        value_by_seller[seller_name] += value
+
+    return {
+        'value_by_seller': value_by_seller
+    }
+
+
+@cached_metric
+def get_top_clients_last_month(company):
+    leaderboard = get_leaderboard(company, group_by='client', period='last_30_days', top=3)
     return {
-        'clients': [client for client, _ in sorted_clients],
-        'values': [float(value) for _, value in sorted_clients]
+        'clients': leaderboard['labels'],
+        'values': leaderboard['values'],
     }
@@ -0,0 +1,193 @@
+import base64
+import json
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Q
+from django.http import Http404
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+COUNT_MODES = ('estimate', 'exact')
+
+
+def encode_cursor(values, direction):
+    # isoformat() keeps microseconds; DjangoJSONEncoder would cut datetimes to
+    # milliseconds and break the equality half of the keyset condition.
+    values = [value.isoformat() if hasattr(value, 'isoformat') else value for value in values]
+    payload = json.dumps([direction, *values], cls=DjangoJSONEncoder)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, model, fields):
+    try:
+        payload = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        direction, *raw_values = json.loads(payload)
+        if direction not in ('next', 'previous') or len(raw_values) != len(fields):
+            raise ValueError(cursor)
+        values = [model._meta.get_field(name).to_python(raw) for name, raw in zip(fields, raw_values)]
+    except (ValueError, TypeError, ValidationError):
+        raise Http404('Cursor de paginação inválido.')
+    return direction, values
+
+
+def _after(fields, values, descending):
+    # (a, b) < (x, y)  ==  a <= x AND (a < x OR (a = x AND b < y)), written
+    # with plain lookups for every backend. The redundant a <= x gives the
+    # (company, field, id) index scan its start, so it begins at the cursor
+    # instead of reading and discarding the rows of the earlier pages.
+    lookup = 'lt' if descending else 'gt'
+    condition = Q()
+    for index, name in enumerate(fields):
+        step = Q(**{f'{name}__{lookup}': values[index]})
+        for previous, value in zip(fields[:index], values[:index]):
+            step &= Q(**{previous: value})
+        condition |= step
+    return Q(**{f'{fields[0]}__{lookup}e': values[0]}) & condition
+
+
+def estimate_count(queryset):
+    # PostgreSQL: the planner's row estimate (no table scan). Elsewhere an exact
+    # COUNT is the only option.
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return queryset.count()
+    sql, params = queryset.order_by().values('pk').query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class KeysetPage:
+    def __init__(self, object_list, fields, has_next, has_previous, count=None):
+        self.object_list = object_list
+        self.fields = fields
+        self.has_next_page = has_next
+        self.has_previous_page = has_previous
+        self.count = count
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.has_next_page
+
+    def has_previous(self):
+        return self.has_previous_page
+
+    def has_other_pages(self):
+        return self.has_next_page or self.has_previous_page
+
+    def _cursor(self, obj, direction):
+        return encode_cursor([getattr(obj, name) for name in self.fields], direction)
+
+    @property
+    def next_cursor(self):
+        if self.has_next_page and self.object_list:
+            return self._cursor(self.object_list[-1], 'next')
+        return None
+
+    @property
+    def previous_cursor(self):
+        if self.has_previous_page and self.object_list:
+            return self._cursor(self.object_list[0], 'previous')
+        return None
+
+
+def keyset_paginate(queryset, field, per_page, cursor=None, count=None):
+    # Newest-first page ordered by (field, id): each page starts after the last
+    # row of the previous one instead of skipping OFFSET rows.
+    fields = (field, 'id')
+    direction, values = decode_cursor(cursor, queryset.model, fields) if cursor else ('next', None)
+
+    total = None
+    if count == 'estimate':
+        total = estimate_count(queryset)
+    elif count == 'exact':
+        total = queryset.count()
+
+    descending = direction == 'next'
+    ordered = queryset.order_by(*(f'-{name}' if descending else name for name in fields))
+    if values is not None:
+        ordered = ordered.filter(_after(fields, values, descending))
+
+    rows = list(ordered[:per_page + 1])
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+
+    if direction == 'next':
+        return KeysetPage(rows, fields, has_next=has_more, has_previous=cursor is not None, count=total)
+    rows.reverse()
+    return KeysetPage(rows, fields, has_next=True, has_previous=has_more, count=total)
+
+
+class KeysetPaginationMixin:
+    # For ListViews: replaces OFFSET pagination and its COUNT(*) with a cursor on
+    # (keyset_field, id). Templates use page_obj.next_cursor/previous_cursor.
+    keyset_field = None
+    keyset_count = None
+    cursor_query_param = 'cursor'
+
+    def paginate_queryset(self, queryset, page_size):
+        page = keyset_paginate(
+            queryset,
+            self.keyset_field,
+            page_size,
+            cursor=self.request.GET.get(self.cursor_query_param),
+            count=self.keyset_count,
+        )
+        return None, page, page.object_list, page.has_other_pages()
+
+
+class KeysetPagination(BasePagination):
+    # DRF counterpart of KeysetPaginationMixin. The view declares keyset_field.
+    # Opt-in: without ?cursor= or ?page_size= the endpoint keeps returning the
+    # bare list; with them the response is {next, previous, results} and
+    # ?count=estimate|exact adds a total.
+    page_size = 50
+    max_page_size = 500
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    count_query_param = 'count'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor_query_param not in request.query_params and self.page_size_query_param not in request.query_params:
+            return None
+        self.request = request
+        count = request.query_params.get(self.count_query_param)
+        self.page = keyset_paginate(
+            queryset,
+            view.keyset_field,
+            self.get_page_size(request),
+            cursor=request.query_params.get(self.cursor_query_param),
+            count=count if count in COUNT_MODES else None,
+        )
+        return self.page.object_list
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def _link(self, cursor):
+        if cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        payload = dict(next=self._link(self.page.next_cursor), previous=self._link(self.page.previous_cursor))
+        if self.page.count is not None:
+            payload['count'] = self.page.count
+        payload['results'] = data
+        return Response(payload)
@@ -0,0 +1,226 @@
+from decimal import Decimal
+from functools import lru_cache
+from io import BytesIO
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas
+
+
+PAGE_WIDTH, PAGE_HEIGHT = A4
+MARGIN = 40
+TOP = PAGE_HEIGHT - MARGIN
+BOTTOM = MARGIN + 30
+RIGHT = PAGE_WIDTH - MARGIN
+
+ROW_HEIGHT = 18
+LINE_HEIGHT = 13
+
+PRIMARY = (0.2, 0.5, 0.8)
+HEADER_FILL = (0.9, 0.9, 0.9)
+RULE = (0.85, 0.85, 0.85)
+MUTED = (0.5, 0.5, 0.5)
+
+# (font, size) pairs, so every draw call reuses the same font objects.
+TITLE = ('Helvetica-Bold', 18)
+HEADING = ('Helvetica-Bold', 12)
+TEXT = ('Helvetica', 10)
+BOLD = ('Helvetica-Bold', 10)
+NOTE = ('Helvetica-Oblique', 9)
+SMALL = ('Helvetica', 8)
+
+# label, anchor x, alignment; the product column is cut to fit before QTD.
+COLUMNS = (
+    ('PRODUTO', MARGIN + 5, 'left'),
+    ('QTD', MARGIN + 340, 'right'),
+    ('VALOR UNIT.', MARGIN + 430, 'right'),
+    ('TOTAL', RIGHT - 5, 'right'),
+)
+PRODUCT_WIDTH = 290
+
+
+@lru_cache(maxsize=8192)
+def text_width(text, font, size):
+    return stringWidth(text, font, size)
+
+
+@lru_cache(maxsize=4096)
+def fit_text(text, font, size, max_width):
+    if text_width(text, font, size) <= max_width:
+        return text
+    # Standard fonts have no kerning, so widths of single characters add up.
+    limit = max_width - text_width('…', font, size)
+    width = 0
+    for index, char in enumerate(text):
+        width += text_width(char, font, size)
+        if width > limit:
+            return text[:index] + '…'
+    return text
+
+
+def money(value):
+    return f'R$ {value:.2f}'
+
+
+def sale_rows(sale):
+    # Plain tuples instead of model instances: 1,000-line documents are common.
+    return sale.items.order_by('pk').values_list('product__title', 'quantity', 'unit_price')
+
+
+class SaleDocument:
+    """Paginated layout shared by invoices, orders and budgets."""
+
+    def __init__(self, title, heading, parties=(), notes=None, footer='', signature=False):
+        self.title = title
+        self.heading = heading
+        self.parties = parties
+        self.notes = notes
+        self.footer = footer
+        self.signature = signature
+
+    def render(self, sale):
+        buffer = BytesIO()
+        self.canvas = canvas.Canvas(buffer, pagesize=A4)
+        self.page = 0
+        self._start_page()
+        self._draw_intro(sale)
+        subtotal = self._draw_table(sale_rows(sale))
+        self._draw_totals(subtotal, sale.discount or Decimal('0.00'))
+        self._finish_page()
+        self.canvas.save()
+        return buffer.getvalue()
+
+    def _start_page(self):
+        self.page += 1
+        self.y = TOP
+        if self.page > 1:
+            self._set_font(BOLD)
+            self.canvas.drawString(MARGIN, self.y - 10, f'{self.title} - {self.heading} (continuação)')
+            self.y -= 25
+
+    def _finish_page(self):
+        c = self.canvas
+        self._set_font(SMALL)
+        c.setFillColorRGB(*MUTED)
+        c.drawCentredString(PAGE_WIDTH / 2, 20, self.footer)
+        c.drawRightString(RIGHT, 20, f'Página {self.page}')
+        c.setFillColorRGB(0, 0, 0)
+        c.showPage()
+
+    def _new_page(self):
+        self._finish_page()
+        self._start_page()
+
+    def _ensure(self, height):
+        if self.y - height < BOTTOM:
+            self._new_page()
+
+    def _set_font(self, style):
+        self.canvas.setFont(*style)
+
+    def _draw_intro(self, sale):
+        c = self.canvas
+        c.setFillColorRGB(*PRIMARY)
+        c.rect(MARGIN, self.y - 40, RIGHT - MARGIN, 40, fill=True, stroke=False)
+        c.setFillColorRGB(1, 1, 1)
+        self._set_font(TITLE)
+        c.drawCentredString(PAGE_WIDTH / 2, self.y - 28, self.title)
+        c.setFillColorRGB(0, 0, 0)
+        self.y -= 60
+
+        for label, lines in self.parties:
+            self._ensure(LINE_HEIGHT * (len(lines) + 2))
+            if label:
+                self._set_font(HEADING)
+                c.drawString(MARGIN, self.y, label)
+                self.y -= LINE_HEIGHT + 2
+            self._set_font(TEXT)
+            for line in lines:
+                c.drawString(MARGIN + 10, self.y, line)
+                self.y -= LINE_HEIGHT
+            self.y -= 10
+
+        self._set_font(HEADING)
+        c.drawString(MARGIN, self.y, self.heading)
+        c.drawRightString(RIGHT, self.y, f"Data: {sale.sale_date.strftime('%d/%m/%Y')}")
+        self.y -= 20
+
+    def _draw_table_header(self):
+        c = self.canvas
+        c.setFillColorRGB(*HEADER_FILL)
+        c.rect(MARGIN, self.y - 15, RIGHT - MARGIN, 20, fill=True, stroke=False)
+        c.setFillColorRGB(0, 0, 0)
+        self._set_font(BOLD)
+        for label, x, align in COLUMNS:
+            if align == 'right':
+                c.drawRightString(x, self.y - 10, label)
+            else:
+                c.drawString(x, self.y - 10, label)
+        self.y -= 20
+
+    def _draw_table(self, rows):
+        # One text object and one batch of rules per page instead of one
+        # drawString/line call per cell.
+        c = self.canvas
+        font, size = TEXT
+        self._ensure(ROW_HEIGHT * 3)
+        self._draw_table_header()
+        text, rules = c.beginText(), list()
+        text.setFont(font, size)
+        subtotal = Decimal('0.00')
+
+        for title, quantity, unit_price in rows:
+            if self.y - ROW_HEIGHT < BOTTOM:
+                self._flush_rows(text, rules)
+                self._new_page()
+                self._draw_table_header()
+                text, rules = c.beginText(), list()
+                text.setFont(font, size)
+
+            total = quantity * unit_price
+            subtotal += total
+            baseline = self.y - 12
+            cells = (fit_text(title or 'Produto removido', font, size, PRODUCT_WIDTH), str(quantity), money(unit_price), money(total))
+            for (_, x, align), value in zip(COLUMNS, cells):
+                if align == 'right':
+                    x -= text_width(value, font, size)
+                text.setTextOrigin(x, baseline)
+                text.textOut(value)
+            self.y -= ROW_HEIGHT
+            rules.append((MARGIN, self.y, RIGHT, self.y))
+
+        self._flush_rows(text, rules)
+        return subtotal
+
+    def _flush_rows(self, text, rules):
+        c = self.canvas
+        c.drawText(text)
+        if rules:
+            c.setStrokeColorRGB(*RULE)
+            c.lines(rules)
+            c.setStrokeColorRGB(0, 0, 0)
+
+    def _draw_totals(self, subtotal, discount):
+        c = self.canvas
+        discount_amount = subtotal * (discount / Decimal('100.00'))
+        self._ensure(60 + (80 if self.signature else 0) + (20 if self.notes else 0))
+
+        self.y -= 15
+        if discount > 0:
+            self._set_font(TEXT)
+            c.drawRightString(RIGHT - 5, self.y, f'Desconto ({discount:.2f}%): -{money(discount_amount)}')
+            self.y -= 18
+        self._set_font(HEADING)
+        c.drawRightString(RIGHT - 5, self.y, f'TOTAL: {money(subtotal - discount_amount)}')
+        self.y -= 30
+
+        if self.notes:
+            self._set_font(NOTE)
+            c.drawString(MARGIN, self.y, self.notes)
+            self.y -= 20
+
+        if self.signature:
+            self.y -= 40
+            c.line(MARGIN + 100, self.y, RIGHT - 100, self.y)
+            self.y -= 15
+            self._set_font(TEXT)
+            c.drawCentredString(PAGE_WIDTH / 2, self.y, 'Assinatura do Cliente')
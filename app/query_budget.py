@@ -0,0 +1,134 @@
+import logging
+import os
+import sys
+from collections import Counter, defaultdict
+from contextlib import ExitStack
+from django.conf import settings
+from django.db import connections
+from django.template.base import Node
+from rest_framework.fields import Field
+
+
+logger = logging.getLogger(__name__)
+
+QUERY_BUDGET_MODES = ('off', 'log', 'raise')
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def query_budget(budget):
+    def decorator(view):
+        view.query_budget = budget
+        return view
+    return decorator
+
+
+def extend_query_budget(request, queries):
+    # For views whose work grows with the payload (e.g. batch sync): raises the
+    # budget of this request only, from inside the view.
+    recorder = getattr(request, '_query_recorder', None)
+    if recorder is not None and recorder.budget is not None:
+        recorder.budget += queries
+
+
+def get_view_budget(func):
+    view_class = getattr(func, 'view_class', None) or getattr(func, 'cls', None)
+    budget = getattr(view_class, 'query_budget', None)
+    if budget is None:
+        budget = getattr(func, 'query_budget', None)
+    if budget is None:
+        budget = settings.QUERY_BUDGET_DEFAULT
+    return budget
+
+
+def _project_path(filename):
+    base_dir = str(settings.BASE_DIR)
+    if not filename.startswith(base_dir) or 'site-packages' in filename or filename == __file__:
+        return None
+    return os.path.relpath(filename, base_dir)
+
+
+def find_query_origin():
+    frame = sys._getframe(1)
+    while frame is not None:
+        # type() instead of isinstance() so lazy objects (request.user) are not evaluated here.
+        instance = frame.f_locals.get('self')
+        instance_type = type(instance)
+        if issubclass(instance_type, Node) and getattr(instance, 'token', None) and instance.origin:
+            template_name = instance.origin.template_name or instance.origin.name
+            return f'template {template_name}, linha {instance.token.lineno}'
+        if issubclass(instance_type, Field) and instance.field_name:
+            serializer = type(instance.parent).__name__ if instance.parent is not None else type(instance).__name__
+            return f'serializer {serializer}.{instance.field_name}'
+        path = _project_path(frame.f_code.co_filename)
+        if path:
+            return f'{path}, linha {frame.f_lineno}'
+        frame = frame.f_back
+    return 'origem desconhecida'
+
+
+class QueryRecorder:
+    # Counts statements on every query; the stack is only walked once the
+    # budget is exceeded, and only for repeated statements (the ones reported).
+    def __init__(self):
+        self.budget = None
+        self.count = 0
+        self.statements = Counter()
+        self.origins = defaultdict(Counter)
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        self.statements[sql] += 1
+        if self.budget is not None and self.count > self.budget and self.statements[sql] > 1:
+            self.origins[sql][find_query_origin()] += 1
+        return execute(sql, params, many, context)
+
+    def report(self, limit=5):
+        lines = list()
+        for sql, count in self.statements.most_common(limit):
+            if count < 2:
+                break
+            origins = self.origins[sql].most_common(1)
+            origin = origins[0][0] if origins else 'origem desconhecida'
+            lines.append(f'  {count}x {sql[:150]} -- {origin}')
+        return lines
+
+
+class QueryBudgetMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        mode = getattr(settings, 'QUERY_BUDGET_MODE', 'off')
+        if mode not in QUERY_BUDGET_MODES[1:]:
+            return self.get_response(request)
+
+        recorder = request._query_recorder = QueryRecorder()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(recorder))
+            response = self.get_response(request)
+
+        match = request.resolver_match
+        if match is None:
+            return response
+
+        budget = recorder.budget if recorder.budget is not None else get_view_budget(match.func)
+        executed = recorder.count
+        if executed > budget:
+            message = '\n'.join([
+                f'{request.method} {request.path} ({match.view_name}) executou {executed} queries; orçamento: {budget}.',
+                *recorder.report(),
+            ])
+            if mode == 'raise':
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        recorder = getattr(request, '_query_recorder', None)
+        if recorder is not None:
+            recorder.budget = get_view_budget(view_func)
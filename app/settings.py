@@ -60,6 +60,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'app.query_budget.QueryBudgetMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -114,6 +115,32 @@ if os.getenv("POSTGRES_HOST"):
     }
 
 
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'sales-hub'),
+    }
+}
+
+DASHBOARD_CACHE_TIMEOUT = int(os.getenv('DASHBOARD_CACHE_TIMEOUT', '300'))
+
+# Query budgets per view: 'off', 'log' (warning on app.query_budget) or 'raise'.
+QUERY_BUDGET_MODE = os.getenv('QUERY_BUDGET_MODE', 'off')
+QUERY_BUDGET_DEFAULT = int(os.getenv('QUERY_BUDGET_DEFAULT', '30'))
+
+# Idempotency-Key replays of API create requests are kept for this long.
+IDEMPOTENCY_KEY_TTL = timedelta(hours=int(os.getenv('IDEMPOTENCY_KEY_TTL_HOURS', '24')))
+
+# Processes rendering PDFs for the bulk invoice export (0 renders in the request process).
+INVOICE_EXPORT_WORKERS = int(os.getenv('INVOICE_EXPORT_WORKERS', '2'))
+
+# PDFs requested through /api/v1/documents/ are rendered by `manage.py render_documents`
+# with this many processes; running jobs older than the timeout are retried.
+DOCUMENT_WORKER_CONCURRENCY = int(os.getenv('DOCUMENT_WORKER_CONCURRENCY', '2'))
+DOCUMENT_JOB_TIMEOUT = timedelta(minutes=int(os.getenv('DOCUMENT_JOB_TIMEOUT_MINUTES', '10')))
+DOCUMENT_JOB_MAX_ATTEMPTS = int(os.getenv('DOCUMENT_JOB_MAX_ATTEMPTS', '3'))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -0,0 +1,58 @@
+import pytest
+from django.urls import reverse
+from model_bakery import baker
+from app.autocomplete import AUTOCOMPLETE_PAGE_SIZE
+from companies.models import Company
+from inflows.forms import InflowForm
+from products.models import Product
+
+
+@pytest.mark.django_db
+class TestProductAutocomplete:
+    def test_prefix_search_on_title_and_serie_number(self, auth_client, company):
+        notebook = baker.make(Product, company=company, title='Notebook Pro', serie_number='X1')
+        mouse = baker.make(Product, company=company, title='Mouse', serie_number='NB-200')
+        baker.make(Product, company=company, title='Capa para notebook', serie_number='C1')
+        baker.make(Product, company=baker.make(Company), title='Notebook Air', serie_number='N2')
+
+        response = auth_client.get(reverse('product_autocomplete'), {'q': 'n'})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data == {
+            'results': [{'id': mouse.pk, 'text': 'Mouse'}, {'id': notebook.pk, 'text': 'Notebook Pro'}],
+            'more': False,
+        }
+
+    def test_results_are_limited_to_one_page(self, auth_client, company):
+        baker.make(Product, company=company, title='Cabo', _quantity=AUTOCOMPLETE_PAGE_SIZE + 5)
+
+        data = auth_client.get(reverse('product_autocomplete'), {'q': 'cab'}).json()
+
+        assert len(data['results']) == AUTOCOMPLETE_PAGE_SIZE
+        assert data['more'] is True
+
+    def test_requires_login(self, client):
+        response = client.get(reverse('product_autocomplete'), {'q': 'a'})
+        assert response.status_code == 302
+
+
+@pytest.mark.django_db
+class TestAutocompleteSelect:
+    def test_renders_only_the_selected_product(self, admin_user, company):
+        products = baker.make(Product, company=company, _quantity=50)
+        selected = products[10]
+
+        html = InflowForm(user=admin_user, initial={'product': selected.pk})['product'].as_widget()
+
+        assert html.count('<option') == 2
+        assert f'value="{selected.pk}" selected' in html
+        assert reverse('product_autocomplete') in html
+
+    def test_page_weight_does_not_depend_on_catalog_size(self, auth_client, company):
+        baker.make(Product, company=company, _quantity=5)
+        small = len(auth_client.get(reverse('sale_create')).content)
+        baker.make(Product, company=company, _quantity=200)
+        large = len(auth_client.get(reverse('sale_create')).content)
+
+        assert large == small
@@ -0,0 +1,185 @@
+import json
+import os
+import re
+import time
+from decimal import Decimal
+import pytest
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Sum
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from app import metrics
+from budgets.utils.pdf import generate_budget_pdf
+from companies.seeding import delete_tenant, seed_tenant
+from sale_order.utils.pdf import generate_order_pdf
+from sales.models import Sale, SaleItem
+from sales.utils.pdf import generate_invoice_pdf
+from .legacy_pdf import legacy_budget_pdf, legacy_invoice_pdf, legacy_order_pdf
+
+
+pytestmark = pytest.mark.benchmark
+
+BENCHMARK_SIZE = os.getenv('BENCHMARK_TENANT_SIZE', 'tiny')
+
+# Wall-time budgets are expressed for the "tiny" tenant and scaled by size;
+# BENCHMARK_TIME_FACTOR loosens or tightens them for slower/faster machines.
+TIME_SCALE = {'tiny': 1, 'small': 10, 'medium': 100, 'large': 1000}
+TIME_FACTOR = float(os.getenv('BENCHMARK_TIME_FACTOR', '1')) * TIME_SCALE[BENCHMARK_SIZE]
+
+METRIC_BUDGETS = {
+    'get_product_metrics': (1, 50),
+    'get_inventory_value_series': (1, 50),
+    'get_sales_metrics': (3, 200),
+    'get_sales_time_series': (1, 50),
+    'get_product_count_by_category_metric': (1, 100),
+    'get_graphic_product_brand_metric': (1, 100),
+    'get_sales_by_seller_metrics': (1, 100),
+    'get_top_clients_last_month': (1, 100),
+}
+
+VIEW_BUDGETS = {
+    'home': (6, 100),
+    'sale_list': (12, 300),
+    'product_list': (10, 300),
+    'outflow_list': (12, 300),
+    'stock_moviment_list': (8, 300),
+}
+
+DOCUMENT_BUDGETS = {
+    'generate_invoice_pdf': (5, 200),
+    'generate_order_pdf': (5, 200),
+    'generate_budget_pdf': (5, 200),
+}
+
+DOCUMENT_GENERATORS = {
+    'generate_invoice_pdf': generate_invoice_pdf,
+    'generate_order_pdf': generate_order_pdf,
+    'generate_budget_pdf': generate_budget_pdf,
+}
+
+LEGACY_GENERATORS = {
+    'generate_invoice_pdf': legacy_invoice_pdf,
+    'generate_order_pdf': legacy_order_pdf,
+    'generate_budget_pdf': legacy_budget_pdf,
+}
+
+# 1,000-line documents: the shared renderer draws every page in at most this
+# many queries, and in less time than the legacy generator took to draw the
+# same rows off the bottom of the first page.
+LARGE_DOCUMENT_LINES = 1000
+LARGE_DOCUMENT_MAX_QUERIES = 4
+
+_results = dict()
+
+
+def _measure(func, repeat=3):
+    timings = list()
+    for _ in range(repeat):
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            started = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - started)
+    return min(timings) * 1000, len(context.captured_queries)
+
+
+def _check(name, measured, budget, capsys):
+    elapsed_ms, queries = measured
+    max_queries, max_ms = budget
+    _results[name] = {'ms': round(elapsed_ms, 2), 'queries': queries}
+    with capsys.disabled():
+        print(f'\n[{BENCHMARK_SIZE}] {name}: {elapsed_ms:.1f} ms, {queries} queries')
+
+    assert queries <= max_queries, f'{name}: {queries} queries (orçamento {max_queries})'
+    assert elapsed_ms <= max_ms * TIME_FACTOR, f'{name}: {elapsed_ms:.1f} ms (orçamento {max_ms * TIME_FACTOR:.0f} ms)'
+
+
+@pytest.fixture(scope='module', autouse=True)
+def benchmark_report():
+    yield
+    report = os.getenv('BENCHMARK_REPORT')
+    if report:
+        with open(report, 'w') as file:
+            json.dump({'size': BENCHMARK_SIZE, 'results': _results}, file, indent=2)
+
+
+@pytest.fixture(scope='module')
+def tenant(django_db_setup, django_db_blocker):
+    with django_db_blocker.unblock():
+        company = seed_tenant(size=BENCHMARK_SIZE, seed=42)
+    yield company
+    with django_db_blocker.unblock():
+        delete_tenant(company)
+
+
+@pytest.fixture
+def tenant_client(client, tenant):
+    client.force_login(User.objects.get(username=f'bench_{tenant.pk}'))
+    return client
+
+
+@pytest.mark.django_db
+def test_seeded_tenant_sales_metrics(tenant):
+    # Seeded outflows all come from sales and must not be counted again.
+    result = metrics.get_sales_metrics.uncached(tenant)
+    sold = SaleItem.objects.filter(sale__company=tenant).aggregate(total=Sum('quantity'))['total']
+    assert result['total_sales'] == Sale.objects.filter(company=tenant).count()
+    assert result['total_outflows'] == 0
+    assert result['total_products_sold'] == sold
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('name', METRIC_BUDGETS)
+def test_metric_benchmark(tenant, name, capsys):
+    func = getattr(metrics, name).uncached
+    _check(name, _measure(lambda: func(tenant)), METRIC_BUDGETS[name], capsys)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('url_name', VIEW_BUDGETS)
+def test_view_benchmark(tenant_client, url_name, capsys):
+    url = reverse(url_name)
+
+    def request():
+        response = tenant_client.get(url)
+        assert response.status_code == 200
+
+    _check(url_name, _measure(request), VIEW_BUDGETS[url_name], capsys)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('name', DOCUMENT_BUDGETS)
+def test_document_benchmark(tenant, name, capsys):
+    sale = Sale.objects.filter(company=tenant).order_by('-sale_date').first()
+    generator = DOCUMENT_GENERATORS[name]
+    _check(name, _measure(lambda: generator(Sale.objects.get(pk=sale.pk))), DOCUMENT_BUDGETS[name], capsys)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('name', DOCUMENT_GENERATORS)
+def test_large_document_throughput(tenant, name, capsys):
+    sale = Sale.objects.filter(company=tenant).order_by('-sale_date').first()
+    products = list(tenant.product_set.all()[:50])
+    SaleItem.objects.bulk_create([
+        SaleItem(sale=sale, product=products[index % len(products)], quantity=1, unit_price=Decimal('9.90'), purchase_price=Decimal('5.00'))
+        for index in range(LARGE_DOCUMENT_LINES)
+    ])
+    generator, legacy = DOCUMENT_GENERATORS[name], LEGACY_GENERATORS[name]
+    pdf = generator(sale)
+    elapsed_ms, queries = _measure(lambda: generator(Sale.objects.get(pk=sale.pk)))
+    legacy_ms, _ = _measure(lambda: legacy(Sale.objects.get(pk=sale.pk)))
+
+    key = f'{name}_{LARGE_DOCUMENT_LINES}_lines'
+    _results[key] = {
+        'ms': round(elapsed_ms, 2), 'legacy_ms': round(legacy_ms, 2), 'queries': queries,
+        'lines_per_second': round(LARGE_DOCUMENT_LINES / elapsed_ms * 1000),
+    }
+    with capsys.disabled():
+        print(f'\n{key}: {elapsed_ms:.1f} ms (antes {legacy_ms:.1f} ms), {queries} queries, {_results[key]["lines_per_second"]} linhas/s')
+
+    # Every line is drawn: roughly 37 rows fit on a page.
+    assert len(re.findall(rb'/Type /Page\b', pdf)) >= LARGE_DOCUMENT_LINES // 40
+    assert queries <= LARGE_DOCUMENT_MAX_QUERIES, f'{key}: {queries} queries (orçamento {LARGE_DOCUMENT_MAX_QUERIES})'
+    assert elapsed_ms < legacy_ms, f'{key}: {elapsed_ms:.1f} ms, não mais rápido que antes ({legacy_ms:.1f} ms)'
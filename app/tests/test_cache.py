@@ -0,0 +1,73 @@
+import pytest
+from decimal import Decimal
+from django.core.cache import cache
+from django.test import override_settings
+from model_bakery import baker
+from app import metrics
+from app.cache import get_company_version
+from brands.models import Brand
+from products.models import Product
+from sales.models import Sale, SaleItem
+
+
+@pytest.mark.django_db
+class TestDashboardCache:
+    def test_repeated_reads_hit_the_cache(self, company, django_assert_num_queries):
+        baker.make(Product, company=company, quantity=2, cost_price=Decimal("10.00"), selling_price=Decimal("15.00"))
+        first = metrics.get_product_metrics(company)
+
+        with django_assert_num_queries(0):
+            assert metrics.get_product_metrics(company) == first
+
+    def test_write_invalidates_company_entries(self, company, django_capture_on_commit_callbacks):
+        baker.make(Product, company=company, quantity=2, cost_price=Decimal("10.00"), selling_price=Decimal("15.00"))
+        assert metrics.get_product_metrics(company)['total_quantity'] == 2
+
+        with django_capture_on_commit_callbacks(execute=True):
+            baker.make(Product, company=company, quantity=3, cost_price=Decimal("10.00"), selling_price=Decimal("15.00"))
+        assert metrics.get_product_metrics(company)['total_quantity'] == 5
+
+    def test_version_moves_only_after_commit(self, company, django_capture_on_commit_callbacks):
+        version = get_company_version(company)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            baker.make(Brand, company=company)
+            assert get_company_version(company) == version
+
+        assert get_company_version(company) > version
+
+    def test_writes_only_bump_their_own_company(self, company, django_capture_on_commit_callbacks):
+        from companies.models import Company
+        other_company = baker.make(Company)
+        version = get_company_version(company)
+        other_version = get_company_version(other_company)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            baker.make(Brand, company=other_company)
+
+        assert get_company_version(company) == version
+        assert get_company_version(other_company) > other_version
+
+    def test_sale_item_delete_bumps_sale_company(self, company, django_capture_on_commit_callbacks, django_assert_num_queries):
+        product = baker.make(Product, company=company)
+        sale = baker.make(Sale, company=company)
+        item = baker.make(SaleItem, sale=sale, product=product, quantity=1, unit_price=Decimal("1.00"))
+        version = get_company_version(company)
+
+        # The sale is already loaded: only the DELETE itself runs.
+        with django_capture_on_commit_callbacks(execute=True), django_assert_num_queries(1):
+            item.delete()
+
+        assert get_company_version(company) > version
+
+    def test_file_based_backend(self, company, tmp_path, django_assert_num_queries):
+        caches = {'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': str(tmp_path),
+        }}
+        with override_settings(CACHES=caches):
+            baker.make(Brand, company=company, name='Acme')
+            first = metrics.get_graphic_product_brand_metric(company)
+            with django_assert_num_queries(0):
+                assert metrics.get_graphic_product_brand_metric(company) == first
+            cache.clear()
@@ -16,8 +16,61 @@ class TestDashboard:
         url = reverse('home')
         response = auth_client.get(url)
         assert response.status_code == 200
-        # Check if metrics are in context
-        assert 'sales_metrics' in response.context
-        assert 'product_metrics' in response.context
-        assert 'top_clients' in response.context
-        assert 'value_by_seller' in response.context
+        assert 'sales_series_days' in response.context
+        assert reverse('dashboard_panel', args=['sales-metrics']).encode() in response.content
+
+    @pytest.mark.parametrize('panel', ['product-metrics', 'inventory-history', 'sales-metrics', 'category-counts', 'brand-counts', 'seller-ranking', 'top-clients'])
+    def test_dashboard_panels(self, auth_client, company, admin_user, panel):
+        from clients.models import Client
+        client = baker.make(Client, company=company, telephone='65999999999')
+        baker.make(Sale, company=company, order_status='finalized', total=500.00, client=client, seller=admin_user)
+
+        url = reverse('dashboard_panel', args=[panel])
+        response = auth_client.get(url)
+        assert response.status_code == 200
+        assert response['ETag']
+        assert response['Last-Modified']
+
+    def test_dashboard_panel_conditional_get(self, auth_client, company, django_capture_on_commit_callbacks):
+        url = reverse('dashboard_panel', args=['product-metrics'])
+        response = auth_client.get(url)
+
+        cached_response = auth_client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        assert cached_response.status_code == 304
+
+        with django_capture_on_commit_callbacks(execute=True):
+            baker.make(Product, company=company, quantity=1)
+        changed_response = auth_client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        assert changed_response.status_code == 200
+        assert changed_response.json()['total_quantity'] == 1
+
+    def test_dashboard_unknown_panel(self, auth_client, company):
+        url = reverse('dashboard_panel', args=['unknown'])
+        response = auth_client.get(url)
+        assert response.status_code == 404
+
+    def test_sales_time_series_endpoint(self, auth_client, company):
+        url = reverse('sales_time_series')
+        response = auth_client.get(url, {'days': 30, 'interval': 'week'})
+        assert response.status_code == 200
+        assert set(response.json()) == {'dates', 'values', 'quantities'}
+
+    def test_sales_time_series_endpoint_rejects_invalid_window(self, auth_client, company):
+        url = reverse('sales_time_series')
+        response = auth_client.get(url, {'days': 12})
+        assert response.status_code == 400
+
+
+@pytest.mark.django_db
+class TestLeaderboardEndpoint:
+    def test_leaderboard_endpoint(self, auth_client, company, admin_user):
+        baker.make(Sale, company=company, order_status='finalized', total=500.00, seller=admin_user)
+        url = reverse('leaderboard')
+        response = auth_client.get(url, {'group_by': 'seller', 'period': 'week', 'top': 5})
+        assert response.status_code == 200
+        assert response.json()['labels'] == ['admin']
+
+    def test_leaderboard_endpoint_rejects_invalid_dates(self, auth_client, company):
+        url = reverse('leaderboard')
+        response = auth_client.get(url, {'period': 'custom', 'start': '2024-13-01', 'end': '2024-12-31'})
+        assert response.status_code == 400
@@ -0,0 +1,197 @@
+import pytest
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from django.core.cache import cache
+from django.utils import timezone
+from model_bakery import baker
+from app import metrics
+from brands.models import Brand
+from categories.models import Category
+from outflows.models import Outflow
+from products.models import InventorySnapshot, Product
+from sales.models import DailySalesSummary, Sale, SaleItem
+
+
+@pytest.mark.django_db
+class TestSalesMetrics:
+    def test_sales_metrics_totals(self, company):
+        product = baker.make(Product, company=company, quantity=10, cost_price=Decimal("10.00"), selling_price=Decimal("20.00"))
+        sale = baker.make(Sale, company=company, order_status='finalized', total=Decimal("100.00"))
+        baker.make(SaleItem, sale=sale, product=product, quantity=3, unit_price=Decimal("33.34"))
+        baker.make(Outflow, company=company, product=product, quantity=2, sale_reference=None)
+        baker.make(Outflow, company=company, product=product, quantity=3, sale=sale, source='sale', sale_reference=f"Venda {sale.id}")
+        baker.make(Sale, company=company, order_status='draft', total=Decimal("999.00"))
+
+        result = metrics.get_sales_metrics(company)
+
+        assert result['total_sales'] == 1
+        assert result['total_outflows'] == 1
+        assert result['total_products_sold'] == 5
+        assert result['total_sales_value'] == '140,00'
+        assert result['total_sales_profit'] == '90,00'
+
+    def test_outflows_of_deleted_sales_are_not_manual(self, company):
+        product = baker.make(Product, company=company, quantity=10, cost_price=Decimal("10.00"), selling_price=Decimal("20.00"))
+        sale = baker.make(Sale, company=company, order_status='finalized')
+        baker.make(SaleItem, sale=sale, product=product, quantity=2, unit_price=Decimal("20.00"))
+        sale.finalize()
+        sale.delete()
+        cache.clear()
+
+        assert metrics.get_sales_metrics(company)['total_outflows'] == 0
+
+    def test_sales_metrics_query_count_is_constant(self, company, django_assert_num_queries):
+        product = baker.make(Product, company=company, quantity=100, cost_price=Decimal("10.00"), selling_price=Decimal("20.00"))
+        for _ in range(5):
+            sale = baker.make(Sale, company=company, order_status='finalized', total=Decimal("20.00"))
+            baker.make(SaleItem, sale=sale, product=product, quantity=1, unit_price=Decimal("20.00"))
+            baker.make(Outflow, company=company, product=product, quantity=1, sale_reference=None)
+
+        with django_assert_num_queries(3):
+            metrics.get_sales_metrics(company)
+
+
+@pytest.mark.django_db
+class TestSalesTimeSeries:
+    def test_time_series_fills_empty_days(self, company):
+        product = baker.make(Product, company=company, quantity=10, selling_price=Decimal("20.00"))
+        baker.make(Outflow, company=company, product=product, quantity=2)
+
+        result = metrics.get_sales_time_series(company, days=30)
+
+        assert len(result['dates']) == 30
+        assert result['dates'][-1] == str(timezone.localdate())
+        assert result['values'][-1] == 40.0
+        assert result['quantities'][-1] == 1
+        assert sum(result['quantities']) == 1
+
+    def test_time_series_buckets_in_local_time_zone(self, company):
+        product = baker.make(Product, company=company, quantity=10, selling_price=Decimal("20.00"))
+        outflow = baker.make(Outflow, company=company, product=product, quantity=1)
+        today = timezone.localdate()
+        # 02:00 UTC is still the previous day in America/Manaus (UTC-4).
+        created_at = datetime.combine(today, time(2, 0), tzinfo=dt_timezone.utc)
+        Outflow.objects.filter(pk=outflow.pk).update(created_at=created_at)
+        DailySalesSummary.rebuild(today - timedelta(days=6), today, company=company)
+
+        result = metrics.get_sales_time_series(company, days=7)
+
+        assert result['quantities'][-2] == 1
+        assert result['quantities'][-1] == 0
+
+    def test_time_series_runs_a_single_query(self, company, django_assert_num_queries):
+        product = baker.make(Product, company=company, quantity=10, selling_price=Decimal("20.00"))
+        baker.make(Outflow, company=company, product=product, quantity=1, _quantity=3)
+
+        with django_assert_num_queries(1):
+            metrics.get_sales_time_series(company, days=365, interval='month')
+
+    def test_time_series_rejects_unknown_window(self, company):
+        with pytest.raises(ValueError):
+            metrics.get_sales_time_series(company, days=10)
+
+
+@pytest.mark.django_db
+class TestProductDistribution:
+    def test_category_distribution_folds_tail_into_outros(self, company, django_assert_num_queries):
+        categories = [baker.make(Category, company=company, name=f'Categoria {i}') for i in range(4)]
+        for index, category in enumerate(categories):
+            baker.make(Product, company=company, category=category, quantity=2, cost_price=Decimal("5.00"), _quantity=4 - index)
+
+        with django_assert_num_queries(1):
+            result = metrics.get_product_count_by_category_metric(company, top=2)
+
+        assert result['labels'] == ['Categoria 0', 'Categoria 1', 'Outros']
+        assert result['counts'] == [4, 3, 3]
+        assert result['stock_value'] == [40.0, 30.0, 30.0]
+
+    def test_brand_distribution_includes_revenue(self, company):
+        brand = baker.make(Brand, company=company, name='Acme')
+        baker.make(Brand, company=company, name='Vazia')
+        product = baker.make(Product, company=company, brand=brand, quantity=0)
+        sale = baker.make(Sale, company=company, order_status='finalized')
+        baker.make(SaleItem, sale=sale, product=product, quantity=2, unit_price=Decimal("12.50"))
+        draft = baker.make(Sale, company=company, order_status='draft')
+        baker.make(SaleItem, sale=draft, product=product, quantity=5, unit_price=Decimal("12.50"))
+
+        result = metrics.get_graphic_product_brand_metric(company)
+
+        assert result['labels'] == ['Acme', 'Vazia']
+        assert result['counts'] == [1, 0]
+        assert result['revenue'] == [25.0, 0.0]
+        assert result['stock_value'] == [0.0, 0.0]
+
+
+@pytest.mark.django_db
+class TestLeaderboard:
+    def _make_sale(self, company, days_ago, total, **kwargs):
+        sale = baker.make(Sale, company=company, order_status='finalized', total=Decimal(total), **kwargs)
+        sale_date = timezone.now() - timedelta(days=days_ago)
+        Sale.objects.filter(pk=sale.pk).update(sale_date=sale_date)
+        return sale
+
+    def test_client_leaderboard_with_previous_period(self, company, django_assert_num_queries):
+        from clients.models import Client
+        alice = baker.make(Client, company=company, name='Alice', telephone='65999999999')
+        bob = baker.make(Client, company=company, name='Bob', telephone='65999999999')
+        today = timezone.localdate()
+        self._make_sale(company, 1, '100.00', client=alice)
+        self._make_sale(company, 2, '50.00', client=alice)
+        self._make_sale(company, 3, '300.00', client=bob)
+        self._make_sale(company, 12, '80.00', client=alice)
+        self._make_sale(company, 30, '999.00', client=bob)
+
+        with django_assert_num_queries(1):
+            result = metrics.get_leaderboard(
+                company, group_by='client', period='custom',
+                start=today - timedelta(days=9), end=today,
+            )
+
+        assert result['labels'] == ['Bob', 'Alice']
+        assert result['values'] == [300.0, 150.0]
+        assert result['previous_values'] == [0.0, 80.0]
+        assert result['previous_end'] == str(today - timedelta(days=10))
+
+    def test_seller_leaderboard_top_n(self, company):
+        from django.contrib.auth.models import User
+        sellers = [baker.make(User, first_name=f'Vendedor {i}', last_name='') for i in range(3)]
+        for index, seller in enumerate(sellers):
+            self._make_sale(company, 0, f'{(index + 1) * 10}.00', seller=seller)
+
+        result = metrics.get_leaderboard(company, group_by='seller', period='today', top=2)
+
+        assert result['labels'] == ['Vendedor 2', 'Vendedor 1']
+        assert result['values'] == [30.0, 20.0]
+
+    def test_leaderboard_rejects_incomplete_custom_range(self, company):
+        with pytest.raises(ValueError):
+            metrics.get_leaderboard(company, period='custom')
+
+
+@pytest.mark.django_db
+class TestInventoryMetrics:
+    def test_product_metrics_single_aggregate(self, company, django_assert_num_queries):
+        baker.make(Product, company=company, quantity=2, cost_price=Decimal("10.00"), selling_price=Decimal("15.00"))
+        baker.make(Product, company=company, quantity=3, cost_price=Decimal("20.00"), selling_price=Decimal("30.00"))
+        baker.make(Product, company=company, quantity=-1, cost_price=Decimal("20.00"), selling_price=Decimal("30.00"))
+
+        with django_assert_num_queries(1):
+            result = metrics.get_product_metrics(company)
+
+        assert result == {
+            'total_cost_price': '80,00',
+            'total_selling_price': '120,00',
+            'total_quantity': 5,
+            'total_profit': '40,00',
+        }
+
+    def test_inventory_value_series_reads_snapshots(self, company):
+        baker.make(Product, company=company, quantity=2, cost_price=Decimal("10.00"), selling_price=Decimal("15.00"))
+        InventorySnapshot.capture(company=company)
+
+        result = metrics.get_inventory_value_series(company, days=7)
+
+        assert len(result['dates']) == 7
+        assert result['cost_values'][-1] == 20.0
+        assert result['selling_values'][-1] == 30.0
+        assert result['cost_values'][0] is None
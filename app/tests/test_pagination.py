@@ -0,0 +1,82 @@
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from model_bakery import baker
+from rest_framework.test import APIClient
+from app.pagination import keyset_paginate
+from outflows.models import Outflow
+from products.models import Product
+from sales.models import Sale
+
+
+def _make_sales(company, quantity):
+    sales = baker.make(Sale, company=company, sale_type='order', order_status='finalized', _quantity=quantity)
+    # Every sale shares the same timestamp, so the id is the only tiebreaker.
+    Sale.objects.filter(company=company).update(sale_date=timezone.now())
+    return sorted(sale.pk for sale in sales)
+
+
+@pytest.mark.django_db
+class TestKeysetPagination:
+    def test_walks_forward_and_back_with_ties(self, company):
+        expected = list(reversed(_make_sales(company, 7)))
+        queryset = Sale.objects.filter(company=company)
+
+        first = keyset_paginate(queryset, 'sale_date', 3)
+        second = keyset_paginate(queryset, 'sale_date', 3, cursor=first.next_cursor)
+        third = keyset_paginate(queryset, 'sale_date', 3, cursor=second.next_cursor)
+        back = keyset_paginate(queryset, 'sale_date', 3, cursor=third.previous_cursor)
+
+        assert [sale.pk for sale in first] + [sale.pk for sale in second] + [sale.pk for sale in third] == expected
+        assert not first.has_previous() and third.has_previous()
+        assert not third.has_next()
+        assert [sale.pk for sale in back] == [sale.pk for sale in second]
+        assert back.has_previous() and back.has_next()
+
+    def test_cursor_condition_bounds_the_leading_field(self, company):
+        from app.pagination import _after
+        now = timezone.now()
+        sql = str(Sale.objects.filter(_after(('sale_date', 'id'), (now, 5), descending=True)).query)
+
+        assert '"sales_sale"."sale_date" <=' in sql
+
+    def test_exact_count_is_optional(self, company, django_assert_num_queries):
+        _make_sales(company, 4)
+        queryset = Sale.objects.filter(company=company)
+
+        with django_assert_num_queries(1):
+            keyset_paginate(queryset, 'sale_date', 2)
+        with django_assert_num_queries(2):
+            page = keyset_paginate(queryset, 'sale_date', 2, count='exact')
+        assert page.count == 4
+
+    def test_sale_list_follows_cursor(self, auth_client, company):
+        expected = list(reversed(_make_sales(company, 10)))
+        url = reverse('sale_list')
+
+        first = auth_client.get(url)
+        second = auth_client.get(url, {'cursor': first.context['page_obj'].next_cursor})
+
+        assert [sale.pk for sale in first.context['sales']] == expected[:8]
+        assert [sale.pk for sale in second.context['sales']] == expected[8:]
+        assert b'cursor=' in first.content
+
+    def test_invalid_cursor_returns_404(self, auth_client):
+        response = auth_client.get(reverse('sale_list'), {'cursor': 'invalido'})
+        assert response.status_code == 404
+
+    def test_outflow_api_pages_with_estimated_count(self, admin_user, company):
+        product = baker.make(Product, company=company, quantity=100)
+        baker.make(Outflow, company=company, product=product, quantity=1, _quantity=5)
+        client = APIClient()
+        client.force_authenticate(user=admin_user)
+        url = reverse('outflow-create-list-api-view')
+
+        first = client.get(url, {'page_size': 3, 'count': 'estimate'}).json()
+        second = client.get(first['next']).json()
+
+        assert first['count'] == 5
+        assert len(first['results']) == 3
+        assert len(second['results']) == 2
+        assert second['next'] is None
+        assert second['previous']
@@ -0,0 +1,59 @@
+import re
+from decimal import Decimal
+import pytest
+from model_bakery import baker
+from app.pdf import PRODUCT_WIDTH, TEXT, SaleDocument, fit_text, text_width
+from budgets.utils.pdf import generate_budget_pdf
+from products.models import Product
+from sale_order.utils.pdf import generate_order_pdf
+from sales.models import Sale, SaleItem
+from sales.utils.pdf import generate_invoice_pdf
+
+
+def _page_count(pdf):
+    return len(re.findall(rb'/Type /Page\b', pdf))
+
+
+def _make_sale(company, lines):
+    products = baker.make(Product, company=company, cost_price=Decimal('1.00'), _quantity=3)
+    sale = baker.make(Sale, company=company, client=None, discount=Decimal('10.00'))
+    SaleItem.objects.bulk_create([
+        SaleItem(sale=sale, product=products[index % 3], quantity=2, unit_price=Decimal('5.00'), purchase_price=Decimal('1.00'))
+        for index in range(lines)
+    ])
+    return sale
+
+
+class CountingDocument(SaleDocument):
+    headers = 0
+
+    def _draw_table_header(self):
+        self.headers += 1
+        super()._draw_table_header()
+
+
+def test_fit_text_cuts_long_titles():
+    font, size = TEXT
+    title = 'Produto com um nome muito longo ' * 5
+    fitted = fit_text(title, font, size, PRODUCT_WIDTH)
+    assert fitted.endswith('…')
+    assert text_width(fitted, font, size) <= PRODUCT_WIDTH
+    assert fit_text('Curto', font, size, PRODUCT_WIDTH) == 'Curto'
+
+
+@pytest.mark.django_db
+class TestSaleDocument:
+    def test_long_documents_break_pages_and_repeat_header(self, company):
+        sale = _make_sale(company, 120)
+        document = CountingDocument(title='TESTE', heading=f'Venda {sale.pk}', footer='Rodapé')
+
+        pdf = document.render(sale)
+
+        assert pdf.startswith(b'%PDF')
+        assert document.page > 1
+        assert _page_count(pdf) == document.page
+        assert document.headers == document.page
+
+    @pytest.mark.parametrize('generator', [generate_invoice_pdf, generate_order_pdf, generate_budget_pdf])
+    def test_generators_render_every_page(self, company, generator):
+        assert _page_count(generator(_make_sale(company, 80))) >= 2
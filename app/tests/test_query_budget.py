@@ -0,0 +1,89 @@
+import logging
+import pytest
+from django.urls import URLPattern, URLResolver, get_resolver, resolve, reverse
+from model_bakery import baker
+from app.query_budget import QueryBudgetExceeded, get_view_budget
+from clients.models import Client
+from products.models import Product
+from sales.models import Sale, SaleItem
+from sales.views import SaleListView
+
+
+def _url_patterns(patterns):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _url_patterns(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern):
+            yield pattern
+
+
+def _view_func(name):
+    return resolve(reverse(name)).func
+
+
+def _make_sales(company, admin_user, quantity=8):
+    for _ in range(quantity):
+        client = baker.make(Client, company=company, telephone='65999999999')
+        baker.make(Sale, company=company, sale_type='order', order_status='finalized', client=client, seller=admin_user)
+
+
+def _lazy_get_queryset(self):
+    return Sale.objects.filter(company=self.request.user.profile.company, order_status='finalized')
+
+
+@pytest.mark.django_db
+class TestQueryBudget:
+    def test_every_view_has_a_budget(self):
+        for pattern in _url_patterns(get_resolver().url_patterns):
+            budget = get_view_budget(pattern.callback)
+            assert isinstance(budget, int) and budget > 0, pattern
+
+    def test_declared_budgets(self):
+        assert get_view_budget(_view_func('sale_list')) == SaleListView.query_budget
+        assert get_view_budget(_view_func('home')) == 6
+
+    def test_sale_list_within_budget(self, auth_client, company, admin_user):
+        _make_sales(company, admin_user)
+
+        response = auth_client.get(reverse('sale_list'))
+        assert response.status_code == 200
+
+    def test_sale_detail_within_budget(self, auth_client, company):
+        sale = baker.make(Sale, company=company, order_status='finalized')
+        for product in baker.make(Product, company=company, quantity=10, _quantity=6):
+            baker.make(SaleItem, sale=sale, product=product, quantity=1)
+
+        response = auth_client.get(reverse('sale_detail', args=[sale.pk]))
+        assert response.status_code == 200
+
+    def test_violation_names_template_line(self, auth_client, company, admin_user, monkeypatch):
+        _make_sales(company, admin_user)
+        monkeypatch.setattr(SaleListView, 'get_queryset', _lazy_get_queryset)
+
+        with pytest.raises(QueryBudgetExceeded) as error:
+            auth_client.get(reverse('sale_list'))
+
+        message = str(error.value)
+        assert 'orçamento: 12' in message
+        assert 'template sale_list.html, linha 66' in message
+
+    def test_log_mode_keeps_response(self, auth_client, company, admin_user, monkeypatch, settings, caplog):
+        settings.QUERY_BUDGET_MODE = 'log'
+        _make_sales(company, admin_user)
+        monkeypatch.setattr(SaleListView, 'get_queryset', _lazy_get_queryset)
+
+        with caplog.at_level(logging.WARNING, logger='app.query_budget'):
+            response = auth_client.get(reverse('sale_list'))
+
+        assert response.status_code == 200
+        assert 'sale_list.html' in caplog.text
+
+    def test_stack_is_not_walked_within_budget(self, auth_client, company, admin_user, monkeypatch):
+        _make_sales(company, admin_user)
+        calls = list()
+        monkeypatch.setattr('app.query_budget.find_query_origin', lambda: calls.append(1) or 'origem')
+
+        response = auth_client.get(reverse('sale_list'))
+
+        assert response.status_code == 200
+        assert calls == []
@@ -15,6 +15,9 @@ urlpatterns = [
     path('api/v1/', include('authentication.urls')),
 
     path('', views.home, name='home'),
+    path('dashboard/sales-series/', views.sales_time_series, name='sales_time_series'),
+    path('dashboard/panels/<slug:panel>/', views.dashboard_panel, name='dashboard_panel'),
+    path('dashboard/leaderboard/', views.leaderboard, name='leaderboard'),
     path('', include('brands.urls')),
     path('', include('budgets.urls')),
     path('', include('categories.urls')),
@@ -1,47 +1,167 @@
-import json
+import hashlib
+from datetime import date
 from django.contrib.auth.decorators import login_required
+from django.http import Http404, JsonResponse
 from django.shortcuts import render
+from django.utils import timezone
+from django.views.decorators.http import condition
 from . import metrics
-from companies.models import Company
+from .cache import get_company_last_modified, get_company_version
+from .query_budget import query_budget
 
+
+def _get_company(request):
+    if hasattr(request.user, 'profile'):
+        return getattr(request.user.profile, 'company', None)
+    return None
+
+
+def _get_int_param(request, name, default):
+    try:
+        return int(request.GET.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _get_date_param(request, name):
+    value = request.GET.get(name)
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f'Data inválida: {value}. Use o formato AAAA-MM-DD.')
+
+
+def _seller_ranking_panel(company):
+    leaderboard = metrics.get_leaderboard(company, group_by='seller', period='month')
+    return {
+        'sellers': leaderboard['labels'],
+        'values': leaderboard['values'],
+        'previous_values': leaderboard['previous_values'],
+    }
+
+
+def _top_clients_panel(company):
+    leaderboard = metrics.get_leaderboard(company, group_by='client', period='last_30_days', top=3)
+    return {
+        'clients': leaderboard['labels'],
+        'total_values': leaderboard['values'],
+        'previous_values': leaderboard['previous_values'],
+    }
+
+
+DASHBOARD_PANELS = {
+    'product-metrics': ('products.view_product', metrics.get_product_metrics),
+    'inventory-history': ('products.view_product', metrics.get_inventory_value_series),
+    'sales-metrics': ('outflows.view_outflow', metrics.get_sales_metrics),
+    'category-counts': ('products.view_product', metrics.get_product_count_by_category_metric),
+    'brand-counts': ('products.view_product', metrics.get_graphic_product_brand_metric),
+    'seller-ranking': ('outflows.view_outflow', _seller_ranking_panel),
+    'top-clients': ('outflows.view_outflow', _top_clients_panel),
+}
+
+
+def _panel_etag(request, panel=None):
+    company = _get_company(request)
+    if not company:
+        return None
+    arguments = f'{panel or request.path}:{request.GET.urlencode()}:{timezone.localdate()}'
+    digest = hashlib.md5(arguments.encode('utf-8')).hexdigest()[:12]
+    return f'{company.pk}-{get_company_version(company)}-{digest}'
+
+
+def _panel_last_modified(request, panel=None):
+    company = _get_company(request)
+    if not company:
+        return None
+    return get_company_last_modified(company)
+
+
+@query_budget(6)
 @login_required(login_url='login')
 def home(request):
-    company = None
-    if hasattr(request.user, 'profile'):
-        company = getattr(request.user.profile, 'company', None)
+    company = _get_company(request)
 
     if not company:
         return render(request, 'no_company.html')
 
-    product_metrics = metrics.get_product_metrics(company)
-    sales_metrics = metrics.get_sales_metrics(company)
-    daily_sales_data = metrics.get_daily_sales_data(company)
-    daily_sales_quantity_data = metrics.get_daily_sales_quantity_data(company)
-    product_count_by_category_metric = metrics.get_product_count_by_category_metric(company)
-    graphic_product_brand_metric = metrics.get_graphic_product_brand_metric(company)
-    seller_metrics = metrics.get_sales_by_seller_metrics(company)
-    top_clients_data = metrics.get_top_clients_last_month(company)
+    sales_series_days = _get_int_param(request, 'days', 7)
+    if sales_series_days not in metrics.SALES_SERIES_WINDOWS:
+        sales_series_days = 7
 
     context = {
-        'product_metrics': product_metrics,
-        'sales_metrics': sales_metrics,
-        'daily_sales_data': json.dumps(daily_sales_data),
-        'daily_sales_quantity_data': json.dumps(daily_sales_quantity_data),
-        'product_count_by_category': json.dumps(product_count_by_category_metric),
-        'product_count_by_brand': json.dumps(graphic_product_brand_metric),
-        'value_by_seller': json.dumps(seller_metrics['value_by_seller']),
-        'top_clients': json.dumps(top_clients_data),
-        'sales_by_seller_data': json.dumps({
-            'sellers': list(seller_metrics['value_by_seller'].keys()),
-            'values': list(seller_metrics['value_by_seller'].values()),
-        }),
-        'top_customers_data': json.dumps({
-            'clients': list(top_clients_data['clients']),
-            'total_values': list(top_clients_data['values']),
-        }),
+        'sales_series_days': sales_series_days,
+        'sales_series_windows': metrics.SALES_SERIES_WINDOWS,
     }
 
     return render(request, 'home.html', context)
 
 
+@query_budget(8)
+@login_required(login_url='login')
+@condition(etag_func=_panel_etag, last_modified_func=_panel_last_modified)
+def dashboard_panel(request, panel):
+    if panel not in DASHBOARD_PANELS:
+        raise Http404('Painel não encontrado.')
+
+    company = _get_company(request)
+
+    if not company:
+        return JsonResponse({'detail': 'Usuário não associado a uma empresa.'}, status=403)
+
+    permission, builder = DASHBOARD_PANELS[panel]
+    if not request.user.has_perm(permission):
+        return JsonResponse({'detail': 'Você não tem permissão para acessar este painel.'}, status=403)
+
+    return JsonResponse(builder(company))
+
+
+@login_required(login_url='login')
+@condition(etag_func=_panel_etag, last_modified_func=_panel_last_modified)
+def sales_time_series(request):
+    company = _get_company(request)
+
+    if not company:
+        return JsonResponse({'detail': 'Usuário não associado a uma empresa.'}, status=403)
+
+    if not request.user.has_perm('outflows.view_outflow'):
+        return JsonResponse({'detail': 'Você não tem permissão para acessar este painel.'}, status=403)
+
+    days = _get_int_param(request, 'days', 7)
+    interval = request.GET.get('interval', 'day')
+
+    try:
+        data = metrics.get_sales_time_series(company, days=days, interval=interval)
+    except ValueError as error:
+        return JsonResponse({'detail': str(error)}, status=400)
+
+    return JsonResponse(data)
+
+
+@login_required(login_url='login')
+@condition(etag_func=_panel_etag, last_modified_func=_panel_last_modified)
+def leaderboard(request):
+    company = _get_company(request)
+
+    if not company:
+        return JsonResponse({'detail': 'Usuário não associado a uma empresa.'}, status=403)
+
+    if not request.user.has_perm('outflows.view_outflow'):
+        return JsonResponse({'detail': 'Você não tem permissão para acessar este painel.'}, status=403)
+
+    top = _get_int_param(request, 'top', None)
+
+    try:
+        data = metrics.get_leaderboard(
+            company,
+            group_by=request.GET.get('group_by', 'seller'),
+            period=request.GET.get('period', 'month'),
+            start=_get_date_param(request, 'start'),
+            end=_get_date_param(request, 'end'),
+            top=top if top and top > 0 else None,
+        )
+    except ValueError as error:
+        return JsonResponse({'detail': str(error)}, status=400)
 
+    return JsonResponse(data)
@@ -5,7 +5,7 @@ from django.http import HttpResponseRedirect
 from django.urls import reverse_lazy
 from django.views.generic import ListView, CreateView, DetailView, UpdateView, DeleteView
 from rest_framework import generics
-from companies.mixins import CompanyObjectMixin
+from companies.mixins import CompanyObjectMixin, IdempotentCreateMixin
 from . import models, forms, serializers
 
 
@@ -72,7 +72,7 @@ class BrandDeleteView(LoginRequiredMixin, PermissionRequiredMixin, CompanyObject
             return self.render_to_response(self.get_context_data())
 
 
-class BrandCreateListAPIView(generics.ListCreateAPIView):
+class BrandCreateListAPIView(IdempotentCreateMixin, generics.ListCreateAPIView):
     queryset = models.Brand.objects.all()
     serializer_class = serializers.BrandSerializer
 
@@ -1,13 +1,12 @@
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
-from django.http import HttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse_lazy
 from django.views import View
 from django.views.generic import ListView, CreateView, UpdateView, DetailView, DeleteView
 from companies.mixins import CompanyObjectMixin
 from sales import forms
+from sales.documents import CachedDocumentMixin
 from sales.models import Budget
-from .utils.pdf import generate_budget_pdf
 
 
 class BudgetListView(LoginRequiredMixin, PermissionRequiredMixin, CompanyObjectMixin, ListView):
@@ -15,30 +14,30 @@ class BudgetListView(LoginRequiredMixin, PermissionRequiredMixin, CompanyObjectM
     template_name = 'budget_list.html'
     context_object_name = 'budgets'
     permission_required = 'sales.view_budget'
+    query_budget = 8
 
     def get_queryset(self):
-        return Budget.objects.exclude(order_status__in=['converted', 'finalized']).filter(company=self.request.user.profile.company)
+        return Budget.objects.exclude(order_status__in=['converted', 'finalized']).filter(
+            company=self.request.user.profile.company,
+        ).select_related('client')
 
-class BudgetPDFView(LoginRequiredMixin, PermissionRequiredMixin, CompanyObjectMixin, DetailView):
+class BudgetPDFView(LoginRequiredMixin, PermissionRequiredMixin, CompanyObjectMixin, CachedDocumentMixin, DetailView):
     model = Budget
+    queryset = Budget.objects.select_related('company', 'client')
     permission_required = 'sales.view_budget'
-
-    def get(self, request, *args, **kwargs):
-        budget = self.get_object()
-        pdf = generate_budget_pdf(budget)
-        response = HttpResponse(pdf, content_type='application/pdf')
-        response['Content-Disposition'] = f'attachment; filename="orcamento_{budget.id}.pdf"'
-        return response
+    query_budget = 8
+    document_kind = 'budget'
 
 
 class BudgetDetailView(LoginRequiredMixin, PermissionRequiredMixin, CompanyObjectMixin, DetailView):
     model = Budget
     template_name = 'budget_detail.html'
     permission_required = 'sales.view_budget'
+    query_budget = 8
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['items'] = self.object.items.all()
+        context['items'] = self.object.items.select_related('product')
         return context
 
 class BudgetCreateView(LoginRequiredMixin, PermissionRequiredMixin, CompanyObjectMixin, CreateView):
@@ -0,0 +1,27 @@
+from django.db import migrations
+
+
+class PostgreSQLRunSQL(migrations.RunSQL):
+    # See products/migrations/0006_product_search_indexes.py.
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0001_initial'),
+    ]
+
+    operations = [
+        PostgreSQLRunSQL(
+            'CREATE INDEX IF NOT EXISTS client_name_search_idx ON clients_client '
+            '(company_id, UPPER(name::text) text_pattern_ops)',
+            'DROP INDEX IF EXISTS client_name_search_idx',
+        ),
+    ]
@@ -20,6 +20,13 @@ class TestClientViews:
         assert response.status_code == 302
         assert Client.objects.filter(name='New Client', company=company).exists()
 
+    def test_client_autocomplete(self, auth_client, company):
+        maria = baker.make(Client, name='Maria Souza', company=company, telephone='65999999999')
+        baker.make(Client, name='Ana Maria', company=company, telephone='65999999999')
+        response = auth_client.get(reverse('client_autocomplete'), {'q': 'mar'})
+        assert response.status_code == 200
+        assert response.json()['results'] == [{'id': maria.pk, 'text': 'Maria Souza'}]
+
 @pytest.mark.django_db
 class TestClientAPI:
     def test_client_list_api(self, admin_user, company):
@@ -2,7 +2,8 @@ from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMix
 from django.urls import reverse_lazy
 from django.views.generic import ListView, CreateView, DetailView, UpdateView, DeleteView
 from rest_framework import generics
-from companies.mixins import CompanyObjectMixin
+from app.autocomplete import AutocompleteView
+from companies.mixins import CompanyObjectMixin, IdempotentCreateMixin
 from . import models, forms, serializers
 
 
@@ -57,7 +58,7 @@ class ClientDeleteView(LoginRequiredMixin, PermissionRequiredMixin, CompanyObjec
     permission_required = 'clients.delete_client'
 
 
-class ClientCreateListAPIView(generics.ListCreateAPIView):
+class ClientCreateListAPIView(IdempotentCreateMixin, generics.ListCreateAPIView):
     queryset = models.Client.objects.all()
     serializer_class = serializers.ClientSerializer
 
@@ -74,3 +75,9 @@ class ClientRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
 
     def get_queryset(self):
         return models.Client.objects.filter(company=self.request.user.profile.company)
+
+
+class ClientAutocompleteView(AutocompleteView):
+    model = models.Client
+    search_fields = ('name',)
+    ordering = ('name', 'pk')
@@ -47,6 +47,7 @@ class CompanyAdmin(admin.ModelAdmin):
     list_display = ('name', 'cnpj', 'is_active', 'email')
     search_fields = ('name', 'cnpj', 'email')
     list_filter = ('is_active',)
+    readonly_fields = ('catalog_version',)
     inlines = [UserProfileCompanyInline]
 
     def get_group(self, obj):
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from companies.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    help = 'Remove as chaves de idempotência expiradas (agendar periodicamente, ex.: a cada hora).'
+
+    def handle(self, *args, **options):
+        deleted = IdempotencyKey.purge_expired()
+        self.stdout.write(self.style.SUCCESS(f'{deleted} chaves de idempotência expiradas removidas.'))
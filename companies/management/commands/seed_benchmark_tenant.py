@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+from companies.models import Company
+from companies.seeding import TENANT_SIZES, delete_tenant, seed_tenant
+
+
+class Command(BaseCommand):
+    help = 'Cria uma empresa sintética e determinística para benchmarks (requer model_bakery).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', choices=tuple(TENANT_SIZES), default='small', help='Tamanho do tenant. Padrão: small (10 mil vendas).')
+        parser.add_argument('--seed', type=int, default=42, help='Semente aleatória. Padrão: 42.')
+        parser.add_argument('--name', help='Nome da empresa. Padrão: "Benchmark <size>".')
+        parser.add_argument('--replace', action='store_true', help='Remove uma empresa existente com o mesmo nome antes de gerar.')
+
+    def handle(self, *args, **options):
+        try:
+            import model_bakery    # noqa: F401
+        except ImportError:
+            raise CommandError('model_bakery não está instalado. Instale as dependências de desenvolvimento.')
+
+        name = options['name'] or f"Benchmark {options['size']}"
+        existing = Company.objects.filter(name=name)
+        if existing.exists():
+            if not options['replace']:
+                raise CommandError(f'A empresa "{name}" já existe. Use --replace para recriá-la.')
+            for company in existing:
+                delete_tenant(company)
+
+        company = seed_tenant(size=options['size'], seed=options['seed'], name=name, stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS(f'Empresa "{company.name}" (id {company.pk}) gerada.'))
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-18 12:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0007_idempotencykey'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='company',
+            name='catalog_version',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+    ]
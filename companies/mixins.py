@@ -1,5 +1,15 @@
+import hashlib
+import json
 from django.core.exceptions import PermissionDenied
+from django.core.files.uploadedfile import UploadedFile
+from django.core.serializers.json import DjangoJSONEncoder
 from django.contrib import messages
+from django.db import transaction
+from django.http import QueryDict
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+from .models import IdempotencyKey
 
 
 class CompanyObjectMixin:
@@ -10,4 +20,65 @@ class CompanyObjectMixin:
             return queryset.filter(company=self.request.user.profile.company)
         except AttributeError:
             messages.error(self.request, "Seu usuário não está vinculado a nenhuma empresa.")
-            raise PermissionDenied("Usuário não associado a uma empresa.")
\ No newline at end of file
+            raise PermissionDenied("Usuário não associado a uma empresa.")
+
+
+class FingerprintEncoder(DjangoJSONEncoder):
+    # Uploaded files (multipart creates) are identified by name, size and content.
+    def default(self, o):
+        if isinstance(o, UploadedFile):
+            digest = hashlib.sha256()
+            for chunk in o.chunks():
+                digest.update(chunk)
+            o.seek(0)
+            return [o.name, o.size, digest.hexdigest()]
+        return super().default(o)
+
+
+def request_fingerprint(path, data):
+    if isinstance(data, QueryDict):
+        data = dict(data.lists())
+    return hashlib.sha256(json.dumps([path, data], sort_keys=True, cls=FingerprintEncoder).encode()).hexdigest()
+
+
+class IdempotentCreateMixin:
+    idempotency_header = 'Idempotency-Key'
+
+    def create(self, request, *args, **kwargs):
+        key = request.headers.get(self.idempotency_header)
+        if not key:
+            return super().create(request, *args, **kwargs)
+        if len(key) > IdempotencyKey._meta.get_field('key').max_length:
+            return Response({'detail': 'Idempotency-Key muito longa.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        fingerprint = request_fingerprint(request.path, request.data)
+
+        # The key row is written in the same transaction as the create, so a
+        # failed create leaves no key behind and concurrent retries wait on the
+        # unique constraint instead of running the checkout twice.
+        with transaction.atomic():
+            record, created = IdempotencyKey.objects.select_for_update().get_or_create(
+                company=request.user.profile.company,
+                key=key,
+                defaults=dict(path=request.path, fingerprint=fingerprint, expires_at=IdempotencyKey.default_expiration()),
+            )
+            if not created and record.expires_at <= timezone.now():
+                record.path, record.fingerprint, record.status_code, record.response_body = request.path, fingerprint, None, None
+                record.expires_at = IdempotencyKey.default_expiration()
+                created = True
+
+            if not created:
+                if record.fingerprint != fingerprint:
+                    return Response(
+                        {'detail': 'Idempotency-Key já utilizada com outra requisição.'},
+                        status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    )
+                response = Response(record.response_body, status=record.status_code)
+                response['Idempotent-Replayed'] = 'true'
+                return response
+
+            response = super().create(request, *args, **kwargs)
+            record.status_code = response.status_code
+            record.response_body = response.data
+            record.save()
+        return response
@@ -0,0 +1,160 @@
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from random import Random
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+from brands.models import Brand
+from categories.models import Category
+from clients.models import Client
+from companies.models import Company, UserProfile
+from outflows.models import Outflow
+from products.models import InventorySnapshot, Product
+from sales.models import DailySalesSummary, Sale, SaleItem
+from stockmoviment.models import StockMoviment
+
+
+TENANT_SIZES = {
+    'tiny': dict(sales=1_000, products=200, brands=20, categories=10, clients=100, sellers=5),
+    'small': dict(sales=10_000, products=2_000, brands=200, categories=50, clients=1_000, sellers=10),
+    'medium': dict(sales=100_000, products=5_000, brands=1_000, categories=100, clients=5_000, sellers=25),
+    'large': dict(sales=1_000_000, products=10_000, brands=2_000, categories=200, clients=20_000, sellers=50),
+}
+
+HISTORY_DAYS = 365
+
+BATCH_SIZE = 5_000
+
+
+def _bulk_create_dated(model, objects, date_field, day, batch_size=BATCH_SIZE):
+    # auto_now_add fields ignore explicit values on insert, so rows are created
+    # per day and moved to that day afterwards with a single UPDATE.
+    created = model.objects.bulk_create(objects, batch_size=batch_size)
+    moment = timezone.make_aware(datetime.combine(day, time(12, 0)))
+    model.objects.filter(pk__in=[obj.pk for obj in created]).update(**{date_field: moment})
+    return created
+
+
+def seed_tenant(size='tiny', seed=42, name=None, stdout=None):
+    from model_bakery import baker
+
+    if size not in TENANT_SIZES:
+        raise ValueError(f'Tamanho inválido: {size}. Use um de {tuple(TENANT_SIZES)}.')
+
+    spec = TENANT_SIZES[size]
+    rng = Random(seed)
+    baker.seed(seed)
+    name = name or f'Benchmark {size}'
+
+    with transaction.atomic():
+        company = baker.make(Company, name=name, cnpj='00000000000100', address='Rua Benchmark, 1')
+        admin = User.objects.create_superuser(
+            username=f'bench_{company.pk}',
+            email=f'bench_{company.pk}@example.com',
+            password=None,
+        )
+        UserProfile.objects.create(user=admin, company=company, is_company_admin=True)
+
+        sellers = [
+            baker.make(User, username=f'bench_{company.pk}_seller_{i}', first_name=f'Vendedor {i}', last_name='')
+            for i in range(spec['sellers'])
+        ]
+        brands = Brand.objects.bulk_create(
+            baker.prepare(Brand, company=company, _quantity=spec['brands']), batch_size=BATCH_SIZE,
+        )
+        categories = Category.objects.bulk_create(
+            baker.prepare(Category, company=company, _quantity=spec['categories']), batch_size=BATCH_SIZE,
+        )
+        clients = Client.objects.bulk_create(
+            baker.prepare(Client, company=company, telephone='(65) 99999-9999', _quantity=spec['clients']),
+            batch_size=BATCH_SIZE,
+        )
+
+        products = list()
+        catalog_version = Company.next_catalog_version(company.pk)
+        for index in range(spec['products']):
+            cost_price = Decimal(rng.randint(500, 50_000)) / 100
+            products.append(baker.prepare(
+                Product,
+                company=company,
+                title=f'Produto {index:06d}',
+                serie_number=f'SN{seed}{index:08d}',
+                brand=brands[rng.randrange(len(brands))],
+                category=categories[rng.randrange(len(categories))],
+                quantity=rng.randint(0, 500),
+                cost_price=cost_price,
+                selling_price=(cost_price * Decimal('1.6')).quantize(Decimal('0.01')),
+                catalog_version=catalog_version,
+            ))
+        products = Product.objects.bulk_create(products, batch_size=BATCH_SIZE)
+
+    if stdout:
+        stdout.write(f'{name}: {len(products)} produtos, {len(brands)} marcas, {len(clients)} clientes.')
+
+    today = timezone.localdate()
+    sales_per_day, remainder = divmod(spec['sales'], HISTORY_DAYS)
+    for offset in range(HISTORY_DAYS):
+        day = today - timedelta(days=HISTORY_DAYS - 1 - offset)
+        day_sales = sales_per_day + (1 if offset < remainder else 0)
+        if not day_sales:
+            continue
+
+        with transaction.atomic():
+            sales = _bulk_create_dated(Sale, [
+                Sale(
+                    company=company,
+                    client=clients[rng.randrange(len(clients))],
+                    seller=sellers[rng.randrange(len(sellers))],
+                    cashier=admin,
+                    sale_type='order',
+                    order_status='finalized',
+                    payment_method=rng.choice(('cash', 'card', 'pix', 'boleto')),
+                )
+                for _ in range(day_sales)
+            ], 'sale_date', day)
+
+            items = list()
+            outflows = list()
+            movements = list()
+            totals = list()
+            for sale in sales:
+                total = Decimal('0.00')
+                for product in rng.sample(products, rng.randint(1, 4)):
+                    quantity = rng.randint(1, 5)
+                    total += product.selling_price * quantity
+                    items.append(SaleItem(
+                        sale=sale, product=product, quantity=quantity,
+                        unit_price=product.selling_price, purchase_price=product.cost_price,
+                    ))
+                    outflows.append(Outflow(
+                        company=company, product=product, quantity=quantity, sale=sale, source='sale',
+                        sale_reference=f'Venda {sale.pk}',
+                    ))
+                    movements.append(StockMoviment(
+                        company=company, product=product, quantity=quantity, movement_type='out',
+                    ))
+                sale.total = total
+                totals.append(sale)
+
+            Sale.objects.bulk_update(totals, ['total'], batch_size=BATCH_SIZE)
+            SaleItem.objects.bulk_create(items, batch_size=BATCH_SIZE)
+            _bulk_create_dated(Outflow, outflows, 'created_at', day)
+            _bulk_create_dated(StockMoviment, movements, 'date', day)
+
+        if stdout and (offset + 1) % 30 == 0:
+            stdout.write(f'{offset + 1}/{HISTORY_DAYS} dias gerados.')
+
+    DailySalesSummary.rebuild(today - timedelta(days=HISTORY_DAYS), today, company=company)
+    InventorySnapshot.capture(company=company)
+    return company
+
+
+@transaction.atomic
+def delete_tenant(company):
+    # Outflow.product, Product.brand and Product.category are PROTECT, so the
+    # company cascade cannot remove them on its own.
+    Outflow.objects.filter(company=company).delete()
+    Product.objects.filter(company=company).delete()
+    User.objects.filter(username__startswith=f'bench_{company.pk}_').delete()
+    User.objects.filter(username=f'bench_{company.pk}').delete()
+    company.delete()
@@ -0,0 +1,30 @@
+from django.db.models.signals import post_delete, post_save
+from app.cache import invalidate_company_cache
+from brands.models import Brand
+from categories.models import Category
+from inflows.models import Inflow
+from outflows.models import Outflow
+from products.models import Product
+from sales.models import Budget, Order, Sale, SaleItem
+
+
+DASHBOARD_MODELS = (Sale, Order, Budget, SaleItem, Outflow, Inflow, Product, Brand, Category)
+
+
+def _get_company_id(instance):
+    if isinstance(instance, SaleItem):
+        if SaleItem.sale.is_cached(instance):
+            return instance.sale.company_id
+        return Sale.objects.filter(pk=instance.sale_id).values_list('company_id', flat=True).first()
+    return instance.company_id
+
+
+def invalidate_dashboard_cache(sender, instance, **kwargs):
+    company_id = _get_company_id(instance)
+    if company_id:
+        invalidate_company_cache(company_id)
+
+
+for model in DASHBOARD_MODELS:
+    post_save.connect(invalidate_dashboard_cache, sender=model, dispatch_uid=f'dashboard_cache_save_{model.__name__}')
+    post_delete.connect(invalidate_dashboard_cache, sender=model, dispatch_uid=f'dashboard_cache_delete_{model.__name__}')
@@ -1,6 +1,7 @@
 import pytest
 from django.contrib.auth.models import User
 from companies.models import Company, UserProfile
+from django.core.cache import cache
 from model_bakery import baker
 
 @pytest.fixture
@@ -21,3 +22,23 @@ def admin_user(db, company):
 def auth_client(client, admin_user):
     client.login(username='admin', password='password123')
     return client
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from products.prices import _local_prices
+    cache.clear()
+    _local_prices.clear()
+    yield
+    cache.clear()
+    _local_prices.clear()
+
+
+@pytest.fixture(autouse=True)
+def enforce_query_budget(settings):
+    settings.QUERY_BUDGET_MODE = 'raise'
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path / 'media')
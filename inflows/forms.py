@@ -2,6 +2,7 @@ from django import forms
 from . import models
 from suppliers.models import Supplier
 from products.models import Product
+from app.autocomplete import AutocompleteSelect
 
 
 class InflowForm(forms.ModelForm):
@@ -11,7 +12,7 @@ class InflowForm(forms.ModelForm):
         fields = ['supplier', 'product', 'quantity', 'description']
         widgets = {
             'supplier': forms.Select(attrs={'class': 'form-control'}),
-            'product': forms.Select(attrs={'class': 'form-control'}),
+            'product': AutocompleteSelect('product_autocomplete', attrs={'class': 'form-control'}),
             'quantity': forms.NumberInput(attrs={'class': 'form-control'}),
             'description': forms.Textarea(attrs={'class': 'form-control', 'rows': 3}),
         }
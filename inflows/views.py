@@ -2,7 +2,7 @@ from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMix
 from django.urls import reverse_lazy
 from django.views.generic import ListView, CreateView, DetailView
 from rest_framework import generics
-from companies.mixins import CompanyObjectMixin
+from companies.mixins import CompanyObjectMixin, IdempotentCreateMixin
 from . import models, forms, serializers
 
 
@@ -12,9 +12,10 @@ class InflowListView(LoginRequiredMixin, PermissionRequiredMixin, CompanyObjectM
     context_object_name = 'inflows'
     paginate_by = 8
     permission_required = 'inflows.view_inflow'
+    query_budget = 10
 
     def get_queryset(self):
-        queryset = super().get_queryset().filter(company=self.request.user.profile.company)
+        queryset = super().get_queryset().filter(company=self.request.user.profile.company).select_related('product')
         product = self.request.GET.get('product')
 
         if product:
@@ -47,7 +48,7 @@ class InflowDetailView(LoginRequiredMixin, PermissionRequiredMixin, CompanyObjec
     permission_required = 'inflows.view_inflow'
 
 
-class InflowCreateListAPIView(generics.ListCreateAPIView):
+class InflowCreateListAPIView(IdempotentCreateMixin, generics.ListCreateAPIView):
     queryset = models.Inflow.objects.all()
     serializer_class = serializers.InflowSerializer
 
@@ -0,0 +1,43 @@
+import re
+
+
+SALE_REFERENCE_PATTERN = re.compile(r'^Venda (\d+)$')
+
+BATCH_SIZE = 5_000
+
+
+def parse_sale_reference(reference):
+    match = SALE_REFERENCE_PATTERN.match(reference or '')
+    return int(match.group(1)) if match else None
+
+
+def backfill_outflow_sales(outflow_model, sale_model, batch_size=BATCH_SIZE, stdout=None):
+    # Walks the unlinked outflows by primary key, one batch at a time, and links
+    # each one whose "Venda <id>" reference points to a sale of the same company.
+    # Takes the models as arguments so data migrations can pass historical ones.
+    pending = outflow_model.objects.filter(sale__isnull=True, sale_reference__startswith='Venda ').order_by('pk')
+    last_pk = 0
+    linked = 0
+    while True:
+        batch = list(pending.filter(pk__gt=last_pk).only('pk', 'company_id', 'sale_reference')[:batch_size])
+        if not batch:
+            break
+        last_pk = batch[-1].pk
+
+        references = {outflow.pk: parse_sale_reference(outflow.sale_reference) for outflow in batch}
+        sales = dict(
+            sale_model.objects.filter(pk__in={pk for pk in references.values() if pk}).values_list('pk', 'company_id')
+        )
+
+        updates = list()
+        for outflow in batch:
+            sale_id = references[outflow.pk]
+            if sale_id and sales.get(sale_id) == outflow.company_id:
+                outflow.sale_id = sale_id
+                updates.append(outflow)
+        outflow_model.objects.bulk_update(updates, ['sale'])
+        linked += len(updates)
+
+        if stdout:
+            stdout.write(f'{linked} saídas vinculadas (até o id {last_pk}).')
+    return linked
@@ -2,6 +2,7 @@ from django import forms
 from django.core.exceptions import ValidationError
 from . import models
 from products.models import Product
+from app.autocomplete import AutocompleteSelect
 
 
 class OutflowForm(forms.ModelForm):
@@ -9,7 +10,7 @@ class OutflowForm(forms.ModelForm):
         model = models.Outflow
         fields = ['product', 'quantity', 'description']
         widgets = {
-            'product': forms.Select(attrs={'class': 'form-control'}),
+            'product': AutocompleteSelect('product_autocomplete', attrs={'class': 'form-control'}),
             'client': forms.Select(attrs={'class': 'form-control'}),
             'quantity': forms.NumberInput(attrs={'class': 'form-control'}),
             'description': forms.Textarea(attrs={'class': 'form-control', 'rows': 3}),
@@ -21,6 +22,7 @@ class OutflowForm(forms.ModelForm):
         }
 
     def clean_quantity(self):
+        # Early feedback only: the stock is reserved when the outflow is saved.
         quantity = self.cleaned_data.get('quantity')
         product = self.cleaned_data.get('product')
 
@@ -34,6 +36,7 @@ class OutflowForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         user = kwargs.pop('user', None)
         super().__init__(*args, **kwargs)
+        self.instance.enforce_stock = True
         if user and hasattr(user, 'profile') and user.profile.company:
             company = user.profile.company
             self.fields['product'].queryset = Product.objects.filter(company=company)
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand, CommandError
+from outflows.backfill import BATCH_SIZE, backfill_outflow_sales
+from outflows.models import Outflow
+from sales.models import Sale
+
+
+class Command(BaseCommand):
+    help = 'Vincula as saídas antigas à venda de origem a partir do campo sale_reference ("Venda <id>").'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help=f'Saídas por lote. Padrão: {BATCH_SIZE}.')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('O tamanho do lote deve ser maior que zero.')
+
+        linked = backfill_outflow_sales(Outflow, Sale, batch_size=options['batch_size'], stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS(f'{linked} saídas vinculadas às vendas.'))
@@ -0,0 +1,60 @@
+# Generated by Django 5.1.6 on 2026-10-18 11:45
+
+import re
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+# Frozen copy of outflows.backfill at the time of this migration.
+SALE_REFERENCE_PATTERN = re.compile(r'^Venda (\d+)$')
+
+
+def link_outflows_to_sales(apps, schema_editor):
+    Outflow = apps.get_model('outflows', 'Outflow')
+    Sale = apps.get_model('sales', 'Sale')
+    pending = Outflow.objects.filter(sale__isnull=True, sale_reference__startswith='Venda ').order_by('pk')
+    last_pk = 0
+    while True:
+        batch = list(pending.filter(pk__gt=last_pk).only('pk', 'company_id', 'sale_reference')[:5_000])
+        if not batch:
+            break
+        last_pk = batch[-1].pk
+
+        references = dict()
+        for outflow in batch:
+            match = SALE_REFERENCE_PATTERN.match(outflow.sale_reference or '')
+            references[outflow.pk] = int(match.group(1)) if match else None
+        sales = dict(Sale.objects.filter(pk__in={pk for pk in references.values() if pk}).values_list('pk', 'company_id'))
+
+        updates = list()
+        for outflow in batch:
+            sale_id = references[outflow.pk]
+            if sale_id and sales.get(sale_id) == outflow.company_id:
+                outflow.sale_id = sale_id
+                updates.append(outflow)
+        Outflow.objects.bulk_update(updates, ['sale'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0006_company_ie'),
+        ('outflows', '0001_initial'),
+        ('products', '0004_inventorysnapshot'),
+        ('sales', '0002_dailysalessummary'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outflow',
+            name='sale',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='outflows', to='sales.sale', verbose_name='Venda'),
+        ),
+        migrations.AddIndex(
+            model_name='outflow',
+            index=models.Index(fields=['company', 'sale'], name='outflow_company_sale_idx'),
+        ),
+        migrations.RunPython(link_outflows_to_sales, migrations.RunPython.noop),
+    ]
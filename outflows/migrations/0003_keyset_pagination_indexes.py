@@ -0,0 +1,22 @@
+# Generated by Django 5.1.6 on 2026-10-18 11:53
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0007_idempotencykey'),
+        ('outflows', '0002_outflow_sale'),
+        ('products', '0004_inventorysnapshot'),
+        ('sales', '0002_dailysalessummary'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='outflow',
+            index=models.Index(fields=['company', '-created_at', '-id'], name='outflow_company_created_id_idx'),
+        ),
+    ]
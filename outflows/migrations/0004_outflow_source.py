@@ -0,0 +1,30 @@
+# Generated by Django 5.1.6 on 2026-10-18 12:49
+
+from django.db import migrations, models
+from django.db.models import Q
+
+
+def mark_sale_outflows(apps, schema_editor):
+    # Outflows of deleted sales lost their `sale` but keep the "Venda <id>" reference.
+    Outflow = apps.get_model('outflows', 'Outflow')
+    Outflow.objects.filter(Q(sale__isnull=False) | Q(sale_reference__startswith='Venda ')).update(source='sale')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('outflows', '0003_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outflow',
+            name='source',
+            field=models.CharField(choices=[('manual', 'Manual'), ('sale', 'Venda')], default='manual', max_length=10, verbose_name='Origem'),
+        ),
+        migrations.AddIndex(
+            model_name='outflow',
+            index=models.Index(fields=['company', 'source'], name='outflow_company_source_idx'),
+        ),
+        migrations.RunPython(mark_sale_outflows, migrations.RunPython.noop),
+    ]
@@ -4,18 +4,36 @@ from products.models import Product
 from django.contrib.auth.models import User
 
 
+OUTFLOW_SOURCE_CHOICES = (
+    ('manual', 'Manual'),
+    ('sale', 'Venda'),
+)
+
+
 class Outflow(models.Model):
     company = models.ForeignKey(Company, on_delete=models.CASCADE)
     product = models.ForeignKey(Product, on_delete=models.PROTECT, related_name='outflows', verbose_name="Produto")
     quantity = models.PositiveIntegerField("Quantidade")
+    sale = models.ForeignKey('sales.Sale', on_delete=models.SET_NULL, related_name='outflows', blank=True, null=True, verbose_name="Venda")
+    # Kept apart from `sale`, which is cleared when the sale is deleted.
+    source = models.CharField("Origem", max_length=10, choices=OUTFLOW_SOURCE_CHOICES, default='manual')
     sale_reference = models.CharField("Referência da Venda", max_length=100, blank=True, null=True)
     description = models.TextField("Descrição", blank=True, null=True)
     created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
     created_at = models.DateTimeField("Criado Em", auto_now_add=True)
     updated_at = models.DateTimeField("Atualizado Em", auto_now=True)
 
+    # Set by manual outflows (form and API): saving raises InsufficientStock
+    # instead of taking the product below zero.
+    enforce_stock = False
+
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['company', 'sale'], name='outflow_company_sale_idx'),
+            models.Index(fields=['company', 'source'], name='outflow_company_source_idx'),
+            models.Index(fields=['company', '-created_at', '-id'], name='outflow_company_created_id_idx'),
+        ]
 
     def __str__(self):
         return self.product.title
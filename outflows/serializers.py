@@ -1,4 +1,6 @@
+from django.db import transaction
 from rest_framework import serializers
+from products.stock import InsufficientStock
 from .models import Outflow
 
 
@@ -7,3 +9,14 @@ class OutflowSerializer(serializers.ModelSerializer):
     class Meta:
         model = Outflow
         fields = '__all__'
+        read_only_fields = ('sale', 'source')
+
+    def create(self, validated_data):
+        outflow = Outflow(**validated_data)
+        outflow.enforce_stock = True
+        try:
+            with transaction.atomic():
+                outflow.save()
+        except InsufficientStock as error:
+            raise serializers.ValidationError({'quantity': error.messages})
+        return outflow
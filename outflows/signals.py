@@ -1,5 +1,6 @@
 from django.db.models.signals import post_save
 from django.dispatch import receiver
+from products.stock import reserve_stock
 from .models import Outflow
 
 
@@ -7,6 +8,8 @@ from .models import Outflow
 def update_product_quantity(sender, instance, created, **kwargs):
     if created:
         if instance.quantity > 0:
-            product = instance.product
-            product.quantity -= instance.quantity
-            product.save()
+            reserve_stock(
+                instance.company_id,
+                {instance.product_id: instance.quantity},
+                allow_shortfall=not instance.enforce_stock,
+            )
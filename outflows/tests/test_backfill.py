@@ -0,0 +1,39 @@
+import pytest
+from io import StringIO
+from django.core.management import call_command
+from model_bakery import baker
+from outflows.backfill import parse_sale_reference
+from outflows.models import Outflow
+from products.models import Product
+from sales.models import Sale
+
+
+@pytest.mark.django_db
+class TestOutflowSaleBackfill:
+    def test_parse_sale_reference(self):
+        assert parse_sale_reference('Venda 42') == 42
+        assert parse_sale_reference('Venda abc') is None
+        assert parse_sale_reference(None) is None
+
+    def test_command_links_outflows_in_batches(self, company):
+        product = baker.make(Product, company=company, quantity=100)
+        sales = baker.make(Sale, company=company, _quantity=3)
+        outflows = [
+            baker.make(Outflow, company=company, product=product, quantity=1, sale_reference=f'Venda {sale.pk}')
+            for sale in sales
+        ]
+        manual = baker.make(Outflow, company=company, product=product, quantity=1, sale_reference='Ajuste')
+        foreign_sale = baker.make(Sale)
+        foreign = baker.make(Outflow, company=company, product=product, quantity=1, sale_reference=f'Venda {foreign_sale.pk}')
+
+        out = StringIO()
+        call_command('backfill_outflow_sales', batch_size=2, stdout=out)
+
+        for outflow, sale in zip(outflows, sales):
+            outflow.refresh_from_db()
+            assert outflow.sale_id == sale.pk
+        manual.refresh_from_db()
+        foreign.refresh_from_db()
+        assert manual.sale_id is None
+        assert foreign.sale_id is None
+        assert '3 saídas vinculadas às vendas.' in out.getvalue()
@@ -12,3 +12,18 @@ class TestOutflowViews:
         url = reverse('outflow_list')
         response = auth_client.get(url)
         assert response.status_code == 200
+
+    def test_outflow_create_rejects_quantity_above_stock(self, auth_client, company):
+        product = baker.make(Product, company=company, title='Mouse', quantity=2)
+        response = auth_client.post(reverse('outflow_create'), {'product': product.id, 'quantity': 3})
+        assert response.status_code == 200
+        assert not Outflow.objects.filter(product=product).exists()
+        product.refresh_from_db()
+        assert product.quantity == 2
+
+    def test_outflow_create_reserves_stock(self, auth_client, company):
+        product = baker.make(Product, company=company, quantity=5)
+        response = auth_client.post(reverse('outflow_create'), {'product': product.id, 'quantity': 2})
+        assert response.status_code == 302
+        product.refresh_from_db()
+        assert product.quantity == 3
@@ -1,21 +1,26 @@
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
+from django.db import transaction
 from django.urls import reverse_lazy
 from django.views.generic import ListView, CreateView, DetailView
 from rest_framework import generics
 from app import metrics
-from companies.mixins import CompanyObjectMixin
+from app.pagination import KeysetPagination, KeysetPaginationMixin
+from companies.mixins import CompanyObjectMixin, IdempotentCreateMixin
+from products.stock import InsufficientStock
 from . import models, forms, serializers
 
 
-class OutflowListView(LoginRequiredMixin, PermissionRequiredMixin, CompanyObjectMixin, ListView):
+class OutflowListView(LoginRequiredMixin, PermissionRequiredMixin, CompanyObjectMixin, KeysetPaginationMixin, ListView):
     model = models.Outflow
     template_name = 'outflow_list.html'
     context_object_name = 'outflows'
     paginate_by = 8
+    keyset_field = 'created_at'
     permission_required = 'outflows.view_outflow'
+    query_budget = 12
 
     def get_queryset(self):
-        queryset = super().get_queryset().filter(company=self.request.user.profile.company)
+        queryset = super().get_queryset().filter(company=self.request.user.profile.company).select_related('product')
         product = self.request.GET.get('product')
 
         if product:
@@ -44,8 +49,12 @@ class OutflowCreateView(LoginRequiredMixin, PermissionRequiredMixin, CompanyObje
 
     def form_valid(self, form):
         form.instance.company = self.request.user.profile.company
-    
-        return super().form_valid(form)
+        try:
+            with transaction.atomic():
+                return super().form_valid(form)
+        except InsufficientStock as error:
+            form.add_error('quantity', error.messages)
+            return self.form_invalid(form)
 
 
 class OutflowDetailView(LoginRequiredMixin, PermissionRequiredMixin, CompanyObjectMixin, DetailView):
@@ -54,9 +63,11 @@ class OutflowDetailView(LoginRequiredMixin, PermissionRequiredMixin, CompanyObje
     permission_required = 'outflows.view_outflow'
 
 
-class OutflowCreateListAPIView(generics.ListCreateAPIView):
+class OutflowCreateListAPIView(IdempotentCreateMixin, generics.ListCreateAPIView):
     queryset = models.Outflow.objects.all()
     serializer_class = serializers.OutflowSerializer
+    pagination_class = KeysetPagination
+    keyset_field = 'created_at'
 
     def get_queryset(self):
         return super().get_queryset().filter(company=self.request.user.profile.company)
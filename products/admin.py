@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Product
+from .models import InventorySnapshot, Product
 
 
 class ProductAdmin(admin.ModelAdmin):
@@ -8,3 +8,12 @@ class ProductAdmin(admin.ModelAdmin):
 
 
 admin.site.register(Product, ProductAdmin)
+
+
+class InventorySnapshotAdmin(admin.ModelAdmin):
+    list_display = ('date', 'company', 'product_count', 'total_quantity', 'total_cost_price', 'total_selling_price')
+    list_filter = ('company',)
+    date_hierarchy = 'date'
+
+
+admin.site.register(InventorySnapshot, InventorySnapshotAdmin)
@@ -0,0 +1,67 @@
+import gzip
+import json
+import brotli
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from companies.models import Company
+from .models import DeletedProduct, Product
+
+
+CATALOG_FIELDS = ('id', 'title', 'serie_number', 'selling_price', 'quantity')
+
+CATALOG_CACHE_TIMEOUT = 60 * 60
+
+
+def _dumps(payload):
+    return json.dumps(payload, cls=DjangoJSONEncoder, separators=(',', ':')).encode()
+
+
+def _rows(queryset):
+    # Lists instead of objects keep a 30k product catalog small before compression.
+    return [list(row) for row in queryset.order_by('pk').values_list(*CATALOG_FIELDS)]
+
+
+def get_catalog_version(company_id):
+    return Company.objects.filter(pk=company_id).values_list('catalog_version', flat=True).get()
+
+
+def negotiate_encoding(accept_encoding):
+    accepted = {part.split(';')[0].strip() for part in (accept_encoding or '').split(',')}
+    if 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted:
+        return 'gzip'
+    return None
+
+
+def compress(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=9)
+    if encoding == 'gzip':
+        return gzip.compress(body, compresslevel=6)
+    return body
+
+
+def catalog_snapshot(company_id, version, encoding):
+    # The compressed body is built once per version and encoding. The version
+    # is read before the rows, so a snapshot is never labelled newer than them.
+    key = f'catalog:{company_id}:{version}:{encoding or "identity"}'
+    body = cache.get(key)
+    if body is None:
+        payload = dict(version=version, fields=CATALOG_FIELDS, products=_rows(Product.objects.filter(company_id=company_id)))
+        body = compress(_dumps(payload), encoding)
+        cache.set(key, body, CATALOG_CACHE_TIMEOUT)
+    return body
+
+
+def catalog_changes(company_id, since, version, encoding):
+    changed = Product.objects.filter(company_id=company_id, catalog_version__gt=since)
+    deleted = DeletedProduct.objects.filter(company_id=company_id, catalog_version__gt=since)
+    payload = dict(
+        version=version,
+        since=since,
+        fields=CATALOG_FIELDS,
+        products=_rows(changed),
+        deleted=sorted(deleted.values_list('product_id', flat=True)),
+    )
+    return compress(_dumps(payload), encoding)
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+from companies.models import Company
+from products.models import InventorySnapshot
+
+
+class Command(BaseCommand):
+    help = 'Registra o snapshot de hoje do valor de estoque de cada empresa (executar uma vez por noite).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--company', type=int, help='ID da empresa. Padrão: todas as empresas ativas.')
+
+    def handle(self, *args, **options):
+        company = None
+        if options['company']:
+            try:
+                company = Company.objects.get(pk=options['company'])
+            except Company.DoesNotExist:
+                raise CommandError(f"Empresa {options['company']} não encontrada.")
+
+        snapshots = InventorySnapshot.capture(company=company)
+        self.stdout.write(self.style.SUCCESS(f'{len(snapshots)} snapshots de estoque registrados.'))
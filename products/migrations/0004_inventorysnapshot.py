@@ -0,0 +1,35 @@
+# Generated by Django 5.1.6 on 2026-10-18 11:29
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0006_company_ie'),
+        ('products', '0003_alter_product_photo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InventorySnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Data')),
+                ('product_count', models.PositiveIntegerField(default=0, verbose_name='Produtos em estoque')),
+                ('total_quantity', models.IntegerField(default=0, verbose_name='Quantidade total')),
+                ('total_cost_price', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14, verbose_name='Valor de custo')),
+                ('total_selling_price', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14, verbose_name='Valor de venda')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='inventory_snapshots', to='companies.company')),
+            ],
+            options={
+                'verbose_name': 'Snapshot de Estoque',
+                'verbose_name_plural': 'Snapshots de Estoque',
+                'ordering': ['-date'],
+                'constraints': [models.UniqueConstraint(fields=('company', 'date'), name='unique_inventory_snapshot')],
+            },
+        ),
+    ]
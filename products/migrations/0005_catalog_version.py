@@ -0,0 +1,44 @@
+# Generated by Django 5.1.6 on 2026-10-18 12:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('brands', '0001_initial'),
+        ('categories', '0001_initial'),
+        ('companies', '0008_company_catalog_version'),
+        ('products', '0004_inventorysnapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeletedProduct',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('product_id', models.BigIntegerField()),
+                ('catalog_version', models.PositiveBigIntegerField()),
+                ('deleted_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='catalog_version',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['company', 'catalog_version'], name='product_company_catalog_idx'),
+        ),
+        migrations.AddField(
+            model_name='deletedproduct',
+            name='company',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='deleted_products', to='companies.company'),
+        ),
+        migrations.AddIndex(
+            model_name='deletedproduct',
+            index=models.Index(fields=['company', 'catalog_version'], name='deletedproduct_catalog_idx'),
+        ),
+    ]
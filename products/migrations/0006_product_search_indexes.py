@@ -0,0 +1,34 @@
+from django.db import migrations
+
+
+class PostgreSQLRunSQL(migrations.RunSQL):
+    # Prefix search (istartswith) runs UPPER(column::text) LIKE 'TERM%'. Only
+    # pattern_ops indexes serve LIKE under non-C collations, and they are
+    # PostgreSQL specific; SQLite keeps scanning the company's rows.
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0005_catalog_version'),
+    ]
+
+    operations = [
+        PostgreSQLRunSQL(
+            'CREATE INDEX IF NOT EXISTS product_title_search_idx ON products_product '
+            '(company_id, UPPER(title::text) text_pattern_ops)',
+            'DROP INDEX IF EXISTS product_title_search_idx',
+        ),
+        PostgreSQLRunSQL(
+            'CREATE INDEX IF NOT EXISTS product_serie_search_idx ON products_product '
+            '(company_id, UPPER(serie_number::text) text_pattern_ops)',
+            'DROP INDEX IF EXISTS product_serie_search_idx',
+        ),
+    ]
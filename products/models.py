@@ -1,9 +1,42 @@
-from django.db import models
+from decimal import Decimal
+from django.db import models, transaction
+from django.db.models import Count, F, Sum
+from django.utils import timezone
 from brands.models import Brand
 from categories.models import Category
 from companies.models import Company
 
 
+class ProductQuerySet(models.QuerySet):
+    def inventory_totals(self):
+        totals = self.filter(quantity__gt=0).aggregate(
+            total_quantity=Sum('quantity'),
+            total_cost_price=Sum(F('cost_price') * F('quantity'), output_field=models.DecimalField()),
+            total_selling_price=Sum(F('selling_price') * F('quantity'), output_field=models.DecimalField()),
+        )
+        return dict(
+            total_quantity=totals['total_quantity'] or 0,
+            total_cost_price=totals['total_cost_price'] or Decimal('0.00'),
+            total_selling_price=totals['total_selling_price'] or Decimal('0.00'),
+        )
+
+    def decrement_stock(self, quantities, catalog_version, available_only=False):
+        # quantities maps product id -> units. The subtraction happens in the
+        # UPDATE itself, so concurrent checkouts cannot overwrite each other.
+        # Rows are updated in id order, so overlapping checkouts lock them in
+        # the same order. With available_only a row is only decremented while
+        # it has the units; the ids left untouched are returned.
+        now = timezone.now()
+        skipped = list()
+        for product_id in sorted(quantities):
+            rows = self.filter(pk=product_id)
+            if available_only:
+                rows = rows.filter(quantity__gte=quantities[product_id])
+            if not rows.update(quantity=F('quantity') - quantities[product_id], updated_at=now, catalog_version=catalog_version):
+                skipped.append(product_id)
+        return skipped
+
+
 class Product(models.Model):
     company = models.ForeignKey(Company, on_delete=models.CASCADE)
     title = models.CharField(max_length=300)
@@ -17,9 +50,15 @@ class Product(models.Model):
     photo = models.ImageField(upload_to='products_photos/', blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    catalog_version = models.PositiveBigIntegerField(default=0)
+
+    objects = ProductQuerySet.as_manager()
 
     class Meta:
         ordering = ['title']
+        indexes = [
+            models.Index(fields=['company', 'catalog_version'], name='product_company_catalog_idx'),
+        ]
 
     @property
     def margin(self):
@@ -29,3 +68,86 @@ class Product(models.Model):
 
     def __str__(self):
         return self.title
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            self.catalog_version = Company.next_catalog_version(self.company_id)
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'catalog_version'}
+            super().save(*args, **kwargs)
+
+
+class DeletedProduct(models.Model):
+    # Tombstones for the catalog delta sync.
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='deleted_products')
+    product_id = models.BigIntegerField()
+    catalog_version = models.PositiveBigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['company', 'catalog_version'], name='deletedproduct_catalog_idx'),
+        ]
+
+    def __str__(self):
+        return f"Produto {self.product_id} ({self.company_id})"
+
+
+class InventorySnapshot(models.Model):
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='inventory_snapshots')
+    date = models.DateField("Data")
+    product_count = models.PositiveIntegerField("Produtos em estoque", default=0)
+    total_quantity = models.IntegerField("Quantidade total", default=0)
+    total_cost_price = models.DecimalField("Valor de custo", max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    total_selling_price = models.DecimalField("Valor de venda", max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Snapshot de Estoque"
+        verbose_name_plural = "Snapshots de Estoque"
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(fields=['company', 'date'], name='unique_inventory_snapshot'),
+        ]
+
+    def __str__(self):
+        return f"{self.company} - {self.date:%d/%m/%Y}"
+
+    @classmethod
+    def capture(cls, company=None):
+        # Only today: the current stock says nothing about past dates.
+        date = timezone.localdate()
+        companies = Company.objects.filter(is_active=True)
+        products = Product.objects.filter(quantity__gt=0)
+        if company is not None:
+            companies = companies.filter(pk=company.pk)
+            products = products.filter(company=company)
+
+        totals = {
+            row['company']: row
+            for row in products.values('company').annotate(
+                product_count=Count('id'),
+                total_quantity=Sum('quantity'),
+                total_cost_price=Sum(F('cost_price') * F('quantity'), output_field=models.DecimalField()),
+                total_selling_price=Sum(F('selling_price') * F('quantity'), output_field=models.DecimalField()),
+            ).order_by()
+        }
+
+        snapshots = list()
+        for company_id in companies.values_list('pk', flat=True):
+            row = totals.get(company_id, {})
+            snapshots.append(cls(
+                company_id=company_id,
+                date=date,
+                product_count=row.get('product_count') or 0,
+                total_quantity=row.get('total_quantity') or 0,
+                total_cost_price=row.get('total_cost_price') or Decimal('0.00'),
+                total_selling_price=row.get('total_selling_price') or Decimal('0.00'),
+            ))
+
+        return cls.objects.bulk_create(
+            snapshots,
+            update_conflicts=True,
+            unique_fields=['company', 'date'],
+            update_fields=['product_count', 'total_quantity', 'total_cost_price', 'total_selling_price'],
+        )
@@ -0,0 +1,59 @@
+import time
+from functools import partial
+from django.core.cache import cache
+from django.db import transaction
+from .models import Product
+
+
+# company id -> (version, {product id: entry}). Entries are kept per process and
+# dropped as a whole when the company's price version in the shared cache moves.
+_local_prices = dict()
+
+
+def _version_key(company_id):
+    return f'prices:version:{company_id}'
+
+
+def get_price_version(company_id):
+    key = _version_key(company_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, int(time.time() * 1000), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_price_version(company_id):
+    key = _version_key(company_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, int(time.time() * 1000), None)
+
+
+def invalidate_prices(company_id):
+    # After commit, so no process can cache the old row under the new version.
+    transaction.on_commit(partial(bump_price_version, company_id))
+
+
+def get_product_prices(company, product_ids):
+    # product id -> {'price', 'cost', 'stock'} for the given ids of the company;
+    # unknown ids are left out. At most one query, for the ids not seen yet.
+    company_id = getattr(company, 'pk', company)
+    version = get_price_version(company_id)
+    cached_version, entries = _local_prices.get(company_id, (None, None))
+    if cached_version != version:
+        entries = dict()
+        _local_prices[company_id] = (version, entries)
+
+    missing = [pk for pk in product_ids if pk not in entries]
+    if missing:
+        rows = Product.objects.filter(company_id=company_id, pk__in=missing).values_list(
+            'pk', 'selling_price', 'cost_price', 'quantity',
+        )
+        # Ids of other companies or deleted products are remembered as None.
+        entries.update(dict.fromkeys(missing))
+        for pk, selling_price, cost_price, quantity in rows:
+            entries[pk] = {'price': str(selling_price), 'cost': str(cost_price), 'stock': quantity}
+
+    return {pk: entries[pk] for pk in product_ids if entries[pk] is not None}
@@ -0,0 +1,22 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from companies.models import Company
+from .models import DeletedProduct, Product
+from .prices import invalidate_prices
+
+
+@receiver([post_save, post_delete], sender=Product)
+def invalidate_product_prices(sender, instance, **kwargs):
+    invalidate_prices(instance.company_id)
+
+
+@receiver(post_delete, sender=Product)
+def record_deleted_product(sender, instance, origin=None, **kwargs):
+    # A company delete cascades to its products; there is no catalog left to sync.
+    if isinstance(origin, Company) or getattr(origin, 'model', None) is Company:
+        return
+    DeletedProduct.objects.create(
+        company_id=instance.company_id,
+        product_id=instance.pk,
+        catalog_version=Company.next_catalog_version(instance.company_id),
+    )
@@ -0,0 +1,48 @@
+from collections import namedtuple
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from companies.models import Company
+from .models import Product
+from .prices import invalidate_prices
+
+
+Shortfall = namedtuple('Shortfall', 'product_id title requested available')
+
+
+class InsufficientStock(ValidationError):
+    def __init__(self, shortfalls):
+        self.shortfalls = shortfalls
+        super().__init__([
+            f'Estoque insuficiente para {shortfall.title}: solicitado {shortfall.requested}, '
+            f'disponível {shortfall.available}.'
+            for shortfall in shortfalls
+        ])
+
+
+def reserve_stock(company_id, quantities, allow_shortfall=False):
+    # Takes quantities (product id -> units) out of the company's stock. Each
+    # row is decremented by a conditional UPDATE ... WHERE quantity >= units,
+    # so two checkouts can never both take the last units. Raises
+    # InsufficientStock listing every short item and rolls back the others;
+    # with allow_shortfall (sales that already happened, e.g. offline POS
+    # sync) short items are decremented anyway and the shortfalls returned.
+    quantities = {product_id: units for product_id, units in quantities.items() if units > 0}
+    if not quantities:
+        return list()
+
+    products = Product.objects.filter(company_id=company_id)
+    # No savepoint: a shortfall has to abort the caller's transaction anyway.
+    with transaction.atomic(savepoint=False):
+        catalog_version = Company.next_catalog_version(company_id)
+        skipped = products.decrement_stock(quantities, catalog_version, available_only=True)
+        shortfalls = list()
+        if skipped:
+            found = {pk: (title, available) for pk, title, available in products.filter(pk__in=skipped).values_list('pk', 'title', 'quantity')}
+            for product_id in skipped:
+                title, available = found.get(product_id, (f'o produto {product_id}', 0))
+                shortfalls.append(Shortfall(product_id, title, quantities[product_id], available))
+            if not allow_shortfall:
+                raise InsufficientStock(shortfalls)
+            products.decrement_stock({shortfall.product_id: shortfall.requested for shortfall in shortfalls}, catalog_version)
+        invalidate_prices(company_id)
+    return shortfalls
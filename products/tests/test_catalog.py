@@ -0,0 +1,98 @@
+import gzip
+import json
+import brotli
+import pytest
+from django.urls import reverse
+from model_bakery import baker
+from rest_framework.test import APIClient
+from products.models import DeletedProduct, Product
+
+
+@pytest.fixture
+def api_client(admin_user):
+    client = APIClient()
+    client.force_authenticate(user=admin_user)
+    return client
+
+
+@pytest.mark.django_db
+class TestProductCatalog:
+    def test_snapshot_is_compressed_and_versioned(self, api_client, company):
+        products = baker.make(Product, company=company, selling_price=10, quantity=5, _quantity=3)
+        baker.make(Product)
+        url = reverse('product-catalog-api-view')
+
+        response = api_client.get(url, HTTP_ACCEPT_ENCODING='gzip, br')
+        assert response['Content-Encoding'] == 'br'
+        payload = json.loads(brotli.decompress(response.content))
+        assert payload['version'] == 3
+        assert payload['fields'] == ['id', 'title', 'serie_number', 'selling_price', 'quantity']
+        assert [row[0] for row in payload['products']] == sorted(product.pk for product in products)
+
+        gzipped = api_client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        assert json.loads(gzip.decompress(gzipped.content)) == payload
+
+        not_modified = api_client.get(url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=gzipped['ETag'])
+        assert not_modified.status_code == 304
+
+    def test_changes_since_version(self, api_client, company):
+        kept, changed, removed = baker.make(Product, company=company, _quantity=3)
+        version = company.__class__.objects.get(pk=company.pk).catalog_version
+
+        changed.quantity = 42
+        changed.save()
+        removed_id = removed.pk
+        removed.delete()
+
+        response = api_client.get(reverse('product-catalog-changes-api-view'), {'since': version})
+        payload = json.loads(response.content)
+
+        assert payload['version'] == version + 2
+        assert [row[0] for row in payload['products']] == [changed.pk]
+        assert payload['products'][0][4] == 42
+        assert payload['deleted'] == [removed_id]
+        assert DeletedProduct.objects.filter(product_id=removed_id, company=company).exists()
+
+        up_to_date = json.loads(api_client.get(reverse('product-catalog-changes-api-view'), {'since': payload['version']}).content)
+        assert up_to_date['products'] == up_to_date['deleted'] == []
+        assert api_client.get(reverse('product-catalog-changes-api-view'), {'since': payload['version'] + 1}).status_code == 400
+
+    def test_sale_finalize_moves_catalog_version(self, company):
+        from companies.models import Company
+        from sales.models import Sale
+        product = baker.make(Product, company=company, quantity=10, selling_price=5, cost_price=2)
+        before = Company.objects.get(pk=company.pk).catalog_version
+        sale = baker.make(Sale, company=company, order_status='draft')
+        sale.checkout([{'product': product, 'quantity': 2, 'unit_price': 5}])
+        sale.order_status = 'finalized'
+        sale.finalize()
+
+        product.refresh_from_db()
+        assert product.quantity == 8
+        assert product.catalog_version > before
+
+    def test_company_save_keeps_catalog_version(self, company):
+        from companies.models import Company
+        stale = Company.objects.get(pk=company.pk)
+        version = Company.next_catalog_version(company.pk)
+        stale.name = 'Renomeada'
+        stale.save()
+
+        company.refresh_from_db()
+        assert company.name == 'Renomeada'
+        assert company.catalog_version == version
+
+    def test_product_delete_records_tombstone(self, company):
+        product = baker.make(Product, company=company)
+        product_id = product.pk
+        product.delete()
+        assert DeletedProduct.objects.filter(company=company, product_id=product_id).exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_company_with_products_can_be_deleted(company):
+    from companies.models import Company
+    baker.make(Product, company=company, _quantity=2)
+    company.delete()
+    assert not Company.objects.filter(pk=company.pk).exists()
+    assert not DeletedProduct.objects.exists()
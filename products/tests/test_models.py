@@ -1,6 +1,10 @@
 import pytest
+from decimal import Decimal
+from io import StringIO
+from django.core.management import call_command
+from django.utils import timezone
 from model_bakery import baker
-from products.models import Product
+from products.models import InventorySnapshot, Product
 
 @pytest.mark.django_db
 class TestProductModel:
@@ -27,3 +31,31 @@ class TestProductModel:
     def test_product_str_representation(self):
         product = baker.make(Product, title="Notebook Gamer")
         assert str(product) == "Notebook Gamer"
+
+
+@pytest.mark.django_db
+class TestInventorySnapshot:
+    def test_snapshot_command_records_each_company(self, company):
+        from companies.models import Company
+        empty_company = baker.make(Company)
+        baker.make(Product, company=company, quantity=4, cost_price=Decimal("2.50"), selling_price=Decimal("5.00"))
+        baker.make(Product, company=company, quantity=0, cost_price=Decimal("100.00"), selling_price=Decimal("200.00"))
+
+        call_command('take_inventory_snapshot', stdout=StringIO())
+
+        snapshot = InventorySnapshot.objects.get(company=company, date=timezone.localdate())
+        assert snapshot.product_count == 1
+        assert snapshot.total_quantity == 4
+        assert snapshot.total_cost_price == Decimal("10.00")
+        assert snapshot.total_selling_price == Decimal("20.00")
+        assert InventorySnapshot.objects.get(company=empty_company).total_quantity == 0
+
+    def test_snapshot_is_updated_when_taken_again(self, company):
+        product = baker.make(Product, company=company, quantity=4, cost_price=Decimal("2.50"), selling_price=Decimal("5.00"))
+        InventorySnapshot.capture(company=company)
+        Product.objects.filter(pk=product.pk).update(quantity=1)
+
+        InventorySnapshot.capture(company=company)
+
+        snapshot = InventorySnapshot.objects.get(company=company)
+        assert snapshot.total_quantity == 1
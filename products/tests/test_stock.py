@@ -0,0 +1,92 @@
+import threading
+import pytest
+from django.db import OperationalError, connection, transaction
+from model_bakery import baker
+from companies.models import Company
+from products.models import Product
+from products.stock import InsufficientStock, Shortfall, reserve_stock
+
+
+@pytest.mark.django_db
+class TestReserveStock:
+    def test_decrements_stock_and_stamps_catalog_version(self, company):
+        first, second = baker.make(Product, company=company, quantity=5, _quantity=2)
+
+        assert reserve_stock(company.pk, {first.pk: 2, second.pk: 5}) == []
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        company.refresh_from_db()
+        assert (first.quantity, second.quantity) == (3, 0)
+        assert first.catalog_version == second.catalog_version == company.catalog_version
+
+    def test_reports_every_shortfall_and_rolls_back(self, company):
+        enough = baker.make(Product, company=company, title='Cabo', quantity=10)
+        short = baker.make(Product, company=company, title='Mouse', quantity=1)
+        foreign = baker.make(Product, company=baker.make(Company), quantity=10)
+
+        with pytest.raises(InsufficientStock) as error:
+            with transaction.atomic():
+                reserve_stock(company.pk, {enough.pk: 2, short.pk: 3, foreign.pk: 1})
+
+        assert error.value.shortfalls == [
+            Shortfall(short.pk, 'Mouse', 3, 1),
+            Shortfall(foreign.pk, f'o produto {foreign.pk}', 1, 0),
+        ]
+        assert error.value.messages[0] == 'Estoque insuficiente para Mouse: solicitado 3, disponível 1.'
+        enough.refresh_from_db()
+        assert enough.quantity == 10
+
+    def test_allow_shortfall_decrements_anyway(self, company):
+        product = baker.make(Product, company=company, title='Mouse', quantity=1)
+
+        shortfalls = reserve_stock(company.pk, {product.pk: 3}, allow_shortfall=True)
+
+        assert shortfalls == [Shortfall(product.pk, 'Mouse', 3, 1)]
+        product.refresh_from_db()
+        assert product.quantity == -2
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_reservations_never_oversell(company):
+    first, second = baker.make(Product, company=company, quantity=30, _quantity=2)
+    threads_count, attempts = 8, 10
+    results = {'reserved': 0, 'short': 0}
+    lock = threading.Lock()
+    start = threading.Barrier(threads_count)
+
+    def checkout(quantities):
+        # SQLite allows a single writer: a locked database is retried, an
+        # empty shelf is a result.
+        while True:
+            try:
+                with transaction.atomic():
+                    reserve_stock(company.pk, quantities)
+                return 'reserved'
+            except InsufficientStock:
+                return 'short'
+            except OperationalError:
+                continue
+
+    def worker(index):
+        start.wait()
+        try:
+            for attempt in range(attempts):
+                # Half of the threads name the products in the opposite order.
+                order = (first.pk, second.pk) if index % 2 else (second.pk, first.pk)
+                outcome = checkout(dict.fromkeys(order, 1))
+                with lock:
+                    results[outcome] += 1
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(threads_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    first.refresh_from_db()
+    second.refresh_from_db()
+    assert results == {'reserved': 30, 'short': threads_count * attempts - 30}
+    assert (first.quantity, second.quantity) == (0, 0)
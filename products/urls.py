@@ -8,10 +8,13 @@ urlpatterns = [
     path('products/<int:pk>/detail/', views.ProductDetailView.as_view(), name='product_detail'),
     path('products/<int:pk>/update/', views.ProductUpdateView.as_view(), name='product_update'),
     path('products/<int:pk>/delete/', views.ProductDeleteView.as_view(), name='product_delete'),
+    path('products/autocomplete/', views.ProductAutocompleteView.as_view(), name='product_autocomplete'),
 
     path('api/v1/public/products/<int:company_id>/', views.PublicProductListAPIView.as_view(), name='public-product-list'),
     path('api/v1/public/products/<int:company_id>/<int:pk>/', views.PublicProductDetailAPIView.as_view(), name='public-product-detail'),
 
     path('api/v1/products/', views.ProductCreateListAPIView.as_view(), name='product-create-list-api-view'),
+    path('api/v1/products/catalog/', views.ProductCatalogAPIView.as_view(), name='product-catalog-api-view'),
+    path('api/v1/products/catalog/changes/', views.ProductCatalogChangesAPIView.as_view(), name='product-catalog-changes-api-view'),
     path('api/v1/products/<int:pk>/', views.ProductRetrieveUpdateDestroyAPIView.as_view(), name='product-detail-api-view'),
 ]
@@ -1,15 +1,21 @@
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
 from django.db.models import Q
+from django.http import HttpResponse
 from django.urls import reverse_lazy
+from django.utils.cache import get_conditional_response
 from django.views.generic import ListView, CreateView, DetailView, UpdateView, DeleteView
-from rest_framework import generics
-from rest_framework.permissions import AllowAny
+from rest_framework import generics, status
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
 from app import metrics
-from companies.mixins import CompanyObjectMixin
+from app.autocomplete import AutocompleteView
+from companies.mixins import CompanyObjectMixin, IdempotentCreateMixin
 from . import models, forms, serializers
+from .catalog import catalog_changes, catalog_snapshot, get_catalog_version, negotiate_encoding
 from .serializers import ProductSerializer
 
 
@@ -20,9 +26,12 @@ class ProductListView(LoginRequiredMixin, PermissionRequiredMixin, CompanyObject
     context_object_name = 'products'
     paginate_by = 8
     permission_required = 'products.view_product'
+    query_budget = 10
 
     def get_queryset(self):
-        queryset = super().get_queryset().filter(company=self.request.user.profile.company)
+        queryset = super().get_queryset().filter(
+            company=self.request.user.profile.company,
+        ).select_related('brand', 'category')
         search_term = self.request.GET.get('product')
         if search_term:
             queryset = queryset.filter(
@@ -149,7 +158,7 @@ class PublicProductDetailAPIView(APIView):
         return Response(serializer.data)
 
 
-class ProductCreateListAPIView(generics.ListCreateAPIView):
+class ProductCreateListAPIView(IdempotentCreateMixin, generics.ListCreateAPIView):
     queryset = models.Product.objects.all()
     serializer_class = serializers.ProductSerializer
 
@@ -166,3 +175,66 @@ class ProductRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView)
 
     def get_queryset(self):
         return models.Product.objects.filter(company=self.request.user.profile.company)
+
+
+class CatalogAPIMixin:
+    # Also open to the session, so the sale form can load the catalog.
+    authentication_classes = [JWTAuthentication, SessionAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get_encoding(self, request):
+        return negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING'))
+
+    def catalog_response(self, body, version, encoding):
+        response = HttpResponse(body, content_type='application/json')
+        if encoding:
+            response['Content-Encoding'] = encoding
+        response['Vary'] = 'Accept-Encoding'
+        response['X-Catalog-Version'] = str(version)
+        return response
+
+
+class ProductCatalogAPIView(CatalogAPIMixin, APIView):
+    # Full compressed catalog of the company; clients keep the version and
+    # follow up with ProductCatalogChangesAPIView.
+    query_budget = 5
+
+    def get(self, request):
+        company_id = request.user.profile.company_id
+        encoding = self.get_encoding(request)
+        version = get_catalog_version(company_id)
+        etag = '"{}-{}"'.format(version, encoding or 'identity')
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = self.catalog_response(catalog_snapshot(company_id, version, encoding), version, encoding)
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
+
+class ProductCatalogChangesAPIView(CatalogAPIMixin, APIView):
+    # ?since=N: products changed and ids deleted after version N.
+    query_budget = 6
+
+    def get(self, request):
+        company_id = request.user.profile.company_id
+        version = get_catalog_version(company_id)
+        try:
+            since = int(request.GET.get('since', ''))
+        except ValueError:
+            return Response({'detail': 'Informe a versão do catálogo em "since".'}, status=status.HTTP_400_BAD_REQUEST)
+        if not 0 <= since <= version:
+            return Response(
+                {'detail': f'Versão {since} desconhecida; a versão atual é {version}. Baixe o catálogo completo.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        encoding = self.get_encoding(request)
+        return self.catalog_response(catalog_changes(company_id, since, version, encoding), version, encoding)
+
+
+class ProductAutocompleteView(AutocompleteView):
+    model = models.Product
+    search_fields = ('title', 'serie_number')
+    ordering = ('title', 'pk')
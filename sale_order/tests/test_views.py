@@ -1,5 +1,6 @@
 import pytest
 from django.urls import reverse
+from app.pdf import SaleDocument
 from sales.models import Sale
 from model_bakery import baker
 
@@ -11,15 +12,24 @@ class TestOrderViews:
         response = auth_client.get(url)
         assert response.status_code == 200
 
-    def test_order_pdf_view(self, auth_client, company):
+    def test_order_pdf_view(self, auth_client, company, monkeypatch):
         # Need a client for PDF generation as discovered in sales tests
         from clients.models import Client
         client = baker.make(Client, company=company, telephone='65999999999')
         order = baker.make(Sale, company=company, sale_type='order', client=client)
         url = reverse('order_pdf', kwargs={'pk': order.pk})
+        headings = list()
+        render = SaleDocument.render
+
+        def record_heading(document, sale):
+            headings.append(document.heading)
+            return render(document, sale)
+
+        monkeypatch.setattr(SaleDocument, 'render', record_heading)
         response = auth_client.get(url)
         assert response.status_code == 200
         assert response['Content-Type'] == 'application/pdf'
+        assert headings == [f'PEDIDO DE VENDA #{order.pk}']
 
     def test_order_detail_view(self, auth_client, company):
         order = baker.make(Sale, company=company, sale_type='order')
@@ -1,15 +1,16 @@
 from decimal import Decimal
+from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
-from django.http import HttpResponse, HttpResponseRedirect
+from django.http import HttpResponseRedirect
 from django.urls import reverse_lazy
 from django.views.generic import ListView, CreateView, DetailView, UpdateView
 from companies.mixins import CompanyObjectMixin
-from outflows.models import Outflow
-from django.http import HttpResponse
 from django.core.exceptions import PermissionDenied
-from sales.utils.pdf import generate_invoice_pdf
+from django.db import transaction
+from sales.documents import CachedDocumentMixin
 from sales import forms
 from sales.models import Sale
+from products.stock import InsufficientStock
 
 
 class CompanyObjectMixin:
@@ -21,27 +22,25 @@ class CompanyObjectMixin:
         raise PermissionDenied("Usuário não associado a uma company.")
 
 
-class OrderPDFView(LoginRequiredMixin, PermissionRequiredMixin, CompanyObjectMixin, DetailView):
+class OrderPDFView(LoginRequiredMixin, PermissionRequiredMixin, CompanyObjectMixin, CachedDocumentMixin, DetailView):
     model = Sale
+    queryset = Sale.objects.select_related('company', 'client')
     permission_required = 'sales.view_order'
+    query_budget = 8
+    document_kind = 'order'
 
     def get_queryset(self):
         return super().get_queryset().filter(company=self.request.user.profile.company)
 
-    def get(self, request, *args, **kwargs):
-        order = self.get_object()
-        pdf = generate_invoice_pdf(order)
-        response = HttpResponse(pdf, content_type="application/pdf")
-        response["Context-Disposition"] = f'attachment; filename="pedido_venda_{order.id}.pdf"'
-        return response
-
 
 class OrderListView(LoginRequiredMixin, PermissionRequiredMixin, CompanyObjectMixin, ListView):
     model = Sale
+    queryset = Sale.objects.select_related('client')
     template_name = 'order_list.html'
     context_object_name = 'orders'
     paginate_by = 8
     permission_required = 'sales.view_order'
+    query_budget = 8
 
 
 class OrderCreateView(LoginRequiredMixin, CreateView):
@@ -50,6 +49,7 @@ class OrderCreateView(LoginRequiredMixin, CreateView):
     template_name = 'order_create.html'
     success_url = reverse_lazy('order_list')
     permission_required = 'sales.add_order'
+    query_budget = 40
 
     def get_form_kwargs(self):
         kwargs = super().get_form_kwargs()
@@ -65,6 +65,16 @@ class OrderCreateView(LoginRequiredMixin, CreateView):
         return context
     
     def form_valid(self, form):
+        # Finalizing reserves the stock: a short item rolls the whole order back.
+        try:
+            with transaction.atomic():
+                return self._save_order(form)
+        except InsufficientStock as error:
+            for message in error.messages:
+                messages.error(self.request, message)
+            return self.form_invalid(form)
+
+    def _save_order(self, form):
         form.instance.company = self.request.user.profile.company
         context = self.get_context_data()
         items = context['items']
@@ -91,16 +101,7 @@ class OrderCreateView(LoginRequiredMixin, CreateView):
             self.object.save(update_fields=["total"])
 
             if self.object.order_status == 'finalized':
-                for item in self.object.items.all():
-                    product = item.product
-                    discounted_unit_price = (item.unit_price - (item.unit_price * (self.object.discount / Decimal("100.00")))).quantize(Decimal("0.01"))
-                    Outflow.objects.create(
-                        product=product,
-                        quantity=item.quantity,
-                        company=self.request.user.profile.company,
-                        sale_reference=f"Venda {self.object.id}",
-                        description=f"Venda realizada no PDV (Venda {self.object.id}). Preço unitário com desconto: R$ {discounted_unit_price}"
-                    )
+                self.object.finalize()
             from django.http import HttpResponseRedirect
             return HttpResponseRedirect(self.get_success_url())
         else:
@@ -121,6 +122,7 @@ class OrderUpdateView(LoginRequiredMixin, PermissionRequiredMixin, CompanyObject
     template_name = 'order_update.html'
     success_url = reverse_lazy('order_list')
     permission_required = 'sales.change_order'
+    query_budget = 40
 
     def get_form_kwargs(self):
         kwargs = super().get_form_kwargs()
@@ -142,6 +144,16 @@ class OrderUpdateView(LoginRequiredMixin, PermissionRequiredMixin, CompanyObject
         return context
     
     def form_valid(self, form):
+        # Finalizing reserves the stock: a short item rolls the whole order back.
+        try:
+            with transaction.atomic():
+                return self._save_order(form)
+        except InsufficientStock as error:
+            for message in error.messages:
+                messages.error(self.request, message)
+            return self.form_invalid(form)
+
+    def _save_order(self, form):
         context = self.get_context_data()
         items = context.get('items')
         self.object = form.save(commit=False)
@@ -160,16 +172,7 @@ class OrderUpdateView(LoginRequiredMixin, PermissionRequiredMixin, CompanyObject
             self.object.save(update_fields=["total"])
             
             if self.object.order_status == 'finalized':
-                for item in self.object.items.all():
-                    product = item.product
-                    discounted_unit_price = (item.unit_price - (item.unit_price * (self.object.discount / Decimal("100.00")))).quantize(Decimal("0.01"))
-                    Outflow.objects.create(
-                        product=product,
-                        quantity=item.quantity,
-                        company=self.request.user.profile.company,
-                        sale_reference=f"Venda {self.object.id}",
-                        description=f"Venda realizada no PDV (Venda {self.object.id}). Preço unitário com desconto: R$ {discounted_unit_price}"
-                    )
+                self.object.finalize()
             return HttpResponseRedirect(self.get_success_url())
         else:
             print("Formset errors:", items.errors)
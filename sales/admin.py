@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Sale, SaleItem, Order, Budget
+from .models import Sale, SaleItem, Order, Budget, DailySalesSummary, DocumentJob
 
 
 class SaleItemInline(admin.TabularInline):
@@ -65,7 +65,21 @@ class BudgetAdmin(SaleAdmin):
         return readonly_fields
 
 
+class DailySalesSummaryAdmin(admin.ModelAdmin):
+    list_display = ('date', 'company', 'revenue', 'cost', 'units', 'outflow_count', 'sale_count')
+    list_filter = ('company',)
+    date_hierarchy = 'date'
+
+
+class DocumentJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'kind', 'sale', 'company', 'status', 'attempts', 'created_at', 'finished_at')
+    list_filter = ('status', 'kind', 'company')
+    raw_id_fields = ('sale', 'requested_by')
+
+
 
 admin.site.register(Sale, SaleAdmin)
 admin.site.register(Order, OrderAdmin)
-admin.site.register(Budget, BudgetAdmin)
\ No newline at end of file
+admin.site.register(Budget, BudgetAdmin)
+admin.site.register(DailySalesSummary, DailySalesSummaryAdmin)
+admin.site.register(DocumentJob, DocumentJobAdmin)
\ No newline at end of file
@@ -0,0 +1,142 @@
+import hashlib
+import json
+import logging
+from collections import namedtuple
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from budgets.utils.pdf import generate_budget_pdf
+from sale_order.utils.pdf import generate_order_pdf
+from .models import Budget, DocumentJob, Sale
+from .utils.pdf import generate_invoice_pdf
+
+
+logger = logging.getLogger(__name__)
+
+
+# Bump when the layout of the generated documents changes, so files rendered
+# by the previous layout are no longer served.
+DOCUMENT_VERSION = 3
+
+COMPANY_FIELDS = ('name', 'cnpj', 'ie', 'address', 'email', 'phone')
+
+CLIENT_FIELDS = ('name', 'cpf', 'rg', 'email', 'date_of_birth', 'address', 'telephone')
+
+SALE_FIELDS = (
+    'id', 'sale_date', 'total', 'discount', 'sale_type', 'order_status', 'payment_method', 'expiration_date',
+)
+
+DocumentKind = namedtuple('DocumentKind', 'model renderer filename permission')
+
+DOCUMENT_KINDS = {
+    'invoice': DocumentKind(Sale, generate_invoice_pdf, 'nota_fiscal_{pk}.pdf', 'sales.view_sale'),
+    'order': DocumentKind(Sale, generate_order_pdf, 'pedido_venda_{pk}.pdf', 'sales.view_order'),
+    'budget': DocumentKind(Budget, generate_budget_pdf, 'orcamento_{pk}.pdf', 'sales.view_budget'),
+}
+
+
+def _fields(obj, names):
+    if obj is None:
+        return None
+    return [getattr(obj, name, None) for name in names]
+
+
+def document_fingerprint(sale, kind):
+    # Everything the generators print; one query for the items, plus company and
+    # client when they are not loaded yet.
+    items = sale.items.order_by('pk').values_list('pk', 'product_id', 'product__title', 'quantity', 'unit_price')
+    payload = [
+        kind,
+        DOCUMENT_VERSION,
+        _fields(sale, SALE_FIELDS),
+        _fields(sale.company, COMPANY_FIELDS),
+        _fields(sale.client, CLIENT_FIELDS),
+        list(items),
+    ]
+    return hashlib.sha256(json.dumps(payload, cls=DjangoJSONEncoder).encode()).hexdigest()
+
+
+def _document_dir(kind, sale):
+    # One directory per sale: replacing a stale version only lists that sale's files.
+    return f'documents/{kind}/{sale.company_id}/{sale.pk}'
+
+
+def document_path(sale, kind, fingerprint):
+    return f'{_document_dir(kind, sale)}/{fingerprint}.pdf'
+
+
+def get_cached_document(sale, kind, fingerprint, render):
+    directory = _document_dir(kind, sale)
+    path = document_path(sale, kind, fingerprint)
+    if default_storage.exists(path):
+        with default_storage.open(path, 'rb') as file:
+            return file.read()
+
+    content = render(sale)
+    # Files of earlier versions of this sale are stale from now on.
+    if default_storage.exists(directory):
+        _, files = default_storage.listdir(directory)
+        for name in files:
+            default_storage.delete(f'{directory}/{name}')
+    default_storage.save(path, ContentFile(content))
+    return content
+
+
+def enqueue_document(sale, kind, user=None):
+    # A job already waiting for this document is reused; a document whose
+    # current version is stored is done right away, without the worker.
+    job = DocumentJob.objects.filter(sale=sale, kind=kind, status__in=('pending', 'running')).first()
+    if job is not None:
+        return job
+
+    job = DocumentJob(company_id=sale.company_id, sale=sale, kind=kind, requested_by=user)
+    path = document_path(sale, kind, document_fingerprint(sale, kind))
+    if default_storage.exists(path):
+        job.status, job.file, job.finished_at = 'done', path, timezone.now()
+    job.save()
+    return job
+
+
+def run_document_job(job_id):
+    # Executed by the render_documents worker, possibly in a pool process.
+    job = DocumentJob.objects.select_related('sale__company', 'sale__client').get(pk=job_id)
+    sale, kind = job.sale, job.kind
+    try:
+        fingerprint = document_fingerprint(sale, kind)
+        get_cached_document(sale, kind, fingerprint, DOCUMENT_KINDS[kind].renderer)
+    except Exception as error:
+        logger.exception('Falha ao gerar o documento %s da venda %s (job %s).', kind, sale.pk, job_id)
+        DocumentJob.objects.filter(pk=job_id).update(status='failed', error=str(error), finished_at=timezone.now())
+        return job_id, 'failed'
+
+    DocumentJob.objects.filter(pk=job_id).update(
+        status='done', file=document_path(sale, kind, fingerprint), error='', finished_at=timezone.now(),
+    )
+    return job_id, 'done'
+
+
+class CachedDocumentMixin:
+    document_kind = None
+    document_renderer = None
+    document_filename = None
+
+    def render_document(self, sale):
+        kind = DOCUMENT_KINDS[self.document_kind]
+        fingerprint = document_fingerprint(sale, self.document_kind)
+        etag = f'"{fingerprint}"'
+
+        response = get_conditional_response(self.request, etag=etag)
+        if response is None:
+            content = get_cached_document(sale, self.document_kind, fingerprint, self.document_renderer or kind.renderer)
+            response = HttpResponse(content, content_type='application/pdf')
+            filename = (self.document_filename or kind.filename).format(pk=sale.pk)
+            response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
+    def get(self, request, *args, **kwargs):
+        return self.render_document(self.get_object())
@@ -0,0 +1,145 @@
+import io
+import multiprocessing
+import threading
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date, datetime, time, timedelta
+import django
+from django.utils import timezone
+from .documents import document_fingerprint, get_cached_document
+from .models import Sale
+from .utils.pdf import generate_invoice_pdf
+
+
+INVOICE_FILENAME = 'nota_fiscal_{pk}.pdf'
+
+
+def parse_period(start, end):
+    try:
+        start_date, end_date = date.fromisoformat(start), date.fromisoformat(end)
+    except (TypeError, ValueError):
+        raise ValueError('Informe o período com datas no formato AAAA-MM-DD.')
+    if start_date > end_date:
+        raise ValueError('A data inicial deve ser anterior ou igual à data final.')
+    return start_date, end_date
+
+
+def invoice_sales(company, start_date, end_date):
+    tzinfo = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(start_date, time.min), tzinfo)
+    end = timezone.make_aware(datetime.combine(end_date + timedelta(days=1), time.min), tzinfo)
+    # Only finalized orders are invoiced.
+    return Sale.objects.filter(
+        company=company,
+        sale_type='order',
+        order_status='finalized',
+        sale_date__gte=start,
+        sale_date__lt=end,
+    ).order_by('sale_date', 'id')
+
+
+def render_invoice(sale_id):
+    # Runs inside the pool workers: only the id crosses the process boundary.
+    sale = Sale.objects.select_related('company', 'client').get(pk=sale_id)
+    content = get_cached_document(sale, 'invoice', document_fingerprint(sale, 'invoice'), generate_invoice_pdf)
+    return INVOICE_FILENAME.format(pk=sale_id), content
+
+
+# workers -> (executor, slots). One pool per process, shared by every export:
+# concurrent exports queue for the same `workers` processes instead of each
+# starting its own, and `slots` caps the renders in flight across all of them.
+_pools = dict()
+_pools_lock = threading.Lock()
+
+
+def _shared_pool(workers):
+    with _pools_lock:
+        if workers not in _pools:
+            executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=django.setup,
+            )
+            _pools[workers] = (executor, threading.BoundedSemaphore(workers * 2))
+        return _pools[workers]
+
+
+def _discard_pool(workers, executor):
+    # A crashed worker breaks the executor for good; the next export starts a new one.
+    with _pools_lock:
+        if _pools.get(workers, (None,))[0] is executor:
+            del _pools[workers]
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def render_in_pool(sale_ids, workers, render=render_invoice):
+    # Yields (filename, content) as soon as each render finishes. At most
+    # 2 * workers renders of this export are in flight, so memory does not
+    # grow with the period.
+    if workers < 1:
+        for sale_id in sale_ids:
+            yield render(sale_id)
+        return
+
+    executor, slots = _shared_pool(workers)
+    pending = set()
+    try:
+        for sale_id in sale_ids:
+            while len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+            slots.acquire()
+            try:
+                future = executor.submit(render, sale_id)
+            except BaseException:
+                slots.release()
+                raise
+            future.add_done_callback(lambda _: slots.release())
+            pending.add(future)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    except BrokenProcessPool:
+        _discard_pool(workers, executor)
+        raise
+    finally:
+        # An abandoned download frees its slots for the other exports.
+        for future in pending:
+            future.cancel()
+
+
+class _ZipStream(io.RawIOBase):
+    # Write-only sink for ZipFile. Not seekable, so entries are written with
+    # data descriptors and nothing has to be rewound.
+    def __init__(self):
+        super().__init__()
+        self.chunks = list()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def stream_zip(files):
+    stream = _ZipStream()
+    with zipfile.ZipFile(stream, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in files:
+            archive.writestr(name, content)
+            yield stream.drain()
+    yield stream.drain()
+
+
+def export_invoices(company, start_date, end_date, workers):
+    sale_ids = invoice_sales(company, start_date, end_date).values_list('pk', flat=True).iterator(chunk_size=2000)
+    return stream_zip(render_in_pool(sale_ids, workers))
@@ -5,14 +5,32 @@ from django.contrib.auth.models import User
 from products.models import Product
 from clients.models import Client
 from django.forms.models import BaseInlineFormSet
+from app.autocomplete import AutocompleteSelect
+
+class PreloadedModelChoiceField(forms.ModelChoiceField):
+    # Resolves the choice from objects loaded up front by the formset, so
+    # validating N items does not run N queries.
+    preloaded = None
+
+    def to_python(self, value):
+        if self.preloaded is None or value in self.empty_values:
+            return super().to_python(value)
+        try:
+            return self.preloaded[int(value)]
+        except (KeyError, TypeError, ValueError):
+            raise forms.ValidationError(
+                self.error_messages['invalid_choice'], code='invalid_choice', params={'value': value},
+            )
+
 
 class SaleItemForm(forms.ModelForm):
     class Meta:
         model = SaleItem
         fields = ('id', 'product', 'quantity', 'unit_price')
+        field_classes = {'product': PreloadedModelChoiceField}
         widgets = {
             'id': forms.HiddenInput(),
-            'product': forms.Select(attrs={'class': 'form-control'}),
+            'product': AutocompleteSelect('product_autocomplete', attrs={'class': 'form-control'}),
             'quantity': forms.NumberInput(attrs={'class': 'form-control', 'min': '1'}),
             'unit_price': forms.NumberInput(attrs={'class': 'form-control', 'min': '0', 'step': '0.01'}),
         }
@@ -24,15 +42,32 @@ class SaleItemForm(forms.ModelForm):
             company = user.profile.company
             self.fields['product'].queryset = Product.objects.filter(company=company)
 
+    def _get_validation_exclusions(self):
+        exclude = super()._get_validation_exclusions()
+        if self.fields['product'].preloaded is not None:
+            # Already resolved against the preloaded products; skip the
+            # per-line existence query of ForeignKey.validate().
+            exclude.add('product')
+        return exclude
+
 class SaleItemFormSetBase(BaseInlineFormSet):
     def __init__(self, *args, **kwargs):
         user = kwargs.pop('user', None)
         super().__init__(*args, **kwargs)
         if user and hasattr(user, 'profile') and user.profile.company:
             company = user.profile.company
+            products = None
+            if self.is_bound:
+                product_ids = {
+                    self.data.get(f'{form.prefix}-product') for form in self.forms
+                }
+                products = Product.objects.filter(company=company).in_bulk(
+                    [pk for pk in product_ids if pk and str(pk).isdigit()]
+                )
             for form in self.forms:
                 if 'product' in form.fields:
                     form.fields['product'].queryset = Product.objects.filter(company=company)
+                    form.fields['product'].preloaded = products
 
 SaleItemFormSet = inlineformset_factory(
     Sale, SaleItem,
@@ -49,7 +84,7 @@ class SaleForm(forms.ModelForm):
         fields = ['client', 'discount', 'seller', 'payment_method']
         widgets = {
             'discount': forms.NumberInput(attrs={'class': 'form-control', 'placeholder': 'Discount (%)', 'min': '0', 'max': '100', 'step': '0.01'}),
-            'client': forms.Select(attrs={'class': 'form-control'}),
+            'client': AutocompleteSelect('client_autocomplete', attrs={'class': 'form-control'}),
             'seller': forms.Select(attrs={'class': 'form-control'}),
             'payment_method': forms.Select(attrs={'class': 'form-control'}),
         }
@@ -67,7 +102,7 @@ class OrderUpdateForm(SaleForm):
         model = Sale
         fields = ['client', 'discount', 'payment_method', 'seller', 'order_status', 'expiration_date']
         widgets = {
-            'client': forms.Select(attrs={'class': 'form-control'}),
+            'client': AutocompleteSelect('client_autocomplete', attrs={'class': 'form-control'}),
             'discount': forms.NumberInput(attrs={'class': 'form-control', 'placeholder': 'Discount (%)', 'min': '0', 'max': '100','step': '0.01'}),
             'payment_method': forms.Select(attrs={'class': 'form-control'}),
             'seller': forms.Select(attrs={'class': 'form-control'}),
@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from companies.models import Company
+from sales.export import export_invoices, parse_period
+
+
+class Command(BaseCommand):
+    help = 'Exporta as notas fiscais de uma empresa em um período para um arquivo ZIP.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--company', type=int, required=True, help='ID da empresa.')
+        parser.add_argument('--start', required=True, help='Data inicial (AAAA-MM-DD).')
+        parser.add_argument('--end', required=True, help='Data final (AAAA-MM-DD).')
+        parser.add_argument('--output', help='Arquivo ZIP de saída. Padrão: notas_fiscais_<início>_<fim>.zip')
+        parser.add_argument('--workers', type=int, help='Processos de renderização. Padrão: INVOICE_EXPORT_WORKERS.')
+
+    def handle(self, *args, **options):
+        try:
+            start_date, end_date = parse_period(options['start'], options['end'])
+        except ValueError as error:
+            raise CommandError(str(error))
+
+        try:
+            company = Company.objects.get(pk=options['company'])
+        except Company.DoesNotExist:
+            raise CommandError(f"Empresa {options['company']} não encontrada.")
+
+        workers = options['workers'] if options['workers'] is not None else settings.INVOICE_EXPORT_WORKERS
+        output = options['output'] or f'notas_fiscais_{start_date}_{end_date}.zip'
+        with open(output, 'wb') as file:
+            for chunk in export_invoices(company, start_date, end_date, workers):
+                file.write(chunk)
+
+        self.stdout.write(self.style.SUCCESS(f'Notas fiscais de {start_date} a {end_date} exportadas para {output}.'))
@@ -0,0 +1,45 @@
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from companies.models import Company
+from sales.models import DailySalesSummary
+
+
+class Command(BaseCommand):
+    help = 'Recalcula o resumo diário de vendas (DailySalesSummary) para um intervalo de datas.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', help='Data inicial (AAAA-MM-DD). Padrão: primeira saída registrada.')
+        parser.add_argument('--end', help='Data final (AAAA-MM-DD). Padrão: hoje.')
+        parser.add_argument('--company', type=int, help='ID da empresa. Padrão: todas.')
+
+    def handle(self, *args, **options):
+        end_date = self._parse_date(options['end']) if options['end'] else timezone.localdate()
+        start_date = self._parse_date(options['start']) if options['start'] else self._first_outflow_date(end_date)
+
+        if start_date > end_date:
+            raise CommandError('A data inicial deve ser anterior ou igual à data final.')
+
+        company = None
+        if options['company']:
+            try:
+                company = Company.objects.get(pk=options['company'])
+            except Company.DoesNotExist:
+                raise CommandError(f"Empresa {options['company']} não encontrada.")
+
+        summaries = DailySalesSummary.rebuild(start_date, end_date, company=company)
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(summaries)} resumos diários recalculados entre {start_date} e {end_date}.'
+        ))
+
+    def _parse_date(self, value):
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            raise CommandError(f'Data inválida: {value}. Use o formato AAAA-MM-DD.')
+
+    def _first_outflow_date(self, default):
+        from outflows.models import Outflow
+
+        first = Outflow.objects.order_by('created_at').values_list('created_at', flat=True).first()
+        return timezone.localdate(first) if first else default
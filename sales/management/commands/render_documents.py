@@ -0,0 +1,114 @@
+import multiprocessing
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from sales.documents import run_document_job
+from sales.models import DocumentJob
+
+
+class Command(BaseCommand):
+    help = 'Gera os documentos PDF enfileirados (DocumentJob) fora das requisições web.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency', type=int,
+            help='Processos de renderização (0 gera no próprio processo). Padrão: DOCUMENT_WORKER_CONCURRENCY.',
+        )
+        parser.add_argument('--poll-interval', type=float, default=2.0, help='Segundos entre consultas à fila vazia.')
+        parser.add_argument('--once', action='store_true', help='Processa a fila atual e encerra.')
+
+    def handle(self, *args, **options):
+        concurrency = options['concurrency'] if options['concurrency'] is not None else settings.DOCUMENT_WORKER_CONCURRENCY
+        self.verbosity = options['verbosity']
+        self.results = Counter()
+        try:
+            if concurrency < 1:
+                self._run_inline(options['poll_interval'], options['once'])
+            else:
+                self._run_pool(concurrency, options['poll_interval'], options['once'])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{self.results['done']} documentos gerados, {self.results['failed']} com falha."
+        ))
+
+    def _requeue_stale(self):
+        # Every poll cycle, so a long-running worker picks up the jobs of a
+        # peer that crashed.
+        requeued, failed = DocumentJob.requeue_stale(settings.DOCUMENT_JOB_TIMEOUT, settings.DOCUMENT_JOB_MAX_ATTEMPTS)
+        if requeued:
+            self.stdout.write(f'{requeued} documentos interrompidos voltaram para a fila.')
+        if failed:
+            self.stdout.write(f'{failed} documentos interrompidos em todas as tentativas foram marcados com falha.')
+
+    def _record(self, job_id, state):
+        self.results[state] += 1
+        if self.verbosity > 1:
+            self.stdout.write(f'Documento {job_id}: {state}')
+
+    def _run_inline(self, poll_interval, once):
+        while True:
+            self._requeue_stale()
+            ids = DocumentJob.claim(1)
+            if not ids:
+                if once:
+                    return
+                time.sleep(poll_interval)
+                continue
+            self._record(*run_document_job(ids[0]))
+
+    def _run_pool(self, concurrency, poll_interval, once):
+        # Never more claimed jobs than processes: the rest stay pending for
+        # other workers, and PDF load is capped at `concurrency` renders.
+        executor = self._make_pool(concurrency)
+        pending = dict()
+        try:
+            while True:
+                self._requeue_stale()
+                if len(pending) < concurrency:
+                    claimed = DocumentJob.claim(concurrency - len(pending))
+                    try:
+                        for job_id in claimed:
+                            pending[executor.submit(run_document_job, job_id)] = job_id
+                    except BrokenProcessPool:
+                        # A process died; the pool takes no more work until replaced.
+                        submitted = set(pending.values())
+                        DocumentJob.unclaim([job_id for job_id in claimed if job_id not in submitted])
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        executor = self._make_pool(concurrency)
+                        continue
+                if not pending:
+                    if once:
+                        return
+                    time.sleep(poll_interval)
+                    continue
+                done, _ = wait(pending, timeout=poll_interval, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job_id = pending.pop(future)
+                    try:
+                        self._record(*future.result())
+                    except BrokenProcessPool:
+                        # Killed with its process; retried up to the attempt limit.
+                        _, failed = DocumentJob.requeue([job_id], settings.DOCUMENT_JOB_MAX_ATTEMPTS)
+                        if failed:
+                            self._record(job_id, 'failed')
+                    except Exception as error:
+                        # The worker process itself failed, not the rendering.
+                        DocumentJob.objects.filter(pk=job_id).update(status='failed', error=str(error), finished_at=timezone.now())
+                        self._record(job_id, 'failed')
+        finally:
+            executor.shutdown(cancel_futures=True)
+            DocumentJob.unclaim([job_id for future, job_id in pending.items() if future.cancelled()])
+
+    def _make_pool(self, concurrency):
+        return ProcessPoolExecutor(
+            max_workers=concurrency,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=django.setup,
+        )
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.6 on 2026-10-18 11:18
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0006_company_ie'),
+        ('sales', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailySalesSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Data')),
+                ('revenue', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14, verbose_name='Faturamento')),
+                ('cost', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14, verbose_name='Custo')),
+                ('units', models.PositiveIntegerField(default=0, verbose_name='Unidades')),
+                ('outflow_count', models.PositiveIntegerField(default=0, verbose_name='Saídas')),
+                ('sale_count', models.PositiveIntegerField(default=0, verbose_name='Vendas')),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales_summaries', to='companies.company')),
+            ],
+            options={
+                'verbose_name': 'Resumo Diário de Vendas',
+                'verbose_name_plural': 'Resumos Diários de Vendas',
+                'ordering': ['-date'],
+                'constraints': [models.UniqueConstraint(fields=('company', 'date'), name='unique_daily_sales_summary')],
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.6 on 2026-10-18 11:53
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0001_initial'),
+        ('companies', '0007_idempotencykey'),
+        ('sales', '0002_dailysalessummary'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='sale',
+            index=models.Index(fields=['company', '-sale_date', '-id'], name='sale_company_date_id_idx'),
+        ),
+    ]
@@ -1,4 +1,6 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, DecimalField, F, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import TruncDate
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.contrib.auth.models import User
@@ -8,6 +10,8 @@ from products.models import Product
 from clients.models import Client
 from companies.models import Company
 from django.utils import timezone
+from collections import defaultdict
+from datetime import datetime, time, timedelta
 
 
 class Seller(models.Model):
@@ -66,6 +70,9 @@ class Sale(models.Model):
         verbose_name = "Sale"
         verbose_name_plural = "Sales"
         ordering = ['-sale_date']
+        indexes = [
+            models.Index(fields=['company', '-sale_date', '-id'], name='sale_company_date_id_idx'),
+        ]
 
     def __str__(self):
         base = f"Sale {self.id} - {self.sale_date:%d/%m/%Y %H:%M}"
@@ -92,32 +99,112 @@ class Sale(models.Model):
     
     def update_totals(self):
         subtotal = sum(item.unit_price * item.quantity for item in self.items.all())
+        self._set_total(subtotal)
+
+    def _set_total(self, subtotal):
         discount_factor = (Decimal("100.00") - self.discount) / Decimal ("100.00")
         total = subtotal * discount_factor
         self.total = total.quantize(Decimal("0.01"))
         self.save(update_fields=["total"])
+
+    @transaction.atomic
+    def checkout(self, items):
+        # items: dicts with product (instance or pk), quantity and unit_price.
+        # Products are read with a single IN query and the items inserted with
+        # bulk_create, so the cost of a sale does not grow with its line count.
+        items = list(items)
+        product_ids = {getattr(item['product'], 'pk', item['product']) for item in items}
+        products = {
+            item['product'].pk: item['product'] for item in items
+            if isinstance(item['product'], Product) and item['product'].company_id == self.company_id
+        }
+        pending = product_ids - set(products)
+        if pending:
+            products.update(Product.objects.filter(company=self.company).in_bulk(pending))
+        missing = product_ids - set(products)
+        if missing:
+            raise ValidationError(f"Produto não encontrado: {', '.join(str(pk) for pk in sorted(missing))}.")
+
+        sale_items = list()
+        for item in items:
+            product = products[getattr(item['product'], 'pk', item['product'])]
+            sale_items.append(SaleItem(
+                sale=self,
+                product=product,
+                quantity=item['quantity'],
+                unit_price=item['unit_price'],
+                purchase_price=product.cost_price,
+            ))
+        SaleItem.objects.bulk_create(sale_items)
+
+        self._set_total(sum(item.subtotal() for item in sale_items))
+        return sale_items
     
-    def finalize(self):
+    def finalize(self, allow_shortfall=False):
+        # Raises products.stock.InsufficientStock when an item is not in stock,
+        # unless allow_shortfall; the returned shortfalls are then informative.
         if self.order_status == 'finalized':
             # Idempotency check: only create outflows if they don't exist yet for this sale
             from outflows.models import Outflow
-            if not Outflow.objects.filter(sale_reference=f"Venda {self.id}").exists():
-                self._create_outflows()
+            if not Outflow.objects.filter(sale=self).exists():
+                return self._create_outflows(allow_shortfall)
+        return list()
     
-    def _create_outflows(self):
+    @transaction.atomic
+    def _create_outflows(self, allow_shortfall=False):
+        # Bulk path: signals do not fire for bulk_create/update, so the stock
+        # movements, stock reservation, daily summary and dashboard cache are
+        # updated here explicitly.
+        from app.cache import invalidate_company_cache
         from outflows.models import Outflow
+        from products.stock import reserve_stock
+        from stockmoviment.models import StockMoviment
 
         discount_factor = (Decimal("100.00") - self.discount) / Decimal("100.00")
 
-        for item in self.items.all():
+        outflows = list()
+        movements = list()
+        quantities = defaultdict(int)
+        revenue = cost = Decimal("0.00")
+        for item in self.items.select_related('product'):
+            if item.product is None:
+                continue
             discount_unit_price = (item.unit_price * discount_factor).quantize(Decimal("0.01"))
-            Outflow.objects.create(
+            outflows.append(Outflow(
                 product=item.product,
                 quantity=item.quantity,
                 company=self.company,
+                sale=self,
+                source='sale',
                 sale_reference=f"Venda {self.id}",
                 description=f"Venda PDV ({self.id}). Unit com desconto: R$ {discount_unit_price}"
-            )
+            ))
+            movements.append(StockMoviment(
+                product=item.product,
+                quantity=item.quantity,
+                movement_type='out',
+                company=self.company,
+            ))
+            quantities[item.product_id] += item.quantity
+            revenue += item.unit_price * item.quantity
+            cost += item.purchase_price * item.quantity
+
+        # Reserved first: a short item aborts the sale before anything is written.
+        shortfalls = reserve_stock(self.company_id, quantities, allow_shortfall)
+        Outflow.objects.bulk_create(outflows)
+        StockMoviment.objects.bulk_create(movements)
+
+        DailySalesSummary.add(
+            self.company,
+            timezone.localdate(),
+            revenue=revenue,
+            cost=cost,
+            units=sum(quantities.values()),
+            outflow_count=len(outflows),
+            sale_count=1,
+        )
+        invalidate_company_cache(self.company_id)
+        return shortfalls
 
 
 class SaleItem(models.Model):
@@ -201,4 +288,191 @@ class Budget(Sale):
 
         order.calculate_total()
         return order
- 
\ No newline at end of file
+ 
+
+class DailySalesSummary(models.Model):
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='daily_sales_summaries')
+    date = models.DateField("Data")
+    revenue = models.DecimalField("Faturamento", max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    cost = models.DecimalField("Custo", max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    units = models.PositiveIntegerField("Unidades", default=0)
+    outflow_count = models.PositiveIntegerField("Saídas", default=0)
+    sale_count = models.PositiveIntegerField("Vendas", default=0)
+
+    class Meta:
+        verbose_name = "Resumo Diário de Vendas"
+        verbose_name_plural = "Resumos Diários de Vendas"
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(fields=['company', 'date'], name='unique_daily_sales_summary'),
+        ]
+
+    def __str__(self):
+        return f"{self.company} - {self.date:%d/%m/%Y}"
+
+    @classmethod
+    @transaction.atomic
+    def add(cls, company, date, revenue=Decimal("0.00"), cost=Decimal("0.00"), units=0, outflow_count=0, sale_count=0):
+        summary, _ = cls.objects.get_or_create(company=company, date=date)
+        cls.objects.filter(pk=summary.pk).update(
+            revenue=F('revenue') + revenue,
+            cost=F('cost') + cost,
+            units=F('units') + units,
+            outflow_count=F('outflow_count') + outflow_count,
+            sale_count=F('sale_count') + sale_count,
+        )
+
+    @classmethod
+    def add_outflow(cls, outflow):
+        product = outflow.product
+        cls.add(
+            outflow.company,
+            timezone.localdate(outflow.created_at),
+            revenue=product.selling_price * outflow.quantity,
+            cost=product.cost_price * outflow.quantity,
+            units=outflow.quantity,
+            outflow_count=1,
+        )
+
+    @classmethod
+    @transaction.atomic
+    def rebuild(cls, start_date, end_date, company=None):
+        # Same prices as the incremental path: sale outflows take the sale
+        # items' unit and purchase prices, manual outflows (and outflows of
+        # deleted sales) the product prices. Deleted outflows are never
+        # subtracted by add(); rebuilding the affected days drops them.
+        from outflows.models import Outflow
+
+        tzinfo = timezone.get_current_timezone()
+        start = timezone.make_aware(datetime.combine(start_date, time.min), tzinfo)
+        end = timezone.make_aware(datetime.combine(end_date + timedelta(days=1), time.min), tzinfo)
+
+        summaries = cls.objects.filter(date__gte=start_date, date__lte=end_date)
+        outflows = Outflow.objects.filter(created_at__gte=start, created_at__lt=end)
+        if company is not None:
+            summaries = summaries.filter(company=company)
+            outflows = outflows.filter(company=company)
+
+        manual = Q(sale__isnull=True)
+        rows = outflows.annotate(
+            day=TruncDate('created_at', tzinfo=tzinfo),
+        ).values('company_id', 'day').annotate(
+            total_revenue=Sum(F('quantity') * F('product__selling_price'), filter=manual, output_field=DecimalField()),
+            total_cost=Sum(F('quantity') * F('product__cost_price'), filter=manual, output_field=DecimalField()),
+            total_units=Sum('quantity'),
+            total_outflows=Count('id'),
+            total_sales=Count('sale', distinct=True),
+        ).order_by()
+
+        sale_day = Outflow.objects.filter(sale=OuterRef('sale_id')).annotate(
+            day=TruncDate('created_at', tzinfo=tzinfo),
+        ).order_by('created_at').values('day')[:1]
+        item_rows = SaleItem.objects.filter(
+            sale__in=outflows.filter(sale__isnull=False).values('sale_id'),
+            product__isnull=False,
+        ).annotate(
+            day=Subquery(sale_day),
+        ).values('sale__company_id', 'day').annotate(
+            total_revenue=Sum(F('quantity') * F('unit_price'), output_field=DecimalField()),
+            total_cost=Sum(F('quantity') * F('purchase_price'), output_field=DecimalField()),
+        ).order_by()
+        items = {(row['sale__company_id'], row['day']): row for row in item_rows}
+
+        summaries.delete()
+        created = list()
+        for row in rows:
+            item = items.get((row['company_id'], row['day']), dict())
+            created.append(cls(
+                company_id=row['company_id'],
+                date=row['day'],
+                revenue=(row['total_revenue'] or Decimal("0.00")) + (item.get('total_revenue') or Decimal("0.00")),
+                cost=(row['total_cost'] or Decimal("0.00")) + (item.get('total_cost') or Decimal("0.00")),
+                units=row['total_units'] or 0,
+                outflow_count=row['total_outflows'],
+                sale_count=row['total_sales'],
+            ))
+        return cls.objects.bulk_create(created)
+
+
+DOCUMENT_KIND_CHOICES = [
+    ('invoice', 'Nota fiscal'),
+    ('order', 'Pedido de venda'),
+    ('budget', 'Orçamento'),
+]
+
+DOCUMENT_JOB_STATUS_CHOICES = [
+    ('pending', 'Pendente'),
+    ('running', 'Gerando'),
+    ('done', 'Concluído'),
+    ('failed', 'Falhou'),
+]
+
+
+class DocumentJob(models.Model):
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='document_jobs')
+    sale = models.ForeignKey(Sale, on_delete=models.CASCADE, related_name='document_jobs')
+    kind = models.CharField("Documento", max_length=10, choices=DOCUMENT_KIND_CHOICES)
+    status = models.CharField("Status", max_length=10, choices=DOCUMENT_JOB_STATUS_CHOICES, default='pending')
+    file = models.CharField("Arquivo", max_length=255, blank=True)
+    error = models.TextField("Erro", blank=True)
+    attempts = models.PositiveSmallIntegerField("Tentativas", default=0)
+    requested_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Geração de Documento"
+        verbose_name_plural = "Gerações de Documentos"
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='documentjob_queue_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} da venda {self.sale_id} ({self.status})"
+
+    @classmethod
+    def claim(cls, limit):
+        # Oldest pending jobs first. SKIP LOCKED lets several workers share the
+        # queue; where it is not supported (SQLite) two workers may select the
+        # same rows, so only the jobs this worker moved out of pending are kept.
+        with transaction.atomic():
+            ids = list(
+                cls.objects.select_for_update(skip_locked=True)
+                .filter(status='pending').order_by('created_at', 'id')
+                .values_list('pk', flat=True)[:limit]
+            )
+            now = timezone.now()
+            return [
+                pk for pk in ids
+                if cls.objects.filter(pk=pk, status='pending').update(
+                    status='running', started_at=now, attempts=F('attempts') + 1,
+                )
+            ]
+
+    @classmethod
+    def unclaim(cls, ids):
+        # Claimed jobs that never reached a render process give their attempt back.
+        return cls.objects.filter(pk__in=ids, status='running').update(
+            status='pending', started_at=None, attempts=F('attempts') - 1,
+        )
+
+    @classmethod
+    def requeue(cls, ids, max_attempts):
+        # Jobs whose render process died mid-render.
+        return cls._requeue(cls.objects.filter(pk__in=ids, status='running'), max_attempts)
+
+    @classmethod
+    def requeue_stale(cls, timeout, max_attempts):
+        # Jobs left running by a worker that died.
+        return cls._requeue(cls.objects.filter(status='running', started_at__lt=timezone.now() - timeout), max_attempts)
+
+    @classmethod
+    def _requeue(cls, jobs, max_attempts):
+        # Back to the queue, unless they already used every attempt (e.g. a
+        # document that kills the worker). Returns (requeued, failed).
+        failed = jobs.filter(attempts__gte=max_attempts).update(
+            status='failed', error='Geração interrompida em todas as tentativas.', finished_at=timezone.now(),
+        )
+        return jobs.update(status='pending'), failed
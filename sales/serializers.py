@@ -1,13 +1,31 @@
+from django.core.exceptions import ValidationError
+from django.db import transaction
 from rest_framework import serializers
-from .models import Sale, SaleItem
+from django.urls import reverse
+from products.models import Product
+from .documents import DOCUMENT_KINDS
+from .models import DocumentJob, Sale, SaleItem
+
+
+class ProductIdField(serializers.PrimaryKeyRelatedField):
+    # Only the pk is validated here; Sale.checkout loads every product of the
+    # sale in one query instead of one get() per item.
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            return int(data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
 
 
 class SaleItemSerializer(serializers.ModelSerializer):
+    product = ProductIdField(queryset=Product.objects.all())
+
     class Meta:
         model = SaleItem
         fields = ['id', 'product', 'quantity', 'unit_price']
         extra_kwargs = {
-            'product': {'required': True},
             'quantity': {'min_value': 1},
             'unit_price': {'min_value': 0}
         }
@@ -27,10 +45,9 @@ class SaleSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         items_data = validated_data.pop('items')
-        sale = Sale.objects.create(**validated_data)
-        for item_data in items_data:
-            SaleItem.objects.create(sale=sale, **item_data)
-        sale.calculate_total()
+        with transaction.atomic():
+            sale = Sale.objects.create(**validated_data)
+            self._checkout(sale, items_data)
         return sale
 
     def update(self, instance, validated_data):
@@ -38,8 +55,49 @@ class SaleSerializer(serializers.ModelSerializer):
         instance = super().update(instance, validated_data)
 
         if items_data is not None:
-            instance.items.all().delete()
-            for item_data in items_data:
-                SaleItem.objects.create(sale=instance, **item_data)
-            instance.calculate_total()
+            with transaction.atomic():
+                instance.items.all().delete()
+                self._checkout(instance, items_data)
         return instance
+
+    def _checkout(self, sale, items_data):
+        try:
+            sale.checkout(items_data)
+        except ValidationError as error:
+            raise serializers.ValidationError({'items': error.messages})
+
+
+class DocumentJobSerializer(serializers.ModelSerializer):
+    sale = serializers.PrimaryKeyRelatedField(queryset=Sale.objects.all())
+    status_url = serializers.SerializerMethodField()
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = DocumentJob
+        fields = ['id', 'kind', 'sale', 'status', 'error', 'created_at', 'finished_at', 'status_url', 'download_url']
+        read_only_fields = ('status', 'error', 'created_at', 'finished_at')
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is not None:
+            self.fields['sale'].queryset = Sale.objects.filter(company=request.user.profile.company)
+
+    def validate(self, attrs):
+        model = DOCUMENT_KINDS[attrs['kind']].model
+        if model is not Sale and not model.objects.filter(pk=attrs['sale'].pk).exists():
+            raise serializers.ValidationError({'sale': 'Esta venda não possui este tipo de documento.'})
+        return attrs
+
+    def _url(self, name, job):
+        url = reverse(name, kwargs={'pk': job.pk})
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request is not None else url
+
+    def get_status_url(self, job):
+        return self._url('document-job-detail-api-view', job)
+
+    def get_download_url(self, job):
+        if job.status != 'done':
+            return None
+        return self._url('document-job-download-api-view', job)
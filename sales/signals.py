@@ -1,10 +1,17 @@
 from django.core.exceptions import ValidationError
-from django.db.models.signals import pre_save
+from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
-from .models import Budget
+from outflows.models import Outflow
+from .models import Budget, DailySalesSummary
 
 @receiver(pre_save, sender=Budget)
 def check_expiration(sender, instance, **kwargs):
     if instance.expiration_date and instance.expiration_date < timezone.now().date():
-        raise ValidationError("Orçamento expirado não pode ser alterado.")
\ No newline at end of file
+        raise ValidationError("Orçamento expirado não pode ser alterado.")
+
+
+@receiver(post_save, sender=Outflow)
+def update_daily_sales_summary(sender, instance, created, **kwargs):
+    if created:
+        DailySalesSummary.add_outflow(instance)
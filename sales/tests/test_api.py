@@ -16,6 +16,19 @@ class TestSaleAPI:
         assert response.status_code == 200
         assert len(response.data) == 2
 
+    def test_sale_list_api_keyset_pages_are_opt_in(self, admin_user, company):
+        client = APIClient()
+        client.force_authenticate(user=admin_user)
+        baker.make(Sale, company=company, _quantity=3)
+        url = reverse('sale-create-list-api-view')
+
+        first = client.get(url, {'page_size': 2}).data
+        second = client.get(first['next']).data
+
+        assert len(first['results']) == 2
+        assert len(second['results']) == 1 and second['next'] is None
+        assert {sale['id'] for sale in first['results'] + second['results']} == set(Sale.objects.values_list('pk', flat=True))
+
     def test_sale_create_api(self, admin_user, company):
         client = APIClient()
         client.force_authenticate(user=admin_user)
@@ -34,3 +47,204 @@ class TestSaleAPI:
         assert response.status_code == 201
         assert Sale.objects.filter(company=company).count() == 1
         assert Sale.objects.first().total == 20.00
+
+    def test_sale_create_api_batches_items(self, admin_user, company):
+        client = APIClient()
+        client.force_authenticate(user=admin_user)
+        products = baker.make(Product, company=company, cost_price=5.00, _quantity=15)
+
+        url = reverse('sale-create-list-api-view')
+        data = {
+            'discount': 0,
+            'sale_type': 'order',
+            'order_status': 'finalized',
+            'items': [{'product': product.id, 'quantity': 1, 'unit_price': 10.00} for product in products],
+        }
+        response = client.post(url, data, format='json')
+        assert response.status_code == 201
+        assert len(response.data['items']) == 15
+        assert Sale.objects.get(company=company).total == 150.00
+
+    def test_sale_create_api_rejects_unknown_product(self, admin_user, company):
+        client = APIClient()
+        client.force_authenticate(user=admin_user)
+        other = baker.make(Product)
+
+        url = reverse('sale-create-list-api-view')
+        data = {
+            'discount': 0,
+            'items': [{'product': other.id, 'quantity': 1, 'unit_price': 10.00}],
+        }
+        response = client.post(url, data, format='json')
+        assert response.status_code == 400
+        assert 'items' in response.data
+        assert not Sale.objects.filter(company=company).exists()
+
+    def test_sale_create_api_replays_idempotent_retry(self, admin_user, company):
+        client = APIClient()
+        client.force_authenticate(user=admin_user)
+        product = baker.make(Product, company=company, quantity=10, selling_price=10.00)
+
+        url = reverse('sale-create-list-api-view')
+        data = {
+            'discount': 0,
+            'items': [{'product': product.id, 'quantity': 2, 'unit_price': 10.00}],
+        }
+        first = client.post(url, data, format='json', HTTP_IDEMPOTENCY_KEY='pos-1-0001')
+        retry = client.post(url, data, format='json', HTTP_IDEMPOTENCY_KEY='pos-1-0001')
+        other = client.post(url, data, format='json', HTTP_IDEMPOTENCY_KEY='pos-1-0002')
+
+        assert first.status_code == retry.status_code == other.status_code == 201
+        assert retry.json() == first.json()
+        assert retry['Idempotent-Replayed'] == 'true'
+        assert Sale.objects.filter(company=company).count() == 2
+
+    def test_idempotency_key_reused_with_different_payload(self, admin_user, company):
+        client = APIClient()
+        client.force_authenticate(user=admin_user)
+        product = baker.make(Product, company=company, selling_price=10.00)
+
+        url = reverse('sale-create-list-api-view')
+        data = {'discount': 0, 'items': [{'product': product.id, 'quantity': 1, 'unit_price': 10.00}]}
+        client.post(url, data, format='json', HTTP_IDEMPOTENCY_KEY='pos-1-0003')
+        data['items'][0]['quantity'] = 5
+        response = client.post(url, data, format='json', HTTP_IDEMPOTENCY_KEY='pos-1-0003')
+
+        assert response.status_code == 422
+        assert Sale.objects.filter(company=company).count() == 1
+
+    def test_failed_create_does_not_store_idempotency_key(self, admin_user, company):
+        from companies.models import IdempotencyKey
+        client = APIClient()
+        client.force_authenticate(user=admin_user)
+
+        url = reverse('sale-create-list-api-view')
+        data = {'discount': 0, 'items': [{'product': 999999, 'quantity': 1, 'unit_price': 10.00}]}
+        response = client.post(url, data, format='json', HTTP_IDEMPOTENCY_KEY='pos-1-0004')
+
+        assert response.status_code == 400
+        assert not IdempotencyKey.objects.exists()
+
+    def test_fingerprint_of_multipart_upload(self):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from django.http import QueryDict
+        from companies.mixins import request_fingerprint
+
+        def payload(content):
+            data = QueryDict(mutable=True)
+            data.update({'title': 'Mouse', 'photo': SimpleUploadedFile('mouse.png', content, content_type='image/png')})
+            return data
+
+        assert request_fingerprint('/api/v1/products/', payload(b'a')) == request_fingerprint('/api/v1/products/', payload(b'a'))
+        assert request_fingerprint('/api/v1/products/', payload(b'a')) != request_fingerprint('/api/v1/products/', payload(b'b'))
+
+    def test_purge_idempotency_keys_command(self, company):
+        from datetime import timedelta
+        from io import StringIO
+        from django.core.management import call_command
+        from django.utils import timezone
+        from companies.models import IdempotencyKey
+        baker.make(IdempotencyKey, company=company, key='old', expires_at=timezone.now() - timedelta(minutes=1))
+        baker.make(IdempotencyKey, company=company, key='new', expires_at=timezone.now() + timedelta(hours=1))
+
+        call_command('purge_idempotency_keys', stdout=StringIO())
+
+        assert list(IdempotencyKey.objects.values_list('key', flat=True)) == ['new']
+
+    def test_sale_sync_reports_per_sale_results(self, admin_user, company):
+        from outflows.models import Outflow
+        client = APIClient()
+        client.force_authenticate(user=admin_user)
+        product = baker.make(Product, company=company, quantity=3, selling_price=10.00)
+        other = baker.make(Product, company=company, quantity=50, selling_price=5.00)
+
+        def entry(product_id, quantity, key):
+            return {
+                'idempotency_key': key,
+                'discount': 0,
+                'order_status': 'finalized',
+                'items': [{'product': product_id, 'quantity': quantity, 'unit_price': 10.00}],
+            }
+
+        url = reverse('sale-sync-api-view')
+        data = {'sales': [
+            entry(product.id, 2, 'pos-1-a'),
+            entry(999999, 1, 'pos-1-b'),
+            entry(product.id, 2, 'pos-1-c'),
+            entry(other.id, 1, 'pos-1-d'),
+        ]}
+        response = client.post(url, data, format='json')
+
+        assert response.status_code == 200
+        body = response.json()
+        assert (body['created'], body['duplicate'], body['error']) == (3, 0, 1)
+        statuses = [result['status'] for result in body['results']]
+        assert statuses == ['created', 'error', 'created', 'created']
+        assert 'items' in body['results'][1]['errors']
+        assert body['results'][2]['stock_conflicts'] == [{'product': product.id, 'requested': 2, 'available': 1}]
+        assert 'stock_conflicts' not in body['results'][0]
+        assert 'stock_conflicts' not in body['results'][3]
+        assert Outflow.objects.filter(company=company).count() == 3
+
+        replay = client.post(url, {'sales': [entry(product.id, 2, 'pos-1-a')]}, format='json').json()
+        assert replay['duplicate'] == 1
+        assert replay['results'][0]['sale'] == body['results'][0]['sale']
+        assert Sale.objects.filter(company=company).count() == 3
+
+    def test_sale_sync_reports_concurrent_key_per_sale(self, admin_user, company, monkeypatch):
+        from django.db import IntegrityError
+        from companies.models import IdempotencyKey
+        client = APIClient()
+        client.force_authenticate(user=admin_user)
+        product = baker.make(Product, company=company, quantity=10, selling_price=10.00)
+        update_or_create = IdempotencyKey.objects.update_or_create
+
+        def racing_sync(**kwargs):
+            # Another request inserted the key after this one looked it up.
+            if kwargs['key'] == 'pos-2-a':
+                raise IntegrityError('UNIQUE constraint failed: companies_idempotencykey.company_id, key')
+            return update_or_create(**kwargs)
+
+        monkeypatch.setattr(IdempotencyKey.objects, 'update_or_create', racing_sync)
+        data = {'sales': [
+            {'idempotency_key': key, 'discount': 0, 'order_status': 'finalized',
+             'items': [{'product': product.id, 'quantity': 1, 'unit_price': 10.00}]}
+            for key in ('pos-2-a', 'pos-2-b')
+        ]}
+        response = client.post(reverse('sale-sync-api-view'), data, format='json')
+
+        assert response.status_code == 200
+        body = response.json()
+        assert [result['status'] for result in body['results']] == ['error', 'created']
+        assert 'idempotency_key' in body['results'][0]['errors']
+        assert list(Sale.objects.filter(company=company).values_list('pk', flat=True)) == [body['results'][1]['sale']]
+        product.refresh_from_db()
+        assert product.quantity == 9
+
+    def test_sale_sync_rejects_empty_payload(self, admin_user):
+        client = APIClient()
+        client.force_authenticate(user=admin_user)
+
+        response = client.post(reverse('sale-sync-api-view'), {'sales': []}, format='json')
+
+        assert response.status_code == 400
+
+    def test_sale_sync_stays_within_per_chunk_budget(self, admin_user, company):
+        from sales.views import SYNC_CHUNK_SIZE
+        client = APIClient()
+        client.force_authenticate(user=admin_user)
+        products = baker.make(Product, company=company, quantity=1000, _quantity=3)
+        sales = [
+            {
+                'idempotency_key': f'pos-2-{index}',
+                'discount': 0,
+                'order_status': 'finalized',
+                'items': [{'product': product.id, 'quantity': 1, 'unit_price': 10.00} for product in products],
+            }
+            for index in range(SYNC_CHUNK_SIZE + 5)
+        ]
+
+        response = client.post(reverse('sale-sync-api-view'), {'sales': sales}, format='json')
+
+        assert response.status_code == 200
+        assert response.json()['created'] == SYNC_CHUNK_SIZE + 5
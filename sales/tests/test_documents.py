@@ -0,0 +1,189 @@
+import io
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+from model_bakery import baker
+from rest_framework.test import APIClient
+from clients.models import Client
+from companies.models import UserProfile
+from sales.documents import run_document_job
+from sales.management.commands import render_documents
+from sales.models import DocumentJob, Sale
+
+
+@pytest.fixture
+def api_client(admin_user):
+    client = APIClient()
+    client.force_authenticate(user=admin_user)
+    return client
+
+
+@pytest.fixture
+def sale(company):
+    return baker.make(Sale, company=company, client=baker.make(Client, company=company, telephone='65999999999'))
+
+
+def _run_worker():
+    call_command('render_documents', once=True, concurrency=0, stdout=io.StringIO())
+
+
+@pytest.mark.django_db
+class TestDocumentJobs:
+    def test_job_is_rendered_by_worker_and_downloaded(self, api_client, sale):
+        response = api_client.post(reverse('document-job-create-api-view'), {'kind': 'invoice', 'sale': sale.pk}, format='json')
+        assert response.status_code == 202
+        assert response.data['status'] == 'pending'
+        assert response.data['download_url'] is None
+        job_id = response.data['id']
+
+        again = api_client.post(reverse('document-job-create-api-view'), {'kind': 'invoice', 'sale': sale.pk}, format='json')
+        assert again.data['id'] == job_id
+        assert api_client.get(reverse('document-job-download-api-view', kwargs={'pk': job_id})).status_code == 409
+
+        _run_worker()
+
+        status = api_client.get(response.data['status_url'])
+        assert status.data['status'] == 'done'
+        download = api_client.get(status.data['download_url'])
+        assert download.status_code == 200
+        assert download['Content-Disposition'] == f'attachment; filename="nota_fiscal_{sale.pk}.pdf"'
+        assert b''.join(download.streaming_content).startswith(b'%PDF')
+
+    def test_stored_document_is_done_without_worker(self, api_client, auth_client, sale):
+        auth_client.get(reverse('sale_invoice', kwargs={'pk': sale.pk}))
+
+        response = api_client.post(reverse('document-job-create-api-view'), {'kind': 'invoice', 'sale': sale.pk}, format='json')
+
+        assert response.data['status'] == 'done'
+        assert response.data['download_url'].endswith(f"/api/v1/documents/{response.data['id']}/download/")
+
+    def test_rejects_budget_of_an_order_and_foreign_sales(self, api_client, sale):
+        url = reverse('document-job-create-api-view')
+        assert api_client.post(url, {'kind': 'budget', 'sale': sale.pk}, format='json').status_code == 400
+        assert api_client.post(url, {'kind': 'invoice', 'sale': baker.make(Sale).pk}, format='json').status_code == 400
+        assert not DocumentJob.objects.exists()
+
+    def test_requires_document_permission(self, company, sale):
+        user = baker.make(User)
+        UserProfile.objects.create(user=user, company=company)
+        client = APIClient()
+        client.force_authenticate(user=user)
+
+        response = client.post(reverse('document-job-create-api-view'), {'kind': 'invoice', 'sale': sale.pk}, format='json')
+
+        assert response.status_code == 403
+
+    def test_claim_and_requeue_stale_jobs(self, company, sale):
+        jobs = baker.make(DocumentJob, company=company, sale=sale, kind='invoice', _quantity=3)
+
+        first = DocumentJob.claim(2)
+        second = DocumentJob.claim(2)
+
+        assert first == [jobs[0].pk, jobs[1].pk]
+        assert second == [jobs[2].pk]
+        assert DocumentJob.claim(2) == []
+        assert DocumentJob.requeue_stale(timedelta(0), max_attempts=3) == (3, 0)
+        assert DocumentJob.objects.filter(status='pending', attempts=1).count() == 3
+
+    def test_claim_skips_jobs_taken_by_another_worker(self, company, sale):
+        job = baker.make(DocumentJob, company=company, sale=sale, kind='invoice')
+        taken = list()
+
+        def other_worker(execute, sql, params, many, context):
+            # Without SKIP LOCKED: another worker takes the job right after
+            # this one selected it.
+            result = execute(sql, params, many, context)
+            if not taken and sql.startswith('SELECT') and 'sales_documentjob' in sql:
+                taken.append(DocumentJob.objects.filter(pk=job.pk).update(status='running'))
+            return result
+
+        with connection.execute_wrapper(other_worker):
+            assert DocumentJob.claim(1) == []
+        assert taken == [1]
+
+    def test_requeue_stale_fails_jobs_out_of_attempts(self, company, sale):
+        retry = baker.make(DocumentJob, company=company, sale=sale, kind='invoice')
+        crashing = baker.make(DocumentJob, company=company, sale=sale, kind='invoice')
+        DocumentJob.claim(2)
+        DocumentJob.objects.filter(pk=crashing.pk).update(attempts=3)
+
+        assert DocumentJob.requeue_stale(timedelta(0), max_attempts=3) == (1, 1)
+        retry.refresh_from_db()
+        crashing.refresh_from_db()
+        assert retry.status == 'pending'
+        assert crashing.status == 'failed' and crashing.finished_at is not None
+
+    def test_worker_requeues_jobs_of_crashed_peers_while_polling(self, company, sale, monkeypatch):
+        first, orphan = baker.make(DocumentJob, company=company, sale=sale, kind='invoice', _quantity=2)
+
+        def render(job_id):
+            # A peer claims the second job and dies while this worker is busy.
+            DocumentJob.objects.filter(pk=orphan.pk).update(
+                status='running', attempts=1, started_at=timezone.now() - timedelta(hours=1),
+            )
+            monkeypatch.setattr(render_documents, 'run_document_job', run_document_job)
+            return run_document_job(job_id)
+
+        monkeypatch.setattr(render_documents, 'run_document_job', render)
+        _run_worker()
+
+        assert list(DocumentJob.objects.order_by('pk').values_list('status', flat=True)) == ['done', 'done']
+
+    def test_broken_pool_is_replaced_and_jobs_released(self, company, sale, monkeypatch):
+        interrupted, unsubmitted = baker.make(DocumentJob, company=company, sale=sale, kind='invoice', _quantity=2)
+        pools = list()
+
+        class Pool:
+            def __init__(self, broken):
+                self.broken = broken
+
+            def submit(self, fn, job_id):
+                future = Future()
+                if self.broken and job_id == unsubmitted.pk:
+                    raise BrokenProcessPool()
+                if self.broken:
+                    future.set_exception(BrokenProcessPool())
+                else:
+                    future.set_result(fn(job_id))
+                return future
+
+            def shutdown(self, **kwargs):
+                pass
+
+        def make_pool(command, concurrency):
+            pools.append(Pool(broken=not pools))
+            return pools[-1]
+
+        # The first pool breaks on the second submit, after the first job was sent.
+        monkeypatch.setattr(render_documents.Command, '_make_pool', make_pool)
+        call_command('render_documents', once=True, concurrency=2, stdout=io.StringIO())
+
+        unsubmitted.refresh_from_db()
+        interrupted.refresh_from_db()
+        assert len(pools) == 2
+        assert (unsubmitted.status, unsubmitted.attempts) == ('done', 1)
+        assert (interrupted.status, interrupted.attempts) == ('done', 2)
+
+    def test_worker_failure_sets_finished_at(self, company, sale, monkeypatch):
+        job = baker.make(DocumentJob, company=company, sale=sale, kind='invoice')
+
+        class Pool:
+            def submit(self, fn, job_id):
+                future = Future()
+                future.set_exception(RuntimeError('processo encerrado'))
+                return future
+
+            def shutdown(self, **kwargs):
+                pass
+
+        monkeypatch.setattr(render_documents.Command, '_make_pool', lambda command, concurrency: Pool())
+        call_command('render_documents', once=True, concurrency=1, stdout=io.StringIO())
+
+        job.refresh_from_db()
+        assert job.status == 'failed' and job.finished_at is not None
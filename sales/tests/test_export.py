@@ -0,0 +1,82 @@
+import io
+import os
+import zipfile
+from datetime import timedelta
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from model_bakery import baker
+from clients.models import Client
+from sales.export import render_in_pool, stream_zip
+from sales.models import Sale
+
+
+def render_pid(sale_id):
+    return f'{sale_id}.txt', str(os.getpid()).encode()
+
+
+def test_stream_zip_yields_a_chunk_per_file():
+    chunks = list(stream_zip((f'{index}.txt', b'x' * 1000) for index in range(3)))
+    assert len(chunks) == 4
+    with zipfile.ZipFile(io.BytesIO(b''.join(chunks))) as archive:
+        assert archive.namelist() == ['0.txt', '1.txt', '2.txt']
+        assert archive.read('2.txt') == b'x' * 1000
+
+
+def test_render_in_pool_uses_worker_processes():
+    results = dict(render_in_pool(range(6), workers=2, render=render_pid))
+    assert sorted(results) == [f'{index}.txt' for index in range(6)]
+    assert str(os.getpid()).encode() not in results.values()
+
+
+def test_exports_share_one_pool():
+    first = render_in_pool(range(4), workers=2, render=render_pid)
+    second = render_in_pool(range(4, 8), workers=2, render=render_pid)
+    # Interleaved, as two downloads running at the same time.
+    pids = {content for pair in zip(first, second) for _, content in pair}
+    assert len(pids) <= 2
+
+
+@pytest.mark.django_db
+class TestInvoiceExport:
+    @pytest.fixture(autouse=True)
+    def in_process(self, settings):
+        settings.INVOICE_EXPORT_WORKERS = 0
+
+    def _make_sales(self, company):
+        client = baker.make(Client, company=company, telephone='65999999999')
+        included = baker.make(Sale, company=company, client=client, _quantity=2)
+        quote = baker.make(Sale, company=company, client=client, sale_type='quote')
+        old = baker.make(Sale, company=company, client=client)
+        Sale.objects.filter(pk=old.pk).update(sale_date=timezone.now() - timedelta(days=60))
+        other_company = baker.make(Sale, client=client)
+        return included, [quote, old, other_company]
+
+    def test_export_view_streams_zip_of_period(self, auth_client, company):
+        included, excluded = self._make_sales(company)
+        today = timezone.localdate()
+
+        response = auth_client.get(reverse('sale_invoice_export'), {'start': today - timedelta(days=7), 'end': today})
+
+        assert response.status_code == 200
+        assert response.streaming
+        assert response['Content-Type'] == 'application/zip'
+        with zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content))) as archive:
+            names = archive.namelist()
+            assert sorted(names) == sorted(f'nota_fiscal_{sale.pk}.pdf' for sale in included)
+            assert archive.read(names[0]).startswith(b'%PDF')
+
+    def test_export_view_rejects_invalid_period(self, auth_client):
+        response = auth_client.get(reverse('sale_invoice_export'), {'start': '2026-02-10', 'end': '2026-02-01'})
+        assert response.status_code == 400
+
+    def test_export_command_writes_zip(self, company, tmp_path):
+        included, _ = self._make_sales(company)
+        today = timezone.localdate().isoformat()
+        output = tmp_path / 'notas.zip'
+
+        call_command('export_invoices', company=company.pk, start=today, end=today, output=str(output), stdout=io.StringIO())
+
+        with zipfile.ZipFile(output) as archive:
+            assert len(archive.namelist()) == len(included)
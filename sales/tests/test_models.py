@@ -1,9 +1,16 @@
 import pytest
 from decimal import Decimal
+from io import StringIO
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import transaction
+from django.utils import timezone
 from model_bakery import baker
-from sales.models import Sale, SaleItem, Budget, Order
+from sales.models import Sale, SaleItem, Budget, Order, DailySalesSummary
 from products.models import Product
+from products.stock import InsufficientStock
 from outflows.models import Outflow
+from stockmoviment.models import StockMoviment
 
 @pytest.mark.django_db
 class TestSaleModels:
@@ -27,6 +34,20 @@ class TestSaleModels:
         assert product.quantity == 7
         assert Outflow.objects.filter(sale_reference=f"Venda {sale.id}").exists()
 
+    def test_finalize_rejects_items_out_of_stock(self, company):
+        product = baker.make(Product, title='Mouse', quantity=2, company=company)
+        sale = baker.make(Sale, company=company, order_status='finalized')
+        baker.make(SaleItem, sale=sale, product=product, quantity=3, unit_price=Decimal("50.00"))
+
+        with pytest.raises(InsufficientStock) as error:
+            with transaction.atomic():
+                sale.finalize()
+
+        assert error.value.messages == ['Estoque insuficiente para Mouse: solicitado 3, disponível 2.']
+        product.refresh_from_db()
+        assert product.quantity == 2
+        assert not Outflow.objects.filter(sale=sale).exists()
+
     def test_budget_conversion_to_order(self, company):
         budget = baker.make(Budget, company=company, sale_type='quote', order_status='pending')
         product = baker.make(Product, company=company)
@@ -38,3 +59,86 @@ class TestSaleModels:
         assert order.sale_type == 'order'
         assert budget.order_status == 'converted'
         assert order.items.count() == 1
+
+    def test_finalize_updates_daily_sales_summary(self, company):
+        product = baker.make(Product, quantity=10, company=company, cost_price=Decimal("30.00"), selling_price=Decimal("50.00"))
+        sale = baker.make(Sale, company=company, order_status='finalized')
+        baker.make(SaleItem, sale=sale, product=product, quantity=3, unit_price=Decimal("50.00"))
+
+        sale.finalize()
+
+        summary = DailySalesSummary.objects.get(company=company, date=timezone.localdate())
+        assert summary.revenue == Decimal("150.00")
+        assert summary.cost == Decimal("90.00")
+        assert summary.units == 3
+        assert summary.outflow_count == 1
+        assert summary.sale_count == 1
+
+    def test_rebuild_daily_sales_summary_command(self, company):
+        product = baker.make(Product, quantity=10, company=company, cost_price=Decimal("30.00"), selling_price=Decimal("50.00"))
+        sale = baker.make(Sale, company=company, order_status='finalized')
+        baker.make(SaleItem, sale=sale, product=product, quantity=2, unit_price=Decimal("50.00"))
+        sale.finalize()
+        baker.make(Outflow, company=company, product=product, quantity=1)
+        DailySalesSummary.objects.all().delete()
+
+        today = timezone.localdate().isoformat()
+        call_command('rebuild_daily_sales_summary', start=today, end=today, stdout=StringIO())
+
+        summary = DailySalesSummary.objects.get(company=company, date=timezone.localdate())
+        assert summary.revenue == Decimal("150.00")
+        assert summary.units == 3
+        assert summary.outflow_count == 2
+        assert summary.sale_count == 1
+
+    def test_rebuild_keeps_sale_prices_after_price_change(self, company):
+        product = baker.make(Product, quantity=10, company=company, cost_price=Decimal("30.00"), selling_price=Decimal("50.00"))
+        sale = baker.make(Sale, company=company, order_status='finalized')
+        baker.make(SaleItem, sale=sale, product=product, quantity=2, unit_price=Decimal("45.00"))
+        sale.finalize()
+        before = DailySalesSummary.objects.values_list('revenue', 'cost').get(company=company)
+
+        Product.objects.filter(pk=product.pk).update(cost_price=Decimal("35.00"), selling_price=Decimal("60.00"))
+        DailySalesSummary.rebuild(timezone.localdate(), timezone.localdate(), company=company)
+
+        assert before == (Decimal("90.00"), Decimal("60.00"))
+        assert DailySalesSummary.objects.values_list('revenue', 'cost').get(company=company) == before
+
+    def test_checkout_runs_constant_queries(self, company, django_assert_num_queries):
+        products = baker.make(Product, company=company, cost_price=Decimal("4.00"), _quantity=20)
+        sale = baker.make(Sale, company=company, discount=Decimal("10.00"))
+        items = [{'product': product.pk, 'quantity': 2, 'unit_price': Decimal("10.00")} for product in products]
+
+        with django_assert_num_queries(5):
+            sale.checkout(items)
+
+        assert sale.total == Decimal("360.00")
+        assert sale.items.count() == 20
+        assert set(sale.items.values_list('purchase_price', flat=True)) == {Decimal("4.00")}
+
+    def test_checkout_rejects_products_from_other_company(self, company):
+        other = baker.make(Product)
+        sale = baker.make(Sale, company=company)
+
+        with pytest.raises(ValidationError):
+            sale.checkout([{'product': other, 'quantity': 1, 'unit_price': Decimal("1.00")}])
+
+        assert not sale.items.exists()
+
+    def test_finalize_bulk_creates_outflows_and_decrements_stock(self, company, django_assert_max_num_queries):
+        first, second = baker.make(Product, company=company, quantity=10, cost_price=Decimal("2.00"), selling_price=Decimal("5.00"), _quantity=2)
+        sale = baker.make(Sale, company=company, order_status='finalized')
+        baker.make(SaleItem, sale=sale, product=first, quantity=3, unit_price=Decimal("5.00"))
+        baker.make(SaleItem, sale=sale, product=first, quantity=2, unit_price=Decimal("5.00"))
+        baker.make(SaleItem, sale=sale, product=second, quantity=4, unit_price=Decimal("5.00"))
+
+        with django_assert_max_num_queries(17):
+            sale.finalize()
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        assert (first.quantity, second.quantity) == (5, 6)
+        assert Outflow.objects.filter(sale=sale).count() == 3
+        assert StockMoviment.objects.filter(company=company, movement_type='out').count() == 3
+        summary = DailySalesSummary.objects.get(company=company, date=timezone.localdate())
+        assert (summary.revenue, summary.units, summary.outflow_count) == (Decimal("45.00"), 9, 3)
@@ -28,6 +28,29 @@ class TestSalesViews:
         assert response.status_code == 200
         assert response.json()['price'] == '150.75'
 
+    def test_get_product_prices_batch(self, auth_client, company, django_assert_num_queries, django_capture_on_commit_callbacks):
+        from products.models import Product
+        products = baker.make(Product, company=company, selling_price=10, cost_price=4, quantity=3, _quantity=3)
+        foreign = baker.make(Product, selling_price=99)
+        url = reverse('get_product_prices')
+        ids = [product.pk for product in products] + [foreign.pk]
+
+        response = auth_client.get(url, {'product_id': ids})
+        assert response.status_code == 200
+        assert response.json()['products'] == {
+            str(product.pk): {'price': '10.00', 'cost': '4.00', 'stock': 3} for product in products
+        }
+
+        # Cached: only the request's session, user and company lookups remain.
+        with django_assert_num_queries(4):
+            auth_client.get(url, {'product_id': ids})
+
+        with django_capture_on_commit_callbacks(execute=True):
+            products[0].selling_price = 12
+            products[0].save()
+        response = auth_client.get(url, {'product_id': [products[0].pk]})
+        assert response.json()['products'][str(products[0].pk)]['price'] == '12.00'
+
     def test_sale_create_post_with_items(self, auth_client, company):
         from products.models import Product
         from clients.models import Client
@@ -53,3 +76,42 @@ class TestSalesViews:
         response = auth_client.post(url, data)
         # If it fails, I'll check the prefix.
         assert response.status_code == 302
+
+    def test_invoice_pdf_is_cached_by_content(self, auth_client, company, monkeypatch):
+        from clients.models import Client
+        from django.core.files.storage import default_storage
+        from products.models import Product
+        from sales.models import SaleItem
+        from sales.utils.pdf import generate_invoice_pdf
+        from sales.views import InvoicePDFView
+        renders = list()
+
+        def render(sale):
+            renders.append(sale.pk)
+            return generate_invoice_pdf(sale)
+
+        monkeypatch.setattr(InvoicePDFView, 'document_renderer', staticmethod(render))
+        client = baker.make(Client, company=company, telephone='65999999999')
+        sale = baker.make(Sale, company=company, client=client)
+        item = baker.make(SaleItem, sale=sale, product=baker.make(Product, company=company), quantity=1, unit_price=10)
+        url = reverse('sale_invoice', kwargs={'pk': sale.pk})
+
+        first = auth_client.get(url)
+        second = auth_client.get(url)
+        not_modified = auth_client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+
+        assert first.content == second.content
+        assert second['ETag'] == first['ETag']
+        assert not_modified.status_code == 304
+        assert len(renders) == 1
+
+        item.quantity = 2
+        item.save()
+        changed = auth_client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+
+        assert changed.status_code == 200
+        assert changed['ETag'] != first['ETag']
+        assert len(renders) == 2
+        _, files = default_storage.listdir(f'documents/invoice/{company.pk}/{sale.pk}')
+        fingerprint = changed['ETag'].strip('"')
+        assert files == [f'{fingerprint}.pdf']
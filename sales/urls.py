@@ -6,9 +6,16 @@ urlpatterns = [
     path('sales/create/', views.SaleCreateView.as_view(), name='sale_create'),
     path('sales/<int:pk>/detail/', views.SaleDetailView.as_view(), name='sale_detail'),
     path('sales/get-product-price/', views.GetProductPriceView.as_view(), name='get_product_price'),
+    path('sales/get-product-prices/', views.GetProductPricesView.as_view(), name='get_product_prices'),
 
     path('sales/<int:pk>/invoice/', views.InvoicePDFView.as_view(), name='sale_invoice'),
+    path('sales/invoices/export/', views.InvoiceExportView.as_view(), name='sale_invoice_export'),
 
     path('api/v1/sales/', views.SaleCreateListAPIView.as_view(), name='sale-create-list-api-view'),
+    path('api/v1/sales/sync/', views.SaleSyncAPIView.as_view(), name='sale-sync-api-view'),
     path('api/v1/sales/<int:pk>/', views.SaleRetrieveUpdateDestroyAPIView.as_view(), name='sale-detail-api-view'),
+
+    path('api/v1/documents/', views.DocumentJobCreateAPIView.as_view(), name='document-job-create-api-view'),
+    path('api/v1/documents/<int:pk>/', views.DocumentJobRetrieveAPIView.as_view(), name='document-job-detail-api-view'),
+    path('api/v1/documents/<int:pk>/download/', views.DocumentJobDownloadAPIView.as_view(), name='document-job-download-api-view'),
 ]
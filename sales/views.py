@@ -1,44 +1,89 @@
 from decimal import Decimal
-from django.db import transaction
-from django.http import HttpResponseRedirect
+from django.conf import settings
+from django.contrib import messages
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from django.http import FileResponse, HttpResponseBadRequest, HttpResponseRedirect, StreamingHttpResponse
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
-from django.db.models import Q
-from django.http import HttpResponse, JsonResponse
+from django.db.models import Prefetch, Q
+from django.http import JsonResponse
 from django.urls import reverse_lazy
 from django.views import View
 from django.views.generic import ListView, CreateView, DetailView
-from rest_framework import generics
+from django.utils import timezone
+from rest_framework import generics, status
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 from app import metrics
 from clients.models import Client
-from companies.mixins import CompanyObjectMixin
+from app.pagination import KeysetPagination, KeysetPaginationMixin
+from app.query_budget import extend_query_budget
+from companies.mixins import CompanyObjectMixin, IdempotentCreateMixin, request_fingerprint
+from companies.models import IdempotencyKey
 from outflows.models import Outflow
-from products.models import Product
+from products.prices import get_product_prices
+from products.stock import InsufficientStock
 from . import forms, models, serializers
+from .documents import DOCUMENT_KINDS, CachedDocumentMixin, enqueue_document
+from .export import export_invoices, parse_period
 from .models import Sale
-from .utils.pdf import generate_invoice_pdf
 
-class InvoicePDFView(LoginRequiredMixin, PermissionRequiredMixin, CompanyObjectMixin, DetailView):
+class InvoicePDFView(LoginRequiredMixin, PermissionRequiredMixin, CompanyObjectMixin, CachedDocumentMixin, DetailView):
     model = Sale
+    queryset = Sale.objects.select_related('company', 'client')
     permission_required = 'sales.view_sale'
+    query_budget = 8
+    document_kind = 'invoice'
 
-    def get(self, request, *args, **kwargs):
-        sale = self.get_object()
-        pdf = generate_invoice_pdf(sale)
-        response = HttpResponse(pdf, content_type="application/pdf")
-        response["Content-Disposition"] = f'attachment; filename="nota_fiscal_{sale.id}.pdf"'
-        return response      
 
+class InvoiceExportView(LoginRequiredMixin, PermissionRequiredMixin, View):
+    # ?start=AAAA-MM-DD&end=AAAA-MM-DD: every invoice of the period in one ZIP,
+    # streamed while the PDFs are rendered.
+    permission_required = 'sales.view_sale'
+    query_budget = 5
+
+    def get(self, request):
+        try:
+            start_date, end_date = parse_period(request.GET.get('start'), request.GET.get('end'))
+        except ValueError as error:
+            return HttpResponseBadRequest(str(error))
+
+        content = export_invoices(request.user.profile.company, start_date, end_date, settings.INVOICE_EXPORT_WORKERS)
+        response = StreamingHttpResponse(content, content_type='application/zip')
+        response['Content-Disposition'] = f'attachment; filename="notas_fiscais_{start_date}_{end_date}.zip"'
+        return response
 
 
 class GetProductPriceView(LoginRequiredMixin, View):
     def get(self, request):
-        product_id = request.GET.get("product_id")
         try:
-            # Added company filtering to prevent IDOR
-            product = Product.objects.get(pk=product_id, company=request.user.profile.company)
-            return JsonResponse({'price': str(product.selling_price)})
-        except (Product.DoesNotExist, ValueError, TypeError):
+            product_id = int(request.GET.get("product_id"))
+        except (ValueError, TypeError):
             return JsonResponse({'price': ''})
+        # Scoped to the user's company to prevent IDOR
+        entry = get_product_prices(request.user.profile.company_id, [product_id]).get(product_id)
+        return JsonResponse({'price': entry['price'] if entry else ''})
+
+
+PRICE_LOOKUP_MAX_PRODUCTS = 500
+
+
+class GetProductPricesView(LoginRequiredMixin, View):
+    # ?product_id=1&product_id=2...: price, cost and stock of every product of
+    # a sale form in one request, served from the per-company price cache.
+    query_budget = 5
+
+    def get(self, request):
+        try:
+            product_ids = list(dict.fromkeys(int(value) for value in request.GET.getlist('product_id')))
+        except ValueError:
+            return JsonResponse({'detail': 'IDs de produto inválidos.'}, status=400)
+        if len(product_ids) > PRICE_LOOKUP_MAX_PRODUCTS:
+            return JsonResponse({'detail': f'Máximo de {PRICE_LOOKUP_MAX_PRODUCTS} produtos por consulta.'}, status=400)
+
+        prices = get_product_prices(request.user.profile.company_id, product_ids)
+        return JsonResponse({'products': {str(pk): entry for pk, entry in prices.items()}})
 
 
 class SaleCreateView(LoginRequiredMixin, PermissionRequiredMixin, CompanyObjectMixin, CreateView):
@@ -47,6 +92,7 @@ class SaleCreateView(LoginRequiredMixin, PermissionRequiredMixin, CompanyObjectM
     template_name = 'sale_create.html'
     success_url = reverse_lazy('sale_list')
     permission_required = 'sales.add_sale'
+    query_budget = 40
 
     def get_form_kwargs(self):
         kwargs = super().get_form_kwargs()
@@ -65,21 +111,26 @@ class SaleCreateView(LoginRequiredMixin, PermissionRequiredMixin, CompanyObjectM
         context = self.get_context_data()
         items = context['items']
 
-        with transaction.atomic():
-            form.instance.company = self.request.user.profile.company
-            if not form.instance.cashier:
-                form.instance.cashier = self.request.user
-
-            self.object = form.save()
-            if items.is_valid():
-                items.instance = self.object
-                items.save()
+        try:
+            with transaction.atomic():
+                form.instance.company = self.request.user.profile.company
+                if not form.instance.cashier:
+                    form.instance.cashier = self.request.user
 
-                self.object.update_totals()
-                self.object.finalize()
+                self.object = form.save()
+                if items.is_valid():
+                    self.object.checkout(
+                        item for item in items.cleaned_data
+                        if item and not item.get('DELETE')
+                    )
+                    self.object.finalize()
 
-            else:
-                return self.form_invalid(form)
+                else:
+                    return self.form_invalid(form)
+        except InsufficientStock as error:
+            for message in error.messages:
+                messages.error(self.request, message)
+            return self.form_invalid(form)
 
 
         return HttpResponseRedirect(self.get_success_url())
@@ -89,15 +140,19 @@ class SaleCreateView(LoginRequiredMixin, PermissionRequiredMixin, CompanyObjectM
         return self.render_to_response(self.get_context_data(form=form))
 
 
-class SaleListView(LoginRequiredMixin, PermissionRequiredMixin, CompanyObjectMixin, ListView):
+class SaleListView(LoginRequiredMixin, PermissionRequiredMixin, CompanyObjectMixin, KeysetPaginationMixin, ListView):
     model = models.Sale
     template_name = 'sale_list.html'
     context_object_name = 'sales'
     paginate_by = 8
+    keyset_field = 'sale_date'
     permission_required = 'sales.view_sale'
+    query_budget = 12
 
     def get_queryset(self):
-        queryset = super().get_queryset().filter(company=self.request.user.profile.company)
+        queryset = super().get_queryset().filter(
+            company=self.request.user.profile.company,
+        ).select_related('client', 'seller')
         client_id = self.request.GET.get("client")
         if client_id:
             queryset = queryset.filter(client__id=client_id)
@@ -117,14 +172,21 @@ class SaleListView(LoginRequiredMixin, PermissionRequiredMixin, CompanyObjectMix
 
 class SaleDetailView(LoginRequiredMixin, PermissionRequiredMixin, CompanyObjectMixin, DetailView):
     model = models.Sale
+    queryset = models.Sale.objects.select_related('client', 'seller').prefetch_related(
+        Prefetch('items', queryset=models.SaleItem.objects.select_related('product__brand')),
+    )
     template_name = "sale_detail.html"
     context_object_name = "sale"
     permission_required = 'sales.view_sale'
+    query_budget = 10
 
 
-class SaleCreateListAPIView(generics.ListCreateAPIView):
+class SaleCreateListAPIView(IdempotentCreateMixin, generics.ListCreateAPIView):
     queryset = models.Sale.objects.all()
     serializer_class = serializers.SaleSerializer
+    pagination_class = KeysetPagination
+    keyset_field = 'sale_date'
+    query_budget = 20
 
     def get_form_kwargs(self):
         kwargs = super().get_form_kwargs()
@@ -132,7 +194,7 @@ class SaleCreateListAPIView(generics.ListCreateAPIView):
         return kwargs
 
     def get_queryset(self):
-        return super().get_queryset().filter(company=self.request.user.profile.company)
+        return super().get_queryset().filter(company=self.request.user.profile.company).prefetch_related('items')
 
     def perform_create(self, serializer):
         serializer.save(company=self.request.user.profile.company)
@@ -141,6 +203,169 @@ class SaleCreateListAPIView(generics.ListCreateAPIView):
 class SaleRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
     queryset = models.Sale.objects.all()
     serializer_class = serializers.SaleSerializer
+    query_budget = 10
+
+    def get_queryset(self):
+        return models.Sale.objects.filter(company=self.request.user.profile.company).prefetch_related('items')
+
+
+SYNC_MAX_SALES = 500
+
+SYNC_CHUNK_SIZE = 50
+
+# Measured: ~30 queries per sale with an idempotency key, plus one stock
+# UPDATE per item and a savepoint pair per chunk.
+SYNC_QUERIES_PER_CHUNK = 2
+
+SYNC_QUERIES_PER_SALE = 30
+
+
+def sync_query_budget(chunk):
+    budget = SYNC_QUERIES_PER_CHUNK
+    for entry in chunk:
+        items = entry.get('items') if isinstance(entry, dict) else None
+        budget += SYNC_QUERIES_PER_SALE + (len(items) if isinstance(items, list) else 0)
+    return budget
+
+
+class SaleSyncAPIView(generics.GenericAPIView):
+    # Replays sales queued by offline POS terminals: one authenticated request,
+    # chunked transactions, a savepoint per sale and a result per sale. The
+    # query budget grows with each chunk (see sync_query_budget).
+    queryset = models.Sale.objects.all()
+    serializer_class = serializers.SaleSerializer
+    query_budget = 8
+
+    def post(self, request, *args, **kwargs):
+        entries = request.data.get('sales') if isinstance(request.data, dict) else None
+        if not isinstance(entries, list) or not entries:
+            return Response({'detail': 'Informe a lista "sales" com as vendas a sincronizar.'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(entries) > SYNC_MAX_SALES:
+            return Response(
+                {'detail': f'Máximo de {SYNC_MAX_SALES} vendas por sincronização.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        company = request.user.profile.company
+        results = list()
+        for start in range(0, len(entries), SYNC_CHUNK_SIZE):
+            chunk = entries[start:start + SYNC_CHUNK_SIZE]
+            extend_query_budget(request, sync_query_budget(chunk))
+            with transaction.atomic():
+                results.extend(self._sync_sale(company, start + offset, entry) for offset, entry in enumerate(chunk))
+
+        summary = {
+            state: sum(1 for result in results if result['status'] == state)
+            for state in ('created', 'duplicate', 'error')
+        }
+        return Response(dict(summary, results=results))
+
+    def _sync_sale(self, company, index, entry):
+        if not isinstance(entry, dict):
+            return dict(index=index, status='error', errors={'detail': 'Venda inválida.'})
+
+        entry = dict(entry)
+        key = entry.pop('idempotency_key', None)
+        record = None
+        if key:
+            fingerprint = request_fingerprint(self.request.path, entry)
+            record = IdempotencyKey.objects.select_for_update().filter(company=company, key=key).first()
+            if record and record.expires_at > timezone.now():
+                if record.fingerprint != fingerprint:
+                    return dict(index=index, status='error', errors={'idempotency_key': 'Chave já utilizada com outra venda.'})
+                return dict(record.response_body, index=index, status='duplicate')
+
+        serializer = self.get_serializer(data=entry)
+        if not serializer.is_valid():
+            return dict(index=index, status='error', errors=serializer.errors)
+
+        try:
+            with transaction.atomic():
+                sale = serializer.save(company=company, cashier=serializer.validated_data.get('cashier') or self.request.user)
+                # Offline sales already happened: shortfalls are reported as
+                # stock conflicts instead of rejecting the sale.
+                shortfalls = sale.finalize(allow_shortfall=True)
+                if key:
+                    IdempotencyKey.objects.update_or_create(
+                        company=company, key=key,
+                        defaults=dict(
+                            path=self.request.path,
+                            fingerprint=fingerprint,
+                            status_code=status.HTTP_201_CREATED,
+                            response_body={'sale': sale.pk},
+                            expires_at=IdempotencyKey.default_expiration(),
+                        ),
+                    )
+        except ValidationError as error:
+            return dict(index=index, status='error', errors=error.detail)
+        except IntegrityError:
+            # Another sync stored the same idempotency key first; only this
+            # sale's savepoint is rolled back. Resending it returns the duplicate.
+            return dict(index=index, status='error', errors={'idempotency_key': 'Venda sincronizada ao mesmo tempo por outra requisição; reenvie.'})
+
+        result = dict(index=index, status='created', sale=sale.pk)
+        if shortfalls:
+            # Stock available to this sale's own reservation.
+            result['stock_conflicts'] = [
+                {'product': shortfall.product_id, 'requested': shortfall.requested, 'available': shortfall.available}
+                for shortfall in shortfalls
+            ]
+        return result
+
+
+class DocumentJobMixin:
+    # Document permissions follow the PDF views (view_sale, view_order,
+    # view_budget) rather than model permissions on DocumentJob.
+    queryset = models.DocumentJob.objects.all()
+    serializer_class = serializers.DocumentJobSerializer
+    permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return models.Sale.objects.filter(company=self.request.user.profile.company)
+        return super().get_queryset().filter(company=self.request.user.profile.company)
+
+    def check_kind_permission(self, kind):
+        if not self.request.user.has_perm(DOCUMENT_KINDS[kind].permission):
+            raise PermissionDenied('Você não tem permissão para acessar este documento.')
+
+    def get_object(self):
+        job = super().get_object()
+        self.check_kind_permission(job.kind)
+        return job
+
+
+class DocumentJobCreateAPIView(DocumentJobMixin, generics.CreateAPIView):
+    # Queues the PDF for the render_documents worker and answers right away
+    # with the job id and its status URL.
+    query_budget = 12
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        kind = serializer.validated_data['kind']
+        self.check_kind_permission(kind)
+
+        job = enqueue_document(serializer.validated_data['sale'], kind, user=request.user)
+        return Response(self.get_serializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+
+class DocumentJobRetrieveAPIView(DocumentJobMixin, generics.RetrieveAPIView):
+    query_budget = 5
+
+
+class DocumentJobDownloadAPIView(DocumentJobMixin, generics.RetrieveAPIView):
+    query_budget = 5
+
+    def retrieve(self, request, *args, **kwargs):
+        job = self.get_object()
+        if job.status != 'done':
+            return Response(
+                {'detail': 'O documento ainda não foi gerado.', 'status': job.status},
+                status=status.HTTP_409_CONFLICT,
+            )
+        if not default_storage.exists(job.file):
+            return Response(
+                {'detail': 'A venda foi alterada depois da geração; solicite o documento novamente.'},
+                status=status.HTTP_410_GONE,
+            )
+        filename = DOCUMENT_KINDS[job.kind].filename.format(pk=job.sale_id)
+        return FileResponse(default_storage.open(job.file, 'rb'), as_attachment=True, filename=filename, content_type='application/pdf')
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.6 on 2026-10-18 11:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0007_idempotencykey'),
+        ('products', '0004_inventorysnapshot'),
+        ('stockmoviment', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='stockmoviment',
+            index=models.Index(fields=['company', '-date', '-id'], name='stockmov_company_date_id_idx'),
+        ),
+    ]
@@ -20,3 +20,6 @@ class StockMoviment(models.Model):
     class Meta:
         verbose_name = 'Histórico de Estoque'
         verbose_name_plural = 'Históricos de Estoque'
+        indexes = [
+            models.Index(fields=['company', '-date', '-id'], name='stockmov_company_date_id_idx'),
+        ]
@@ -2,19 +2,22 @@ from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMix
 from django.db.models import Q
 from django.views.generic import ListView
 from rest_framework import generics
-from companies.mixins import CompanyObjectMixin
+from app.pagination import KeysetPagination, KeysetPaginationMixin
+from companies.mixins import CompanyObjectMixin, IdempotentCreateMixin
 from . import models, serializers
 
 
-class StockMovimentListView(LoginRequiredMixin, PermissionRequiredMixin, CompanyObjectMixin, ListView):
+class StockMovimentListView(LoginRequiredMixin, PermissionRequiredMixin, CompanyObjectMixin, KeysetPaginationMixin, ListView):
     model = models.StockMoviment
     template_name = 'stock_moviment_list.html'
     context_object_name = 'moviment_entries'
     paginate_by = 8
+    keyset_field = 'date'
     permission_required = 'stockmoviment.view_stockmoviment'
+    query_budget = 8
 
     def get_queryset(self):
-        queryset = super().get_queryset().filter(company=self.request.user.profile.company)
+        queryset = super().get_queryset().filter(company=self.request.user.profile.company).select_related('product')
         search_term = self.request.GET.get('product')
 
         if search_term:
@@ -26,9 +29,11 @@ class StockMovimentListView(LoginRequiredMixin, PermissionRequiredMixin, Company
         return queryset.order_by('-date')
 
 
-class StockMovimentCreateListAPIView(generics.ListCreateAPIView):
+class StockMovimentCreateListAPIView(IdempotentCreateMixin, generics.ListCreateAPIView):
     queryset = models.StockMoviment.objects.all()
     serializer_class = serializers.StockMovimentSerializer
+    pagination_class = KeysetPagination
+    keyset_field = 'date'
 
     def get_queryset(self):
         return super().get_queryset().filter(company=self.request.user.profile.company)
@@ -5,7 +5,7 @@ from django.http import HttpResponseRedirect
 from django.urls import reverse_lazy
 from django.views.generic import ListView, CreateView, DetailView, UpdateView, DeleteView
 from rest_framework import generics
-from companies.mixins import CompanyObjectMixin
+from companies.mixins import CompanyObjectMixin, IdempotentCreateMixin
 from . import models, forms, serializers
 
 
@@ -74,7 +74,7 @@ class SupplierDeleteView(LoginRequiredMixin, PermissionRequiredMixin, CompanyObj
             return self.render_to_response(self.get_context_data())
 
 
-class SupplierCreateListAPIView(generics.ListCreateAPIView):
+class SupplierCreateListAPIView(IdempotentCreateMixin, generics.ListCreateAPIView):
     queryset = models.Supplier.objects.all()
     serializer_class = serializers.SupplierSerializer
 